@@ -0,0 +1,149 @@
+"""
+价格提醒引擎基准测试
+500 个品种、10000 条规则（价格上穿/下穿 + 1分钟/5分钟/1小时涨跌幅）下每个快照的评估耗时，
+与逐条检查全部规则的朴素实现对比（两者触发结果须一致），并给出规则数变化时的耗时以说明与规则总数无关
+
+用法：python scripts/bench/bench_alerts.py [--instruments 500] [--rules 10000] [--ticks 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from src.core.alerts import AlertEngine, AlertRule, alert_instruments  # noqa: E402
+from src.core.alerts import _Series  # noqa: E402
+
+WINDOWS = (60, 300, 3600)
+
+
+def make_rules(rng, names, base, count):
+    rules = []
+    for i in range(count):
+        name = rng.choice(names)
+        kind = rng.choice(("above", "below", "rise", "fall"))
+        if kind in ("above", "below"):
+            threshold = base[name] * rng.uniform(0.97, 1.03)
+            rules.append(AlertRule(f"crypto.{name}", kind, threshold, rule_id=i))
+        else:
+            rules.append(AlertRule(f"crypto.{name}", kind, rng.uniform(0.2, 3), rng.choice(WINDOWS), rule_id=i))
+    return rules
+
+
+def make_ticks(rng, names, base, ticks, step_s):
+    """随机游走的快照序列（每个快照包含全部品种）"""
+    prices = dict(base)
+    snapshots = []
+    for t in range(ticks):
+        for name in names:
+            prices[name] *= 1 + rng.gauss(0, 0.001)
+        snapshots.append({
+            "timestamp": 1_700_000_000 + t * step_s,
+            "crypto": {name: {"price": prices[name], "change": 0.0} for name in names},
+        })
+    return snapshots
+
+
+class NaiveEngine:
+    """逐条检查全部规则，作为对照"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        span = max(WINDOWS)
+        self.series = {}
+        self.last = {}
+        self.last_moves = {}
+        for rule in rules:
+            if rule.window is not None:
+                self.series.setdefault(rule.instrument, _Series(span))
+
+    def evaluate(self, data, ts):
+        values = dict(alert_instruments(data))
+        prev = dict(self.last)
+        self.last.update(values)
+        for name, series in self.series.items():
+            if name in values:
+                series.append(ts, values[name])
+        moves, prev_moves = {}, dict(self.last_moves)
+        fired = []
+        for rule in self.rules:
+            value = values.get(rule.instrument)
+            if value is None:
+                continue
+            if rule.kind == "above":
+                p = prev.get(rule.instrument)
+                if p is not None and p < rule.threshold <= value:
+                    fired.append((rule, value))
+            elif rule.kind == "below":
+                p = prev.get(rule.instrument)
+                if p is not None and value <= rule.threshold < p:
+                    fired.append((rule, value))
+            else:
+                key = (rule.instrument, rule.window)
+                if key not in moves:
+                    ref = self.series[rule.instrument].value_at(ts - rule.window)
+                    moves[key] = (value - ref) / ref * 100 if ref else None
+                    if moves[key] is not None:
+                        self.last_moves[key] = moves[key]
+                move, p = moves[key], prev_moves.get(key)
+                if move is None or p is None:
+                    continue
+                if rule.kind == "rise" and p < rule.threshold <= move:
+                    fired.append((rule, move))
+                elif rule.kind == "fall" and -p < rule.threshold <= -move:
+                    fired.append((rule, move))
+        return fired
+
+
+def run(engine, snapshots):
+    samples, fired = [], []
+    for data in snapshots:
+        start = time.perf_counter()
+        result = engine.evaluate(data, data["timestamp"])
+        samples.append(time.perf_counter() - start)
+        fired.append(sorted(rule.id for rule, _ in result))
+    return samples, fired
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return statistics.mean(samples) * 1e6, samples[int(len(samples) * 0.99) - 1] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instruments", type=int, default=500)
+    parser.add_argument("--rules", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--step", type=float, default=1.0, help="快照间隔（秒）")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names = [f"C{i:03d}" for i in range(args.instruments)]
+    base = {name: rng.uniform(1, 50000) for name in names}
+    snapshots = make_ticks(rng, names, base, args.ticks, args.step)
+    rules = make_rules(rng, names, base, args.rules)
+
+    indexed, fired = run(AlertEngine(rules), snapshots)
+    naive, naive_fired = run(NaiveEngine(rules), snapshots)
+    assert fired == naive_fired, "indexed and naive engines disagree"
+    total = sum(len(f) for f in fired)
+
+    for label, samples in (("indexed", indexed), ("naive", naive)):
+        mean, p99 = summarize(samples)
+        print(f"{label:<8} rules={args.rules:6d}  instruments={args.instruments}  "
+              f"mean={mean:8.1f} µs/tick  p99={p99:8.1f} µs/tick")
+    print(f"fired {total} alerts over {args.ticks} ticks (identical in both engines)")
+
+    for count in (args.rules // 10, args.rules, args.rules * 10):
+        samples, _ = run(AlertEngine(make_rules(rng, names, base, count)), snapshots)
+        mean, p99 = summarize(samples)
+        print(f"scaling  rules={count:6d}  mean={mean:8.1f} µs/tick  p99={p99:8.1f} µs/tick")
+
+
+if __name__ == "__main__":
+    main()
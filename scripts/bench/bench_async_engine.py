@@ -0,0 +1,155 @@
+"""
+线程池引擎 vs asyncio 引擎基准测试
+启动本地新浪/OKX桩服务（带固定延迟），分别用两种引擎执行整轮抓取，
+统计 5/50/500 个关注品种下单次刷新耗时的 p50/p99、峰值内存（RSS）与线程数
+
+新浪请求按 --chunk 个代码一组拆分（模拟大关注列表下的多个请求），加密货币走OKX批量接口；
+每组配置在独立子进程中运行，避免相互影响内存统计。asyncio 引擎需要安装 aiohttp
+
+用法：python scripts/bench/bench_async_engine.py [--sizes 5,50,500] [--ticks 200] [--latency 0.02] [--chunk 10]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+
+def _stub_handler(latency, count):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # 支持长连接，与真实服务一致
+        disable_nagle_algorithm = True  # 避免头部与正文分两次发送时触发延迟确认
+
+        def do_GET(self):
+            time.sleep(latency)
+            url = urlparse(self.path)
+            if url.path.startswith("/list="):
+                symbols = unquote(url.path[len("/list="):]).split(",")
+                body = "".join(
+                    f'var hq_str_{sym}="{2000 + i * 0.01:.2f},1999.00,0,0,0,0,0,0";\n'
+                    for i, sym in enumerate(symbols)
+                ).encode("gb18030")
+            elif url.path == "/api/v5/market/tickers":
+                inst_type = parse_qs(url.query).get("instType", ["SPOT"])[0]
+                suffix = "-SWAP" if inst_type == "SWAP" else ""
+                body = json.dumps({"code": "0", "data": [
+                    {"instId": f"C{i}-USDT{suffix}", "last": "100.5", "open24h": "100"}
+                    for i in range(count)
+                ]}).encode()
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_stub(latency, count):
+    """启动桩服务，返回 (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _stub_handler(latency, count))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_single(engine, size, ticks, chunk, sina_url, okx_url):
+    """子进程：用指定引擎执行 ticks 轮抓取，输出JSON结果"""
+    from src.core.config import AppConfig
+    AppConfig.FETCH_ENGINE = engine
+    AppConfig.CRYPTO_STREAM_ENABLED = False
+    AppConfig.HTTP_PREWARM = False
+    from src.core.data_fetcher import GoldDataFetcher
+
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    fetcher = GoldDataFetcher()
+    fetcher.sina_base_url = sina_url + "/list="
+    fetcher.crypto_source.base_url = okx_url
+    fetcher.crypto_source.symbols = {f"C{i}": f"C{i}USDT" for i in range(size)}
+    symbols = [f"hf_S{i}" for i in range(size)]
+
+    def tasks():
+        batch = {
+            f"sina{k}": fetcher.task("fetch_sina", symbols[k:k + chunk])
+            for k in range(0, len(symbols), chunk)
+        }
+        batch["crypto"] = fetcher.task("fetch_crypto")
+        return batch
+
+    fetcher.engine.run(tasks(), deadline=5.0)  # 预热连接
+    samples, failures = [], 0
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        results, errors = fetcher.engine.run(tasks(), deadline=5.0)
+        samples.append(time.perf_counter() - t0)
+        failures += len(errors)
+    threads = threading.active_count()
+    fetcher.close()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    samples.sort()
+    print(json.dumps({
+        "p50": samples[len(samples) // 2] * 1000,
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+        "rss_kb": rss - rss0,
+        "threads": threads,
+        "errors": failures,
+        "engine": type(fetcher.engine).__name__,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="5,50,500")
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="桩服务单次响应延迟（秒）")
+    parser.add_argument("--chunk", type=int, default=10, help="每个新浪请求包含的代码数")
+    parser.add_argument("--single", nargs=4, metavar=("ENGINE", "SIZE", "SINA_URL", "OKX_URL"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        engine, size, sina_url, okx_url = args.single
+        run_single(engine, int(size), args.ticks, args.chunk, sina_url, okx_url)
+        return
+
+    print(f"{'engine':<8}{'symbols':>8}{'requests':>9}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'+RSS MiB':>10}{'threads':>8}{'errors':>7}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        # 两个独立端口模拟两个主机（新浪、OKX）
+        sina, sina_url = start_stub(args.latency, size)
+        okx, okx_url = start_stub(args.latency, size)
+        requests_per_tick = -(-size // args.chunk) + 2
+        for engine in ("thread", "asyncio"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--ticks", str(args.ticks), "--chunk", str(args.chunk),
+                 "--single", engine, str(size), sina_url, okx_url],
+                capture_output=True, text=True, cwd=ROOT,
+            )
+            lines = out.stdout.strip().splitlines()
+            if out.returncode != 0 or not lines:
+                print(f"{engine:<8}{size:>8}  failed: {out.stderr.strip().splitlines()[-1:]}")
+                continue
+            r = json.loads(lines[-1])
+            label = engine if r["engine"] != "FetchEngine" or engine == "thread" else "thread*"
+            print(f"{label:<8}{size:>8}{requests_per_tick:>9}{r['p50']:>9.1f}{r['p99']:>9.1f}"
+                  f"{r['rss_kb'] / 1024:>10.1f}{r['threads']:>8}{r['errors']:>7}")
+        sina.shutdown()
+        okx.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+后台模式基准测试
+模拟一小时（虚拟时钟驱动 SourceScheduler，经本地桩服务回放）对比窗口在前台与后台时：
+    上游请求数（桩服务实际收到的请求）
+    Python 侧 CPU 时间（抓取 + 历史记录 + 差分/补丁序列化 + 走势线，或后台时的托盘摘要）
+    runJavaScript 调用数（补丁与走势线推送；后台时为0，未计入旧轮询模式下的页面轮询）
+
+WebEngine 渲染进程的CPU不在此测量范围内，后台时它不再收到任何调用
+
+用法：python scripts/bench/bench_background.py [--minutes 60]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from http_replay import StubServer, load_fixtures  # noqa: E402
+from src.core.config import AppConfig  # noqa: E402
+from src.core.data_fetcher import GoldDataFetcher  # noqa: E402
+from src.core.history import TickHistory  # noqa: E402
+from src.core.scheduler import SourceScheduler  # noqa: E402
+from src.core.snapshot_diff import SnapshotDiffer, summary_text  # noqa: E402
+
+
+def simulate(stub, minutes, background):
+    clock = [0.0]
+    fetcher = stub.point(GoldDataFetcher())
+    scheduler = SourceScheduler(fetcher, clock=lambda: clock[0])
+    history = TickHistory()
+    differ = SnapshotDiffer()
+    interval = (AppConfig.BACKGROUND_UPDATE_INTERVAL_MS if background else AppConfig.UPDATE_INTERVAL_MS) / 1000
+    sparkline_every = AppConfig.SPARKLINE_INTERVAL_MS / 1000
+    next_sparkline = 0.0
+    run_js = 0
+    requests_before = stub.requests
+    cpu = time.process_time()
+    try:
+        while clock[0] < minutes * 60:
+            data = scheduler.fetch_all()
+            history.record(data)
+            if background:
+                summary_text(data)  # 托盘提示
+            else:
+                patch = differ.diff(data)
+                if patch is not None:
+                    json.dumps(patch, separators=(",", ":"))
+                    run_js += 1
+                if clock[0] >= next_sparkline:
+                    json.dumps(history.sparklines(), separators=(",", ":"))
+                    run_js += 1
+                    next_sparkline += sparkline_every
+            clock[0] += interval
+    finally:
+        fetcher.close()
+    return {
+        "ticks": int(minutes * 60 / interval),
+        "requests": stub.requests - requests_before,
+        "cpu_s": time.process_time() - cpu,
+        "run_js": run_js,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60)
+    args = parser.parse_args()
+
+    AppConfig.HTTP_PREWARM = False
+    AppConfig.CRYPTO_STREAM_ENABLED = False
+    routes, _ = load_fixtures()
+    stub = StubServer(routes).start()
+    try:
+        visible = simulate(stub, args.minutes, background=False)
+        hidden = simulate(stub, args.minutes, background=True)
+    finally:
+        stub.stop()
+
+    for label, r in (("visible", visible), ("hidden", hidden)):
+        print(f"{label:<8} ticks={r['ticks']:5d}  requests={r['requests']:5d}  "
+              f"cpu={r['cpu_s']:6.2f} s  runJavaScript={r['run_js']:5d}")
+    print(f"reduction: requests {1 - hidden['requests'] / visible['requests']:.1%}  "
+          f"cpu {1 - hidden['cpu_s'] / visible['cpu_s']:.1%}  runJavaScript 100%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+拖动帧抖动基准测试
+对比进程内抓取线程（FetchWorker 方式）与独立抓取进程（共享内存快照）两种模式下，
+主线程以拖动轮询节奏（DRAG_POLL_INTERVAL_MS，约60fps）运行时每帧的延迟
+
+主线程每帧执行一次模拟的拖动处理，并像窗口一样处理到达的快照（记录历史 + 差分 + 序列化补丁）；
+抓取经本地桩服务回放较大的OKX响应（--tickers），放大JSON解析与GIL争用。不依赖 PySide6
+
+用法：python scripts/bench/bench_drag_jitter.py [--seconds 20] [--tickers 2000] [--latency 0.02]
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from http_replay import StubServer, load_fixtures, synthesize  # noqa: E402
+from src.core.config import AppConfig  # noqa: E402
+
+
+def configure(url, fetcher):
+    """两种模式共用的抓取配置（独立进程模式下在子进程中调用）"""
+    AppConfig.SCHEDULE_BACKOFF = 1.0  # 回放数据不变化，关闭退避以保持恒定负载
+    AppConfig.TICK_STORE_ENABLED = False
+    fetcher.sina_base_url = url + "/list="
+    fetcher.eastmoney_url = url + "/api/qt/stock/get"
+    fetcher.crypto_source.base_url = url
+
+
+class Frame:
+    """主线程每帧的工作：模拟拖动处理 + 处理到达的快照"""
+
+    def __init__(self):
+        from src.core.history import TickHistory
+        from src.core.snapshot_diff import SnapshotDiffer
+        self.history = TickHistory()
+        self.differ = SnapshotDiffer()
+        self.snapshots = 0
+        self.pos = [0, 0]
+
+    def drag(self, i):
+        self.pos[0] += 1
+        self.pos[1] += i % 3 - 1
+        return json.dumps({"action": "move", "deltaX": 1, "deltaY": i % 3 - 1})
+
+    def deliver(self, data, record=True):
+        if record:
+            self.history.record(data)
+        patch = self.differ.diff(data)
+        if patch is not None:
+            json.dumps(patch, separators=(",", ":"))
+        self.snapshots += 1
+
+
+def frame_loop(seconds, on_frame):
+    """固定节拍的主线程循环，返回每帧相对计划时刻的延迟（毫秒）"""
+    period = AppConfig.DRAG_POLL_INTERVAL_MS / 1000
+    lateness = []
+    start = time.perf_counter()
+    i = 0
+    while True:
+        due = start + i * period
+        now = time.perf_counter()
+        if now < due:
+            time.sleep(due - now)
+            now = time.perf_counter()
+        if now - start > seconds:
+            break
+        lateness.append((now - due) * 1000)
+        on_frame(i)
+        # 落后超过一帧时跳过错过的帧（与 QTimer 行为一致），延迟从下一帧重新计算
+        i = max(i + 1, int((time.perf_counter() - start) / period))
+    return lateness
+
+
+def run_thread_mode(url, seconds):
+    from src.core.data_fetcher import GoldDataFetcher
+    from src.core.scheduler import SourceScheduler
+
+    fetcher = GoldDataFetcher()
+    configure(url, fetcher)
+    scheduler = SourceScheduler(fetcher)
+    frame = Frame()
+    inbox = queue.Queue()  # 代替 Qt 排队信号
+    stop = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            t0 = time.monotonic()
+            data = scheduler.fetch_all()
+            frame.history.record(data)  # FetchWorker 在工作线程中执行接收者
+            inbox.put(data)
+            stop.wait(max(0.0, AppConfig.UPDATE_INTERVAL_MS / 1000 - (time.monotonic() - t0)))
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+
+    def on_frame(i):
+        frame.drag(i)
+        while True:
+            try:
+                data = inbox.get_nowait()
+            except queue.Empty:
+                break
+            frame.deliver(data, record=False)
+
+    try:
+        return frame_loop(seconds, on_frame), frame.snapshots
+    finally:
+        stop.set()
+        thread.join()
+        fetcher.close()
+
+
+def run_process_mode(url, seconds):
+    from src.core.fetch_process import FetcherSupervisor
+
+    supervisor = FetcherSupervisor(configure=partial(configure, url)).start()
+    frame = Frame()
+    inbox = queue.Queue()  # 代替 Qt 排队信号
+    stop = threading.Event()
+
+    def reader():
+        # ProcessWorker 在读取线程中检查序号、解析快照并执行接收者
+        seq = 0
+        while not stop.wait(AppConfig.SHM_POLL_INTERVAL_MS / 1000):
+            supervisor.poll()
+            seq, body = supervisor.read(seq)
+            if body is not None:
+                data = json.loads(body)
+                frame.history.record(data)
+                inbox.put(data)
+
+    thread = threading.Thread(target=reader, daemon=True)
+
+    def on_frame(i):
+        frame.drag(i)
+        while True:
+            try:
+                data = inbox.get_nowait()
+            except queue.Empty:
+                break
+            frame.deliver(data, record=False)
+
+    try:
+        time.sleep(1.5)  # 等待子进程启动（导入与首次抓取不计入）
+        thread.start()
+        return frame_loop(seconds, on_frame), frame.snapshots
+    finally:
+        stop.set()
+        if thread.is_alive():
+            thread.join()
+        supervisor.stop()
+
+
+def summarize(label, lateness, snapshots):
+    lateness = sorted(lateness)
+    n = len(lateness)
+    late = sum(1 for x in lateness if x > AppConfig.DRAG_POLL_INTERVAL_MS / 4)
+    print(f"{label:<8} frames={n:5d}  snapshots={snapshots:4d}  p50={lateness[n // 2]:6.2f} ms  "
+          f"p99={lateness[min(n - 1, int(n * 0.99))]:6.2f} ms  max={lateness[-1]:6.2f} ms  "
+          f"late>{AppConfig.DRAG_POLL_INTERVAL_MS / 4:.0f}ms={late / n:6.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--tickers", type=int, default=2000, help="每种OKX产品类型的回放行情条数")
+    parser.add_argument("--latency", type=float, default=0.02, help="桩服务响应延迟（秒）")
+    parser.add_argument("--modes", default="thread,process")
+    args = parser.parse_args()
+
+    os.environ["MFW_DATA_DIR"] = tempfile.mkdtemp(prefix="drag-bench-")
+    fixtures = os.path.join(os.environ["MFW_DATA_DIR"], "fixtures")
+    synthesize(fixtures, tickers=args.tickers)
+    routes, _ = load_fixtures(fixtures)
+    stub = StubServer(routes, args.latency, args.latency / 4, seed=1).start()
+    try:
+        for mode in args.modes.split(","):
+            run = run_thread_mode if mode == "thread" else run_process_mode
+            lateness, snapshots = run(stub.url, args.seconds)
+            summarize(mode, lateness, snapshots)
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+行情历史基准测试
+在 500 个品种下测量每次快照的写入（含K线增量聚合）耗时、走势线/K线读取耗时，
+并验证缓冲写满后内存不再增长
+
+用法：python scripts/bench/bench_history.py [--instruments 500] [--ticks 3000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.history import TickHistory  # noqa: E402
+
+
+def make_snapshot(symbols, prices):
+    for i, sym in enumerate(symbols):
+        prices[i] *= 1 + random.uniform(-0.001, 0.001)
+    return {"crypto": {sym: {"price": prices[i], "change": 0.0} for i, sym in enumerate(symbols)}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instruments", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=3000)
+    args = parser.parse_args()
+
+    symbols = [f"C{i:04d}" for i in range(args.instruments)]
+    prices = [random.uniform(1, 1000) for _ in symbols]
+    snapshots = [make_snapshot(symbols, prices) for _ in range(200)]
+
+    # 1. 耗时（不开启 tracemalloc，避免其开销干扰计时）
+    history = TickHistory()
+    ts = 1_700_000_000.0
+    t0 = time.perf_counter()
+    for tick in range(args.ticks):
+        history.record(snapshots[tick % len(snapshots)], ts + tick)
+    record_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    history.sparklines()
+    sparkline_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for name in history.instruments:
+        history.bars(name, 60)
+    bars_time = time.perf_counter() - t0
+
+    # 2. 内存：缓冲写满时与继续运行后的占用对比
+    tracemalloc.start()
+    history = TickHistory()
+    checkpoints = {}
+    for tick in range(args.ticks):
+        history.record(snapshots[tick % len(snapshots)], ts + tick)
+        if tick + 1 in (history.tick_capacity, args.ticks):
+            checkpoints[tick + 1] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"instruments={args.instruments} ticks={args.ticks}")
+    print(f"record:     {record_time / args.ticks * 1000:.3f} ms/tick "
+          f"({record_time / args.ticks / args.instruments * 1e6:.2f} us/instrument)")
+    print(f"sparklines: {sparkline_time * 1000:.2f} ms (all instruments)")
+    print(f"1m bars:    {bars_time * 1000:.2f} ms (all instruments)")
+    for tick, mem in sorted(checkpoints.items()):
+        print(f"memory after {tick:6d} ticks: {mem / 1024 / 1024:.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+HTTP连接复用基准测试
+对比「每次 requests.get」（旧的东方财富实现）与 SessionRegistry 长连接会话
+在同样的并发抓取下，本地桩服务实际接受的TCP连接数（即握手次数）与耗时
+
+用法：python scripts/bench/bench_http_sessions.py [--requests 400] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.fetch_engine import FetchEngine  # noqa: E402
+from src.core.http_sessions import SessionRegistry  # noqa: E402
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with CountingHandler.lock:
+            CountingHandler.connections += 1
+
+    def do_GET(self):
+        body = b'{"data":{"f43":580.1,"f60":578.2}}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, get, url, total, workers):
+    CountingHandler.connections = 0
+    engine = FetchEngine(max_workers=workers, deadline=10.0)
+    t0 = time.perf_counter()
+    try:
+        for _ in range(total // workers):
+            engine.run({f"req{i}": (lambda: get(url, timeout=2.0).json()) for i in range(workers)})
+    finally:
+        engine.close(wait_for_tasks=True)
+    wall = time.perf_counter() - t0
+    print(f"{label:<10} requests={total:5d}  server_connections={CountingHandler.connections:5d}  "
+          f"wall={wall * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/qt/stock/get"
+
+    run("bare", requests.get, url, args.requests, args.workers)
+
+    registry = SessionRegistry(pool_size=args.workers)
+    session = registry.register("eastmoney", url)
+    registry.prewarm()
+    time.sleep(0.2)
+    run("registry", session.get, url, args.requests, args.workers)
+    print(f"registry stats: {registry.stats()}")
+    registry.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+加密货币列表渲染基准测试
+按 10 / 100 / 500 个币种的关注列表测量每次更新的渲染开销：
+    Python 侧：快照差分 + 补丁序列化（每个币种价格都变化的最坏情况）
+    页面侧：applyPatch + 强制布局的耗时，以及页面中实际存在的行元素数（虚拟列表只创建可见行）
+
+页面侧需要 PySide6（以 offscreen 平台加载 resources/ui/index.html），未安装时只输出 Python 侧结果
+
+用法：python scripts/bench/bench_render.py [--rows 10 100 500] [--updates 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from src.core.config import AppConfig  # noqa: E402
+from src.core.snapshot_diff import SnapshotDiffer  # noqa: E402
+
+
+def symbols(rows):
+    return [f"C{i:03d}" for i in range(rows)]
+
+
+def snapshot(names, step):
+    """第 step 次更新的快照：每个币种价格都变化"""
+    return {
+        "gold": {"intl": 2650.0 + step * 0.1, "intl_change": 0.5, "dom": 615.0, "dom_change": 0.4},
+        "silver": {"intl": 31.0, "intl_change": 0.3, "dom": 7.5, "dom_change": 0.2},
+        "crypto": {
+            name: {"price": 100.0 + i + step * 0.01, "change": (i + step) % 7 - 3.0}
+            for i, name in enumerate(names)
+        },
+        "exchange_rate": 7.2,
+        "status": {"gold": "ok", "silver": "ok", "crypto": "ok"},
+    }
+
+
+def bench_python(rows, updates):
+    """
+    Returns:
+        tuple: (每次更新的平均耗时 µs, 补丁平均字节数)
+    """
+    names = symbols(rows)
+    differ = SnapshotDiffer()
+    differ.diff(snapshot(names, 0))
+    total_bytes = 0
+    start = time.perf_counter()
+    for step in range(1, updates + 1):
+        patch = differ.diff(snapshot(names, step))
+        total_bytes += len(json.dumps(patch, separators=(",", ":")))
+    elapsed = time.perf_counter() - start
+    return elapsed / updates * 1e6, total_bytes / updates
+
+
+PAGE_SCRIPT = """
+(function () {
+    const names = %(names)s;
+    const updates = %(updates)d;
+    const patch = step => {
+        const crypto = {};
+        names.forEach((n, i) => { crypto[n] = { price: 100 + i + step * 0.01, change: (i + step) %% 7 - 3 }; });
+        return { crypto: crypto };
+    };
+    setWatchlist(names);
+    applyPatch(patch(0));
+    document.body.offsetHeight;
+    const samples = [];
+    for (let step = 1; step <= updates; step++) {
+        const p = patch(step);
+        const t0 = performance.now();
+        applyPatch(p);
+        document.body.offsetHeight;  // 强制布局，计入样式与排版开销
+        samples.push(performance.now() - t0);
+    }
+    samples.sort((a, b) => a - b);
+    return JSON.stringify({
+        mean_ms: samples.reduce((a, b) => a + b, 0) / samples.length,
+        p99_ms: samples[Math.floor(samples.length * 0.99) - 1],
+        dom_rows: document.querySelectorAll('.crypto-row').length
+    });
+})();
+"""
+
+
+def bench_page(row_counts, updates):
+    """
+    在 offscreen WebEngine 中加载页面并逐个关注列表规模测量
+
+    Returns:
+        dict: 行数 -> {"mean_ms", "p99_ms", "dom_rows"}；PySide6 不可用时返回 None
+    """
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtCore import QEventLoop, QUrl
+        from PySide6.QtWebEngineWidgets import QWebEngineView
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        return None
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    view = QWebEngineView()
+    view.resize(AppConfig.WINDOW_WIDTH, AppConfig.WINDOW_HEIGHT)
+    loop = QEventLoop(app)
+    view.loadFinished.connect(lambda ok: loop.quit())
+    view.setUrl(QUrl.fromLocalFile(AppConfig.get_html_path()))
+    loop.exec()
+
+    results = {}
+    for rows in row_counts:
+        out = {}
+
+        def done(value, rows=rows):
+            out[rows] = json.loads(value)
+            loop.quit()
+
+        script = PAGE_SCRIPT % {"names": json.dumps(symbols(rows)), "updates": updates}
+        view.page().runJavaScript(script, 0, done)
+        loop.exec()
+        results[rows] = out[rows]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--updates", type=int, default=200)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        per_update, size = bench_python(rows, args.updates)
+        print(f"python  rows={rows:4d}  diff+serialize={per_update:8.1f} µs/update  patch={size:8.0f} B")
+
+    page = bench_page(args.rows, args.updates)
+    if page is None:
+        print("page    skipped (PySide6 not installed)")
+        return
+    for rows in args.rows:
+        r = page[rows]
+        print(f"page    rows={rows:4d}  applyPatch+layout mean={r['mean_ms']:6.2f} ms  "
+              f"p99={r['p99_ms']:6.2f} ms  dom_rows={r['dom_rows']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+渲染方式基准测试
+对比 web（QtWebEngine 页面）与 native（QPainter 绘制）两种渲染方式：
+    冷启动耗时（--profile-startup 报告中的总耗时，至面板就绪且首个实时快照到达）
+    稳定后的常驻内存（应用进程及其全部子进程的 RSS 之和，web 方式包含 Chromium 渲染/GPU 进程）与进程数
+
+应用以客户端模式运行，快照由本脚本启动的本地行情中枢推送（中枢经桩服务回放 fixtures），因此可离线运行。
+需要安装 PySide6（含 QtWebEngine）并有可用的显示环境（无显示时可设置 QT_QPA_PLATFORM=offscreen）
+
+用法：python scripts/bench/bench_renderers.py [--runs 3] [--settle 10]
+"""
+import argparse
+import importlib.util
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from http_replay import StubServer, load_fixtures  # noqa: E402
+from src.core.config import AppConfig  # noqa: E402
+from src.core.data_fetcher import GoldDataFetcher  # noqa: E402
+from src.core.hub import HubServer, QuoteHub  # noqa: E402
+from src.core.scheduler import SourceScheduler  # noqa: E402
+
+RENDERERS = ("web", "native")
+TOTAL_RE = re.compile(r"^budget .*\(([\d.]+) ms\)$")
+
+
+def app_env(hub_url, renderer):
+    env = dict(os.environ, MFW_HUB_URL=hub_url, MFW_RENDERER=renderer)
+    env.pop("MFW_FETCH_PROCESS", None)
+    return env
+
+
+def startup_ms(hub_url, renderer):
+    """运行一次 --profile-startup，返回报告末尾的总耗时（毫秒）"""
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.main", "--profile-startup"],
+        cwd=ROOT, env=app_env(hub_url, renderer), capture_output=True, text=True, timeout=60,
+    )
+    totals = [float(m.group(1)) for m in map(TOTAL_RE.match, proc.stdout.splitlines()) if m]
+    if not totals:
+        raise RuntimeError(f"{renderer}: 未得到启动报告\n{proc.stdout}\n{proc.stderr}")
+    return totals[-1]
+
+
+def process_tree(root_pid):
+    """
+    统计进程树
+
+    Returns:
+        tuple: (进程数, RSS 之和 MB)
+    """
+    out = subprocess.run(["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True).stdout
+    children, rss = {}, {}
+    for line in out.splitlines():
+        pid, ppid, kb = (int(x) for x in line.split())
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = kb
+    tree, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, ()))
+    return len(tree), sum(rss.get(pid, 0) for pid in tree) / 1024
+
+
+def steady_memory(hub_url, renderer, settle):
+    """启动应用，等待 settle 秒后统计进程树"""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.main"], cwd=ROOT, env=app_env(hub_url, renderer),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(settle)
+        if proc.poll() is not None:
+            raise RuntimeError(f"{renderer}: 应用提前退出（状态 {proc.returncode}）")
+        return process_tree(proc.pid)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="每种渲染方式的冷启动次数")
+    parser.add_argument("--settle", type=float, default=10.0, help="测量内存前的等待时间（秒）")
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("PySide6") is None:
+        print("PySide6 未安装，跳过渲染方式基准测试")
+        return
+
+    AppConfig.HTTP_PREWARM = False
+    AppConfig.CRYPTO_STREAM_ENABLED = False
+    routes, _ = load_fixtures()
+    stub = StubServer(routes).start()
+    fetcher = stub.point(GoldDataFetcher())
+    hub = QuoteHub(SourceScheduler(fetcher), fetcher=fetcher).start()
+    server = HubServer(hub, 0).start()
+    try:
+        results = {}
+        for renderer in RENDERERS:
+            startups = [startup_ms(server.url, renderer) for _ in range(args.runs)]
+            results[renderer] = (statistics.median(startups), *steady_memory(server.url, renderer, args.settle))
+    finally:
+        server.stop()
+        hub.stop()
+        fetcher.close()
+        stub.stop()
+
+    for renderer, (startup, processes, rss) in results.items():
+        print(f"{renderer:<7} startup={startup:7.1f} ms (median of {args.runs})  "
+              f"processes={processes:2d}  rss={rss:7.1f} MB")
+    web, native = results["web"], results["native"]
+    print(f"native vs web: startup {1 - native[0] / web[0]:.1%} faster  rss {1 - native[2] / web[2]:.1%} smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+新浪行情解析基准测试
+对比旧实现（整体 gb18030 解码后逐代码 re.search + split）与 sina_parser.parse_quotes
+（字节上单遍扫描、只转换价格字段），在 5 个与 200 个代码的响应上的单次解析耗时
+
+用法：python scripts/bench/bench_sina_parser.py [--sizes 5,200]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.sina_parser import parse_quotes  # noqa: E402
+
+TEMPLATES = {
+    "hf_": '{p:.2f},{c:.2f},{p:.2f},{p:.2f},{h:.2f},{l:.2f},14:59:00,{c:.2f},{c:.2f},0,0,0,2024-12-27,国际品种{i}',
+    "fx_": '14:59:59,{p:.4f},{p:.4f},{c:.4f},95,{p:.4f},{h:.4f},{l:.4f},{p:.4f},外汇品种{i},0.0014,0.0100,0.0010,2024-12-27',
+    "SGE_": 'T{i},上金所品种{i},sge{i},{p:.2f},{c:.2f},{c:.2f},{h:.2f},{l:.2f},{p:.2f},{p:.2f},{c:.2f},0,0,14:59:58',
+}
+
+
+def make_payload(count, seed=7):
+    """生成 count 个代码的响应体（hf_/fx_/SGE_ 轮流混合，gb18030 编码）"""
+    rng = random.Random(seed)
+    prefixes = list(TEMPLATES)
+    symbols, lines = [], []
+    for i in range(count):
+        prefix = prefixes[i % len(prefixes)]
+        symbol = f"{prefix}S{i:03d}"
+        p = rng.uniform(1, 3000)
+        line = TEMPLATES[prefix].format(p=p, c=p * 0.99, h=p * 1.01, l=p * 0.98, i=i)
+        symbols.append(symbol)
+        lines.append(f'var hq_str_{symbol}="{line}";\n')
+    return "".join(lines).encode("gb18030"), symbols
+
+
+def legacy_parse(content, symbols):
+    """旧实现（GoldDataFetcher._parse_sina）：逐代码在整段文本上重新搜索"""
+    html = content.decode('gb18030', errors='ignore')
+    quotes = {}
+    for key in symbols:
+        m = re.search(f'{key}="([^"]+)"', html)
+        if m:
+            quotes[key] = m.group(1).split(',')
+    return quotes
+
+
+def best_us(fn, repeat=7):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="5,200", help="代码数量，逗号分隔")
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        content, symbols = make_payload(size)
+        assert set(parse_quotes(content, symbols)) == set(legacy_parse(content, symbols))
+        legacy = best_us(lambda: legacy_parse(content, symbols))
+        single = best_us(lambda: parse_quotes(content, symbols))
+        print(f"symbols={size:4d}  bytes={len(content):6d}  legacy={legacy:9.1f} us  "
+              f"single_pass={single:8.1f} us  speedup={legacy / single:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
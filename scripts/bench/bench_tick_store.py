@@ -0,0 +1,79 @@
+"""
+本地行情存储基准测试
+模拟 50 个品种、1 秒一笔的持续写入（默认一个月），期间按天压缩，
+输出写入吞吐以及范围查询、K线查询、启动预热的延迟
+
+用法：python scripts/bench/bench_tick_store.py [--days 30] [--instruments 50] [--db 路径]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.tick_store import TickStore  # noqa: E402
+
+
+def timed(label, fn, repeat=5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<28} {best * 1000:9.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--instruments", type=int, default=50)
+    parser.add_argument("--db", default=None, help="数据库路径，默认使用临时目录")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="tick-bench-"), "ticks.sqlite3")
+    store = TickStore(path, batch_size=5000, flush_interval=0.5)
+    names = [f"crypto.C{i:03d}" for i in range(args.instruments)]
+    prices = [random.uniform(1, 1000) for _ in names]
+
+    seconds = int(args.days * 86400)
+    start = time.time() - seconds
+    total = seconds * len(names)
+    compact_time = 0.0
+
+    t0 = time.perf_counter()
+    for sec in range(seconds):
+        ts = start + sec
+        for i in range(len(prices)):
+            prices[i] *= 1 + random.uniform(-0.0005, 0.0005)
+        store.record_rows([(names[i], ts, prices[i]) for i in range(len(names))], block=True)
+        if sec and sec % 86400 == 0:
+            # 模拟运行中的每日压缩（先等待写入追上）
+            while store.written < (sec * len(names)):
+                time.sleep(0.01)
+            c0 = time.perf_counter()
+            store.compact(now=ts)
+            compact_time += time.perf_counter() - c0
+    while store.written < total:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - t0
+
+    print(f"instruments={len(names)} days={args.days} rows={total:,} db={path}")
+    print(f"sustained write: {total / elapsed:,.0f} rows/s ({elapsed:.1f} s, compaction {compact_time:.1f} s)")
+    print(f"database size:   {os.path.getsize(path) / 1024 / 1024:.1f} MiB")
+
+    end = start + seconds
+    name = names[0]
+    timed("range query 1h ticks", lambda: store.query(name, end - 3600, end))
+    timed("range query 1d ticks", lambda: store.query(name, end - 86400, end))
+    timed("bars query full range", lambda: store.query_bars(name, start, end))
+    timed("startup load_recent(1h)", lambda: store.load_recent(1, now=end))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
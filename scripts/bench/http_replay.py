@@ -0,0 +1,264 @@
+"""
+行情接口录制/回放桩服务
+一次性录制新浪、OKX、东方财富的真实响应到 fixtures 目录，之后由本地桩服务按可配置的
+延迟、抖动与错误率回放，供基准测试在离线环境下运行
+
+fixtures 目录内容：
+    manifest.json          路由 -> 文件名与 Content-Type
+    sina.txt               新浪 list= 响应（gb18030 原始字节）
+    okx_SPOT.json / okx_SWAP.json
+    eastmoney_<secid>.json
+
+用法：
+    录制真实响应：python scripts/bench/http_replay.py record [--out scripts/bench/fixtures]
+    生成合成响应：python scripts/bench/http_replay.py synth [--out ...]（格式与真实响应一致，固定随机种子）
+    启动回放服务：python scripts/bench/http_replay.py serve [--latency 0.05] [--jitter 0.02] [--error-rate 0.01]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.config import AppConfig  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _write_fixtures(out, files):
+    """写入 fixtures：files 为 路由键 -> (文件名, Content-Type, 字节)"""
+    os.makedirs(out, exist_ok=True)
+    manifest = {}
+    for route, (filename, content_type, body) in files.items():
+        with open(os.path.join(out, filename), "wb") as f:
+            f.write(body)
+        manifest[route] = {"file": filename, "content_type": content_type}
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def record(out):
+    """用应用自身的会话请求真实接口并保存响应"""
+    from src.core.data_fetcher import GoldDataFetcher
+
+    AppConfig.HTTP_PREWARM = False
+    fetcher = GoldDataFetcher()
+    files = {}
+    try:
+        resp = fetcher.session.get(fetcher.sina_base_url + ",".join(fetcher.SINA_SYMBOLS), timeout=5)
+        files["sina"] = ("sina.txt", "text/javascript; charset=GBK", resp.content)
+        okx = fetcher.sessions.get("okx")
+        for inst_type in ("SPOT", "SWAP"):
+            resp = okx.get(f"{AppConfig.OKX_API_URL}/api/v5/market/tickers",
+                           params={"instType": inst_type}, timeout=5)
+            files[f"okx:{inst_type}"] = (f"okx_{inst_type}.json", "application/json", resp.content)
+        eastmoney = fetcher.sessions.get("eastmoney")
+        for secid in fetcher.EASTMONEY_SGE_SECIDS.values():
+            resp = eastmoney.get(fetcher.eastmoney_url, params=fetcher._eastmoney_params(secid), timeout=5)
+            files[f"eastmoney:{secid}"] = (f"eastmoney_{secid}.json", "application/json", resp.content)
+    finally:
+        fetcher.close()
+    _write_fixtures(out, files)
+    return files
+
+
+def synthesize(out, tickers=120, seed=42):
+    """
+    生成格式与真实响应一致的合成 fixtures（固定随机种子，结果可复现）
+
+    Args:
+        out: 输出目录
+        tickers: 每种OKX产品类型的行情条数（真实接口约数百条，影响解析开销）
+        seed: 随机种子
+    """
+    rng = random.Random(seed)
+    sina = (
+        'var hq_str_hf_XAU="2650.11,2645.30,2650.11,2650.51,2659.93,2633.41,14:59:00,2645.30,'
+        '2640.17,0,0,0,2024-12-27,伦敦金（现货黄金）";\n'
+        'var hq_str_hf_SI="29.435,29.610,29.435,29.455,29.780,29.215,14:59:00,29.610,29.520,'
+        '0,0,0,2024-12-27,伦敦银（现货白银）";\n'
+        'var hq_str_fx_susdcny="14:59:59,7.2990,7.3000,7.2985,95,7.2988,7.3010,7.2930,7.2990,'
+        '美元兑人民币即期汇率,0.0014,0.0100,0.0010,2024-12-27";\n'
+        'var hq_str_SGE_AUTD="AUTD,黄金延期,hjyq,615.50,612.30,613.00,616.80,611.20,615.45,'
+        '615.55,612.30,0,0,14:59:58";\n'
+        'var hq_str_SGE_AGTD="AGTD,白银延期,byyq,7520.00,7488.00,7490.00,7545.00,7470.00,'
+        '7519.00,7521.00,7488.00,0,0,14:59:58";\n'
+    )
+    files = {"sina": ("sina.txt", "text/javascript; charset=GBK", sina.encode("gb18030"))}
+
+    bases = [sym.replace("USDT", "") for sym in AppConfig.CRYPTO_SYMBOLS.values()]
+    bases += [f"T{i:03d}" for i in range(max(0, tickers - len(bases)))]
+    for inst_type in ("SPOT", "SWAP"):
+        suffix = "-SWAP" if inst_type == "SWAP" else ""
+        data = []
+        for base in bases[:tickers]:
+            last = rng.uniform(0.01, 60000)
+            data.append({
+                "instType": inst_type, "instId": f"{base}-USDT{suffix}",
+                "last": f"{last:.4f}", "lastSz": "0.01", "askPx": f"{last * 1.0001:.4f}", "askSz": "1",
+                "bidPx": f"{last * 0.9999:.4f}", "bidSz": "1", "open24h": f"{last * rng.uniform(0.95, 1.05):.4f}",
+                "high24h": f"{last * 1.05:.4f}", "low24h": f"{last * 0.95:.4f}", "volCcy24h": "1000000",
+                "vol24h": "1000", "ts": "1735286399000", "sodUtc0": f"{last:.4f}", "sodUtc8": f"{last:.4f}",
+            })
+        body = json.dumps({"code": "0", "msg": "", "data": data}, separators=(",", ":")).encode()
+        files[f"okx:{inst_type}"] = (f"okx_{inst_type}.json", "application/json", body)
+
+    for secid, price, prev in (("118.AUTD", 615.5, 612.3), ("118.AGTD", 7520.0, 7488.0)):
+        body = json.dumps({"rc": 0, "rt": 4, "data": {
+            "f43": price, "f57": secid.split(".")[1], "f58": secid, "f60": prev,
+        }}, ensure_ascii=False).encode()
+        files[f"eastmoney:{secid}"] = (f"eastmoney_{secid}.json", "application/json", body)
+    _write_fixtures(out, files)
+    return files
+
+
+def load_fixtures(path=DEFAULT_FIXTURES):
+    """
+    读取 fixtures（目录不存在时先生成合成 fixtures）
+
+    Returns:
+        tuple: (routes, digest) — 路由键 -> (Content-Type, 字节)，以及全部内容的摘要（用于跨提交比较）
+    """
+    if not os.path.exists(os.path.join(path, "manifest.json")):
+        synthesize(path)
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    routes, sha = {}, hashlib.sha1()
+    for route in sorted(manifest):
+        entry = manifest[route]
+        with open(os.path.join(path, entry["file"]), "rb") as f:
+            body = f.read()
+        routes[route] = (entry["content_type"], body)
+        sha.update(route.encode() + body)
+    return routes, sha.hexdigest()[:12]
+
+
+class StubServer:
+    """回放桩服务：按路由返回 fixtures，叠加延迟、抖动与随机错误"""
+
+    def __init__(self, routes, latency=0.0, jitter=0.0, error_rate=0.0, seed=0, port=0):
+        """
+        Args:
+            routes: load_fixtures 返回的路由表
+            latency: 基础响应延迟（秒）
+            jitter: 延迟抖动幅度（秒），实际延迟在 latency ± jitter 内均匀分布
+            error_rate: 返回 503 的概率
+            seed: 随机种子（错误与抖动可复现）
+            port: 监听端口，0 为自动分配
+        """
+        self.routes = routes
+        self.latency, self.jitter, self.error_rate = latency, jitter, error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _route(self, path):
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        if url.path.startswith("/list="):
+            return "sina"
+        if url.path.endswith("/api/v5/market/tickers"):
+            return "okx:" + query.get("instType", ["SPOT"])[0]
+        if url.path.endswith("/api/qt/stock/get"):
+            return "eastmoney:" + query.get("secid", [""])[0]
+        return None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._rng_lock:
+                    stub.requests += 1
+                    delay = max(0.0, stub.latency + stub._rng.uniform(-stub.jitter, stub.jitter))
+                    fail = stub._rng.random() < stub.error_rate
+                if delay:
+                    time.sleep(delay)
+                entry = stub.routes.get(stub._route(self.path))
+                if fail or entry is None:
+                    with stub._rng_lock:
+                        stub.errors += 1
+                    self.send_response(503 if fail else 404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                content_type, body = entry
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="stub", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def point(self, fetcher):
+        """将 GoldDataFetcher 的各接口地址指向本桩服务"""
+        fetcher.sina_base_url = self.url + "/list="
+        fetcher.eastmoney_url = self.url + "/api/qt/stock/get"
+        fetcher.crypto_source.base_url = self.url
+        return fetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("record", "synth"):
+        p = sub.add_parser(name)
+        p.add_argument("--out", default=DEFAULT_FIXTURES)
+    p = sub.add_parser("serve")
+    p.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    p.add_argument("--port", type=int, default=8766)
+    p.add_argument("--latency", type=float, default=0.05)
+    p.add_argument("--jitter", type=float, default=0.02)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        files = record(args.out)
+        print(f"recorded {len(files)} responses -> {args.out}")
+    elif args.command == "synth":
+        files = synthesize(args.out)
+        print(f"synthesized {len(files)} responses -> {args.out}")
+    else:
+        routes, digest = load_fixtures(args.fixtures)
+        stub = StubServer(routes, args.latency, args.jitter, args.error_rate, port=args.port).start()
+        print(f"serving fixtures {digest} on {stub.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    main()
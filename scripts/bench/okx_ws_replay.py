@@ -0,0 +1,247 @@
+"""
+OKX tickers 频道本地回放服务
+用标准库实现的最小WebSocket服务端，按指定速率回放录制的（或合成的）行情帧，
+用于在不访问OKX的情况下测试 OkxTickerStream 的吞吐、断线重连与REST回退
+
+用法：
+    录制：python scripts/bench/okx_ws_replay.py record --seconds 60 --out frames.jsonl
+    回放：python scripts/bench/okx_ws_replay.py serve [--frames frames.jsonl] [--rate 2000] [--port 8765]
+    压测：python scripts/bench/okx_ws_replay.py bench [--frames frames.jsonl] [--rate 5000] [--seconds 5]
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.config import AppConfig  # noqa: E402
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def encode_frame(payload, opcode=0x1):
+    """编码服务端帧（不加掩码）"""
+    data = payload.encode() if isinstance(payload, str) else payload
+    n = len(data)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + data
+
+
+async def read_frame(reader):
+    """读取一个客户端帧（客户端帧带掩码）"""
+    b1, b2 = await reader.readexactly(2)
+    opcode, n = b1 & 0x0F, b2 & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if b2 & 0x80 else b"\0\0\0\0"
+    data = bytearray(await reader.readexactly(n))
+    for i in range(n):
+        data[i] ^= mask[i % 4]
+    return opcode, bytes(data)
+
+
+def synthetic_frames(inst_ids, count=1000):
+    """为订阅的 instId 合成随机游走行情帧"""
+    prices = {inst: random.uniform(1, 60000) for inst in inst_ids}
+    frames = []
+    for k in range(count):
+        inst = inst_ids[k % len(inst_ids)]
+        prices[inst] *= 1 + random.uniform(-0.0005, 0.0005)
+        frames.append(json.dumps({
+            "arg": {"channel": "tickers", "instId": inst},
+            "data": [{"instId": inst, "last": f"{prices[inst]:.4f}", "open24h": "100"}],
+        }))
+    return frames
+
+
+class ReplayServer:
+    """回放服务：客户端订阅后按速率循环推送帧"""
+
+    def __init__(self, host="127.0.0.1", port=0, frames=None, rate=1000.0):
+        self.host, self.port = host, port
+        self.frames = frames
+        self.rate = rate
+        self.sent = 0
+        self._server = None
+        self._loop = None
+
+    async def _handle(self, reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        headers = dict(
+            line.split(": ", 1) for line in request.decode().split("\r\n")[1:] if ": " in line
+        )
+        accept = base64.b64encode(
+            hashlib.sha1((headers.get("Sec-WebSocket-Key", "") + _GUID).encode()).digest()
+        ).decode()
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+
+        frames = self.frames
+        try:
+            while True:
+                opcode, data = await read_frame(reader)
+                if opcode == 0x8:
+                    return
+                if opcode == 0x9:
+                    writer.write(encode_frame(data, 0xA))
+                    continue
+                msg = json.loads(data or b"{}")
+                if msg.get("op") == "subscribe":
+                    inst_ids = [a["instId"] for a in msg.get("args", [])]
+                    frames = frames or synthetic_frames(inst_ids)
+                    break
+            await self._replay(writer, [encode_frame(f) for f in frames])
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _replay(self, writer, encoded):
+        # 按已流逝时间补足应发送的帧数，以达到目标速率
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        i = 0
+        while True:
+            target = int((loop.time() - start) * self.rate)
+            while i < target:
+                writer.write(encoded[i % len(encoded)])
+                i += 1
+            self.sent = i
+            await writer.drain()
+            await asyncio.sleep(0.005)
+
+    async def _serve(self, ready):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self):
+        """在后台线程运行服务，返回 ws:// 地址"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._serve(ready))
+            except asyncio.CancelledError:
+                pass
+
+        threading.Thread(target=run, name="ws-replay", daemon=True).start()
+        ready.wait()
+        return f"ws://{self.host}:{self.port}"
+
+    def stop(self):
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
+            for task in asyncio.all_tasks(self._loop):
+                self._loop.call_soon_threadsafe(task.cancel)
+
+
+def load_frames(path):
+    if not path:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def cmd_record(args):
+    """连接真实OKX并录制行情帧"""
+    import websocket
+    from src.core.crypto_source import OkxBatchCryptoSource
+
+    inst_ids = [OkxBatchCryptoSource.inst_id(sym, "SPOT") for sym in AppConfig.CRYPTO_SYMBOLS.values()]
+    ws = websocket.create_connection(AppConfig.OKX_WS_URL, timeout=10)
+    ws.send(json.dumps({"op": "subscribe", "args": [{"channel": "tickers", "instId": i} for i in inst_ids]}))
+    deadline = time.monotonic() + args.seconds
+    count = 0
+    with open(args.out, "w", encoding="utf-8") as f:
+        while time.monotonic() < deadline:
+            message = ws.recv()
+            if '"data"' in message:
+                f.write(message + "\n")
+                count += 1
+    ws.close()
+    print(f"recorded {count} frames -> {args.out}")
+
+
+def cmd_serve(args):
+    server = ReplayServer(port=args.port, frames=load_frames(args.frames), rate=args.rate)
+    url = server.start_in_thread()
+    print(f"replaying on {url} at {args.rate:.0f} frames/s (Ctrl+C to stop)")
+    print(f"run the app with MFW_CRYPTO_STREAM=1 MFW_OKX_WS_URL={url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+def cmd_bench(args):
+    from src.core.crypto_stream import OkxTickerStream
+
+    if not OkxTickerStream.available():
+        print("websocket-client 未安装：pip install websocket-client")
+        return
+    server = ReplayServer(frames=load_frames(args.frames), rate=args.rate)
+    url = server.start_in_thread()
+    stream = OkxTickerStream(AppConfig.CRYPTO_SYMBOLS, url=url)
+    stream.start()
+    time.sleep(1.0)  # 连接与订阅
+    m0, t0 = stream.messages, time.perf_counter()
+    reads, read_time = 0, 0.0
+    while time.perf_counter() - t0 < args.seconds:
+        r0 = time.perf_counter()
+        stream.latest()
+        read_time += time.perf_counter() - r0
+        reads += 1
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - t0
+    print(f"target rate {args.rate:.0f} frames/s, server sent {server.sent / (elapsed + 1.0):,.0f} frames/s, "
+          f"client processed {(stream.messages - m0) / elapsed:,.0f} frames/s")
+    print(f"latest() read: {read_time / reads * 1e6:.1f} us avg over {reads} reads, live={stream.is_live()}")
+
+    server.stop()
+    time.sleep(2.0)
+    print(f"after server stop: live={stream.is_live()} (fetch_crypto falls back to REST)")
+    stream.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("record")
+    p.add_argument("--seconds", type=float, default=60)
+    p.add_argument("--out", default="okx_frames.jsonl")
+    p = sub.add_parser("serve")
+    p.add_argument("--frames")
+    p.add_argument("--rate", type=float, default=1000)
+    p.add_argument("--port", type=int, default=8765)
+    p = sub.add_parser("bench")
+    p.add_argument("--frames")
+    p.add_argument("--rate", type=float, default=5000)
+    p.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    {"record": cmd_record, "serve": cmd_serve, "bench": cmd_bench}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+离线基准测试套件
+基于 http_replay 的录制响应与本地桩服务，测量：
+    fetch_all[thread|asyncio]   GoldDataFetcher.fetch_all 整轮耗时（p50/p99，经由本地桩服务）
+    parse_sina                  新浪响应解析
+    parse_okx                   OKX 批量行情解析与分发
+    build_snapshot              溢价推演（组装数据字典）
+    patch_full / patch_delta    handle_data 的差分 + JSON 序列化（完整快照 / 单价格变化）
+
+结果可保存为JSON（附提交号与 fixtures 摘要），并与之前的结果比较，超出阈值时以非零状态退出
+
+用法：
+    python scripts/bench/suite.py [--save results.json] [--compare baseline.json] [--threshold 0.15] [--runs 5]
+    python scripts/bench/suite.py --latency 0.02 --jitter 0.01 --error-rate 0.05 --ticks 200
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from http_replay import DEFAULT_FIXTURES, StubServer, load_fixtures  # noqa: E402
+from src.core.async_engine import AsyncFetchEngine  # noqa: E402
+from src.core.config import AppConfig  # noqa: E402
+from src.core.data_fetcher import GoldDataFetcher  # noqa: E402
+from src.core.sina_parser import parse_quotes  # noqa: E402
+from src.core.snapshot_diff import SnapshotDiffer  # noqa: E402
+
+
+def micro(fn, repeat=9, budget=0.02):
+    """微基准：自动确定每轮次数（约 budget 秒），重复 repeat 轮取最快一轮的单次耗时（微秒），对后台噪声最不敏感"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * budget / 0.2))
+    return {"us": min(timer.repeat(number=number, repeat=repeat)) / number * 1e6}
+
+
+def bench_fetch_all(routes, engine, args):
+    AppConfig.FETCH_ENGINE = engine
+    AppConfig.HTTP_PREWARM = False
+    AppConfig.CRYPTO_STREAM_ENABLED = False
+    stub = StubServer(routes, args.latency, args.jitter, args.error_rate, seed=1).start()
+    fetcher = stub.point(GoldDataFetcher())
+    try:
+        fetcher.fetch_all()  # 预热连接与币种类型解析
+        samples, errors = [], 0
+        for _ in range(args.ticks):
+            t0 = time.perf_counter()
+            data = fetcher.fetch_all()
+            samples.append((time.perf_counter() - t0) * 1000)
+            # 数据源失败时各抓取方法返回空结果而不抛出，按结果完整性统计
+            errors += bool(data.get("error")) or not data["crypto"] or not data["gold"]["intl"]
+    finally:
+        fetcher.close()
+        stub.stop()
+    samples.sort()
+    return {
+        "p50_ms": samples[len(samples) // 2],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "incomplete_ticks": errors,
+    }
+
+
+def run_micro(routes):
+    """CPU 微基准（不涉及网络）"""
+    results = {}
+    AppConfig.FETCH_ENGINE = "thread"
+    AppConfig.HTTP_PREWARM = False
+    fetcher = GoldDataFetcher()
+    sina_body = routes["sina"][1]
+    symbols = fetcher.SINA_SYMBOLS
+    results["parse_sina"] = micro(lambda: parse_quotes(sina_body, symbols))
+
+    okx_bodies = {t: routes[f"okx:{t}"][1] for t in ("SPOT", "SWAP")}
+    source = fetcher.crypto_source
+
+    def parse_okx():
+        source.resolved.clear()
+        fetched = {
+            t: {x.get("instId"): x for x in json.loads(body)["data"]} for t, body in okx_bodies.items()
+        }
+        return source._collect(source._types_to_fetch(), fetched.get)
+    results["parse_okx"] = micro(parse_okx)
+
+    quotes = parse_quotes(sina_body, symbols)
+    crypto = parse_okx()
+    results["build_snapshot"] = micro(
+        lambda: fetcher.build_snapshot(fetcher.new_snapshot(), quotes, crypto)
+    )
+
+    snapshot = fetcher.build_snapshot(fetcher.new_snapshot(), quotes, crypto)
+    differ = SnapshotDiffer()
+
+    def patch_full():
+        differ.reset()
+        return json.dumps(differ.diff(snapshot), separators=(",", ":"))
+    results["patch_full"] = micro(patch_full)
+
+    moved = json.loads(json.dumps(snapshot))
+    toggle = [snapshot, moved]
+    differ.reset()
+    differ.diff(snapshot)
+
+    def patch_delta():
+        # 每次只有黄金国际价变化一个显示单位
+        toggle.reverse()
+        moved["gold"]["intl"] = snapshot["gold"]["intl"] + 0.01
+        return json.dumps(differ.diff(toggle[0]), separators=(",", ":"))
+    results["patch_delta"] = micro(patch_delta)
+    fetcher.close()
+    return results
+
+
+def run_micro_best_of(args):
+    """
+    在 --runs 个独立子进程中运行微基准，逐项取最小值
+    （同一台机器上不同进程的耗时可能呈双峰分布，单进程内重复无法消除）
+    """
+    best = {}
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--fixtures", args.fixtures, "--micro-only"],
+            capture_output=True, text=True, cwd=ROOT, check=True,
+        )
+        for name, result in json.loads(out.stdout.strip().splitlines()[-1]).items():
+            if name not in best or result["us"] < best[name]["us"]:
+                best[name] = result
+    return best
+
+
+def run_suite(args):
+    routes, digest = load_fixtures(args.fixtures)
+    results = run_micro_best_of(args) if args.runs > 1 else run_micro(routes)
+
+    # 网络相关测量放在微基准之后，避免桩服务的后台线程干扰
+    engines = ["thread"] + (["asyncio"] if AsyncFetchEngine.available() else [])
+    for engine in engines:
+        results[f"fetch_all[{engine}]"] = bench_fetch_all(routes, engine, args)
+
+    return {
+        "commit": _git_commit(),
+        "fixtures": digest,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {"latency": args.latency, "jitter": args.jitter,
+                   "error_rate": args.error_rate, "ticks": args.ticks, "runs": args.runs},
+        "results": results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _headline(result):
+    """每项用于比较的主指标（越小越好）"""
+    return result.get("us", result.get("p50_ms"))
+
+
+def report(run, baseline=None, threshold=0.15):
+    """
+    打印结果表，有基线时附带变化比例
+
+    Returns:
+        list: 超出阈值的回归项名称
+    """
+    print(f"commit {run['commit']}  fixtures {run['fixtures']}  python {run['python']}  params {run['params']}")
+    if baseline:
+        print(f"baseline {baseline.get('commit')}  fixtures {baseline.get('fixtures')}")
+        if baseline.get("fixtures") != run["fixtures"] or baseline.get("params") != run["params"]:
+            print("warning: fixtures/params differ from baseline, comparison is not like-for-like")
+    regressions = []
+    for name, result in run["results"].items():
+        detail = "  ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                           for k, v in result.items())
+        line = f"{name:<20}{detail}"
+        old = (baseline or {}).get("results", {}).get(name)
+        if old:
+            delta = _headline(result) / _headline(old) - 1
+            line += f"   {delta:+.1%}"
+            if delta > threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--latency", type=float, default=0.01, help="桩服务基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.005, help="延迟抖动（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="桩服务返回503的概率")
+    parser.add_argument("--ticks", type=int, default=100, help="fetch_all 测量轮数")
+    parser.add_argument("--save", help="将结果写入JSON文件")
+    parser.add_argument("--compare", help="与之前保存的结果比较")
+    parser.add_argument("--threshold", type=float, default=0.15, help="判定为回归的变慢比例")
+    parser.add_argument("--runs", type=int, default=5, help="微基准的独立进程数（逐项取最小值）")
+    parser.add_argument("--micro-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.micro_only:
+        routes, _ = load_fixtures(args.fixtures)
+        print(json.dumps(run_micro(routes)))
+        return
+
+    run = run_suite(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = report(run, baseline, args.threshold)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+命令行行情输出 - 无界面入口（不依赖 PySide6）
+按固定节奏抓取快照并输出到标准输出：NDJSON（每个快照一行）、CSV（每个品种一行），
+或在终端中原地刷新的行情表。可在服务器与管道中运行，也可配合本地桩服务作为压测负载
+
+用法：
+    python -m src.cli                                   # 终端行情表，每秒刷新
+    python -m src.cli --format ndjson --interval 5 | jq .gold
+    python -m src.cli --format csv --count 60 > quotes.csv
+    python -m src.cli --hub                             # 读取本地行情中枢的快照，不自行请求上游
+    python -m src.cli --format ndjson --interval 0 --force --upstream http://127.0.0.1:8766 > /dev/null
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import unicodedata
+
+from .core.alerts import instrument_label
+from .core.config import AppConfig
+from .core.logs import setup_logging
+
+log = logging.getLogger(__name__)
+
+FORMATS = ("table", "ndjson", "csv")
+CSV_FIELDS = ("timestamp", "instrument", "price", "change", "stale", "closed")
+
+# 终端控制序列：光标移到左上角并清屏
+CLEAR = "\033[H\033[2J"
+GREEN = "\033[32m"
+RED = "\033[31m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+
+def snapshot_rows(data):
+    """
+    将快照展开为品种行
+
+    Args:
+        data: fetch_all 返回的数据字典
+
+    Yields:
+        dict: CSV_FIELDS 对应的字段；价格为0的品种跳过
+    """
+    ts = data.get("timestamp") or time.time()
+    stale_rows = data.get("stale_rows") or {}
+    stale_all = bool(data.get("stale"))
+    status = data.get("market_status") or {}
+    for metal in ("gold", "silver"):
+        section = data.get(metal) or {}
+        for key in ("intl", "dom"):
+            if section.get(key):
+                yield {
+                    "timestamp": ts,
+                    "instrument": f"{metal}.{key}",
+                    "price": section[key],
+                    "change": section.get(f"{key}_change"),
+                    "stale": stale_all or bool(stale_rows.get(f"{metal}.{key}")),
+                    "closed": key == "dom" and status.get(metal) == "closed",
+                }
+    if data.get("exchange_rate"):
+        yield {
+            "timestamp": ts, "instrument": "fx.usdcny", "price": data["exchange_rate"], "change": None,
+            "stale": stale_all or bool(stale_rows.get("exchange_rate")), "closed": False,
+        }
+    crypto_stale = stale_all or bool(stale_rows.get("crypto"))
+    for symbol, info in (data.get("crypto") or {}).items():
+        if info and info.get("price"):
+            yield {
+                "timestamp": ts, "instrument": f"crypto.{symbol}", "price": info["price"],
+                "change": info.get("change"), "stale": crypto_stale, "closed": False,
+            }
+
+
+def _width(text):
+    """终端显示宽度（全角字符占两列）"""
+    return sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+
+
+def _pad(text, width, right=False):
+    fill = " " * max(0, width - _width(text))
+    return fill + text if right else text + fill
+
+
+class NdjsonWriter:
+    """每个快照输出一行JSON"""
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, data):
+        self.out.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.out.flush()
+
+
+class CsvWriter:
+    """每个品种输出一行（长表格式，关注列表变化时表头不变）"""
+
+    def __init__(self, out):
+        self.out = out
+        self.writer = csv.DictWriter(out, CSV_FIELDS, lineterminator="\n")
+        self.writer.writeheader()
+
+    def write(self, data):
+        for row in snapshot_rows(data):
+            row["timestamp"] = f"{row['timestamp']:.3f}"
+            row["change"] = "" if row["change"] is None else f"{row['change']:.2f}"
+            row["stale"] = int(row["stale"])
+            row["closed"] = int(row["closed"])
+            self.writer.writerow(row)
+        self.out.flush()
+
+
+class TableWriter:
+    """终端行情表：输出到终端时原地刷新并着色，否则按快照依次追加"""
+
+    def __init__(self, out):
+        self.out = out
+        self.tty = out.isatty()
+
+    def _color(self, text, code):
+        return f"{code}{text}{RESET}" if self.tty and code else text
+
+    def write(self, data):
+        lines = [f"市场行情  {time.strftime('%H:%M:%S', time.localtime(data.get('timestamp') or time.time()))}"]
+        lines.append(f"{_pad('品种', 12)}{_pad('价格', 14, True)}{_pad('涨跌幅', 10, True)}  状态")
+        for row in snapshot_rows(data):
+            change = row["change"]
+            change_text = "--" if change is None else f"{change:+.2f}%"
+            color = None if change is None else (GREEN if change >= 0 else RED)
+            notes = [note for note, on in (("休市", row["closed"]), ("过期", row["stale"])) if on]
+            digits = 4 if row["instrument"] == "fx.usdcny" else 2
+            price_text = f"{row['price']:.{digits}f}"
+            line = (f"{_pad(instrument_label(row['instrument']), 12)}{_pad(price_text, 14, True)}"
+                    f"{self._color(_pad(change_text, 10, True), color)}  {' '.join(notes)}")
+            lines.append(self._color(line, DIM) if row["stale"] else line)
+        if data.get("error"):
+            lines.append(f"错误: {data['error']}")
+        text = "\n".join(lines) + "\n"
+        self.out.write(CLEAR + text if self.tty else text + "\n")
+        self.out.flush()
+
+
+WRITERS = {"table": TableWriter, "ndjson": NdjsonWriter, "csv": CsvWriter}
+
+
+def _point_upstream(fetcher, base_url):
+    """将各数据源的接口地址指向同一个基础地址（本地桩服务，与 http_replay.py serve 的路由一致）"""
+    base_url = base_url.rstrip("/")
+    fetcher.sina_base_url = base_url + "/list="
+    fetcher.eastmoney_url = base_url + "/api/qt/stock/get"
+    fetcher.crypto_source.base_url = base_url
+    return fetcher
+
+
+def _snapshot_source(args):
+    """
+    创建快照来源
+
+    Returns:
+        tuple: (无参函数，返回快照字典或None, 清理函数)
+    """
+    if args.hub is not None:
+        from .core.hub import fetch_snapshot
+        url = args.hub or None
+        return (lambda: fetch_snapshot(url)), (lambda: None)
+
+    from .core.data_fetcher import GoldDataFetcher
+    from .core.scheduler import SourceScheduler
+    if args.upstream:
+        # 桩服务：不预热真实主机、不连接行情流
+        AppConfig.HTTP_PREWARM = False
+        AppConfig.CRYPTO_STREAM_ENABLED = False
+    fetcher = GoldDataFetcher()
+    if args.upstream:
+        _point_upstream(fetcher, args.upstream)
+    scheduler = SourceScheduler(fetcher)
+    return (lambda: scheduler.fetch_all(force=args.force)), fetcher.close
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="命令行行情输出")
+    parser.add_argument("--format", choices=FORMATS, default="table", help="输出格式，默认为终端行情表")
+    parser.add_argument("--interval", type=float, default=AppConfig.UPDATE_INTERVAL_MS / 1000,
+                        help="快照间隔（秒），0 为抓取完成后立即开始下一次")
+    parser.add_argument("--count", type=int, default=0, help="输出的快照数，0 为持续运行")
+    parser.add_argument("--hub", nargs="?", const="", default=None, metavar="URL",
+                        help="读取本地行情中枢的最新快照，不自行请求上游（默认地址同 MFW_HUB_URL）")
+    parser.add_argument("--upstream", metavar="URL", help="将全部数据源指向该地址（本地桩服务）")
+    parser.add_argument("--force", action="store_true",
+                        help="每次都请求全部数据源，不按分源刷新节奏跳过（用作压测负载）")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    fetch, close = _snapshot_source(args)
+    writer = WRITERS[args.format](sys.stdout)
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    written, fetches, fetch_seconds = 0, 0, 0.0
+    started = time.monotonic()
+    next_due = started
+    try:
+        while not stop.is_set():
+            begin = time.monotonic()
+            data = fetch()
+            fetches += 1
+            fetch_seconds += time.monotonic() - begin
+            if data is not None:
+                writer.write(data)
+                written += 1
+                if args.count and written >= args.count:
+                    break
+            # 按固定节奏对齐，抓取耗时超过间隔时不累积欠账
+            next_due = max(next_due + args.interval, time.monotonic())
+            stop.wait(next_due - time.monotonic())
+    except BrokenPipeError:
+        # 下游已关闭（如管道到 head）：丢弃剩余输出，静默退出
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        close()
+    elapsed = time.monotonic() - started
+    if written:
+        log.info("输出 %d 个快照，用时 %.1f 秒（%.1f 个/秒，平均抓取 %.1f ms）",
+                 written, elapsed, written / elapsed, fetch_seconds / fetches * 1000)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+"""
+价格提醒引擎
+用户规则按品种编译为有序阈值索引：每个快照对每个品种只做几次二分查找，
+评估耗时只与快照中的品种数和本次触发的规则数有关，与规则总数无关
+
+规则文件为JSON列表（默认为数据目录下的 alerts.json，可由 MFW_ALERTS 指定）：
+    {"instrument": "gold.dom", "above": 620}                  价格上穿
+    {"instrument": "crypto.BTC", "below": 90000}              价格下穿
+    {"instrument": "crypto.ETH", "rise": 3, "window": 300}    窗口（秒）内涨幅达到3%
+    {"instrument": "silver.intl", "fall": 2}                  窗口内跌幅达到2%（窗口默认5分钟）
+    {"instrument": "premium.gold", "above": 8, "label": "..."}  国内外溢价（元/克）
+规则均为穿越触发：条件由不满足变为满足时触发一次，回落后重新生效
+"""
+import json
+import logging
+import os
+import time
+from bisect import bisect_left, bisect_right
+
+from .config import AppConfig
+from .history import snapshot_instruments
+
+log = logging.getLogger(__name__)
+
+KINDS = ("above", "below", "rise", "fall")
+DEFAULT_WINDOW_S = 300
+
+INSTRUMENT_LABELS = {
+    "gold.intl": "国际黄金",
+    "gold.dom": "国内黄金",
+    "silver.intl": "国际白银",
+    "silver.dom": "国内白银",
+    "fx.usdcny": "美元/人民币",
+    "premium.gold": "黄金溢价",
+    "premium.silver": "白银溢价",
+}
+
+
+def instrument_label(instrument):
+    """品种名的显示名称，如 gold.dom -> 国内黄金、crypto.BTC -> BTC"""
+    label = INSTRUMENT_LABELS.get(instrument)
+    if label:
+        return label
+    return instrument.split(".", 1)[-1]
+
+
+def alert_instruments(data):
+    """
+    提取可用于提醒的品种值：各品种最新价，以及国内外溢价（元/克）
+
+    溢价与 GoldDataFetcher.last_premium_* 的算法一致（国内价 - 国际价 × 汇率 / 盎司克数），
+    由快照字段重新计算，因此客户端模式与独立抓取进程模式下同样可用
+
+    Yields:
+        tuple: (品种名, 值)
+    """
+    yield from snapshot_instruments(data)
+    rate = data.get("exchange_rate") or 0
+    if rate <= 0:
+        return
+    for metal in ("gold", "silver"):
+        section = data.get(metal) or {}
+        intl, dom = section.get("intl") or 0, section.get("dom") or 0
+        if intl > 0 and dom > 0:
+            yield f"premium.{metal}", dom - intl * rate / AppConfig.OZ_TO_GRAM
+
+
+class AlertRule:
+    """单条提醒规则"""
+
+    __slots__ = ("id", "instrument", "kind", "threshold", "window", "label")
+
+    def __init__(self, instrument, kind, threshold, window=None, label=None, rule_id=None):
+        if kind not in KINDS:
+            raise ValueError(f"未知的规则类型: {kind}")
+        self.id = rule_id
+        self.instrument = instrument
+        self.kind = kind
+        self.threshold = float(threshold)  # 价格/溢价，或涨跌幅百分比（取正值）
+        self.window = float(window or DEFAULT_WINDOW_S) if kind in ("rise", "fall") else None
+        self.label = label
+
+    @classmethod
+    def from_dict(cls, entry, rule_id=None):
+        """
+        由规则文件中的一项构造规则
+
+        Raises:
+            ValueError: 缺少品种名或规则类型
+        """
+        instrument = entry.get("instrument")
+        kind = next((k for k in KINDS if k in entry), None)
+        if not instrument or kind is None:
+            raise ValueError(f"无效的提醒规则: {entry}")
+        threshold = float(entry[kind])
+        if kind in ("rise", "fall"):
+            threshold = abs(threshold)
+        return cls(instrument, kind, threshold, entry.get("window"), entry.get("label"), rule_id)
+
+    def message(self, value):
+        """
+        触发时的提示文字
+
+        Args:
+            value: 触发时的值（价格/溢价，或涨跌幅百分比）
+        """
+        if self.label:
+            return f"{self.label}（{value:.2f}）"
+        name = instrument_label(self.instrument)
+        if self.kind == "above":
+            return f"{name} 上穿 {self.threshold:.2f}（当前 {value:.2f}）"
+        if self.kind == "below":
+            return f"{name} 下穿 {self.threshold:.2f}（当前 {value:.2f}）"
+        minutes = self.window / 60
+        span = f"{minutes:g}分钟" if minutes >= 1 else f"{self.window:g}秒"
+        verb = "上涨" if self.kind == "rise" else "下跌"
+        return f"{name} {span}内{verb} {abs(value):.2f}%"
+
+
+class _Ladder:
+    """按阈值排序的规则列表，二分查找被穿越的区间"""
+
+    __slots__ = ("thresholds", "rules")
+
+    def __init__(self, rules):
+        rules = sorted(rules, key=lambda r: r.threshold)
+        self.thresholds = [r.threshold for r in rules]
+        self.rules = rules
+
+    def crossed_up(self, prev, cur):
+        """prev < 阈值 <= cur 的规则"""
+        return self.rules[bisect_right(self.thresholds, prev):bisect_right(self.thresholds, cur)]
+
+    def crossed_down(self, prev, cur):
+        """cur <= 阈值 < prev 的规则"""
+        return self.rules[bisect_left(self.thresholds, cur):bisect_left(self.thresholds, prev)]
+
+
+class _Series:
+    """单个品种最近一段时间的价格（两个列表 + 起始偏移，过期部分惰性压缩）"""
+
+    __slots__ = ("ts", "values", "start", "span")
+
+    def __init__(self, span):
+        self.ts = []
+        self.values = []
+        self.start = 0
+        self.span = span  # 需要保留的最长窗口（秒）
+
+    def append(self, ts, value):
+        self.ts.append(ts)
+        self.values.append(value)
+        # 保留至少一笔早于 ts - span 的价格作为最长窗口的参考价
+        cut = bisect_right(self.ts, ts - self.span, self.start) - 1
+        if cut > self.start:
+            self.start = cut
+            if cut > 1024 and cut * 2 > len(self.ts):
+                del self.ts[:cut], self.values[:cut]
+                self.start = 0
+
+    def value_at(self, ts):
+        """ts 时刻（含）之前最后一笔价格；历史不足时返回None"""
+        i = bisect_right(self.ts, ts, self.start) - 1
+        return self.values[i] if i >= self.start else None
+
+
+class _InstrumentRules:
+    """单个品种的编译结果：价格阈值两条梯子 + 每个窗口的涨跌幅梯子"""
+
+    __slots__ = ("above", "below", "moves", "series", "last", "last_moves")
+
+    def __init__(self, rules):
+        self.above = _Ladder(r for r in rules if r.kind == "above")
+        self.below = _Ladder(r for r in rules if r.kind == "below")
+        windows = {}
+        for r in rules:
+            if r.window is not None:
+                windows.setdefault(r.window, []).append(r)
+        # 窗口秒数 -> (涨幅梯子, 跌幅梯子)
+        self.moves = {
+            w: (_Ladder(r for r in rs if r.kind == "rise"), _Ladder(r for r in rs if r.kind == "fall"))
+            for w, rs in windows.items()
+        }
+        self.series = _Series(max(self.moves)) if self.moves else None
+        self.last = None  # 上一次的值
+        self.last_moves = {}  # 窗口秒数 -> 上一次的涨跌幅
+
+    def evaluate(self, value, ts, fired):
+        """评估一个新值，触发的 (规则, 值) 追加到 fired"""
+        prev = self.last
+        self.last = value
+        if prev is not None:
+            if value > prev:
+                fired.extend((r, value) for r in self.above.crossed_up(prev, value))
+            elif value < prev:
+                fired.extend((r, value) for r in self.below.crossed_down(prev, value))
+        if self.series is None:
+            return
+        self.series.append(ts, value)
+        for window, (rise, fall) in self.moves.items():
+            ref = self.series.value_at(ts - window)
+            if not ref:
+                continue  # 历史尚未覆盖整个窗口
+            move = (value - ref) / ref * 100
+            prev_move = self.last_moves.get(window)
+            self.last_moves[window] = move
+            if prev_move is None:
+                continue
+            if move > prev_move:
+                fired.extend((r, move) for r in rise.crossed_up(prev_move, move))
+            elif move < prev_move:
+                # 跌幅阈值为正数：跌幅 = -move
+                fired.extend((r, move) for r in fall.crossed_up(-prev_move, -move))
+
+
+class AlertEngine:
+    """按快照批量评估全部规则"""
+
+    def __init__(self, rules=()):
+        """
+        初始化引擎并编译规则
+
+        Args:
+            rules: AlertRule 列表
+        """
+        self.rules = []
+        self.index = {}
+        self.evaluations = 0
+        self.fired = 0
+        self.set_rules(rules)
+
+    def set_rules(self, rules):
+        """替换全部规则并重新编译（各品种的历史与穿越状态随之清空）"""
+        self.rules = list(rules)
+        by_instrument = {}
+        for rule in self.rules:
+            by_instrument.setdefault(rule.instrument, []).append(rule)
+        self.index = {name: _InstrumentRules(rs) for name, rs in by_instrument.items()}
+
+    def evaluate(self, data, ts=None):
+        """
+        评估一个快照
+
+        Args:
+            data: fetch_all 返回的数据字典
+            ts: 时间戳（秒），默认取快照的 timestamp 字段或当前时间
+
+        Returns:
+            list: 本次触发的 (规则, 值)，值为价格/溢价或涨跌幅百分比
+        """
+        fired = []
+        if not self.index:
+            return fired
+        ts = ts or data.get("timestamp") or time.time()
+        index = self.index
+        for instrument, value in alert_instruments(data):
+            compiled = index.get(instrument)
+            if compiled is not None:
+                compiled.evaluate(value, ts, fired)
+        self.evaluations += 1
+        self.fired += len(fired)
+        return fired
+
+    def stats(self):
+        """
+        获取引擎统计
+
+        Returns:
+            dict: 规则数、涉及的品种数、评估次数与累计触发次数
+        """
+        return {
+            "rules": len(self.rules),
+            "instruments": len(self.index),
+            "evaluations": self.evaluations,
+            "fired": self.fired,
+        }
+
+
+def load_rules(path=None):
+    """
+    读取提醒规则文件
+
+    Args:
+        path: 文件路径，默认取环境变量 MFW_ALERTS，其次为数据目录下的 alerts.json
+
+    Returns:
+        list: AlertRule 列表；文件不存在或无法解析时为空，单条无效规则被跳过
+    """
+    path = path or os.environ.get("MFW_ALERTS") or os.path.join(AppConfig.get_data_dir(), "alerts.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        log.warning("提醒规则 %s 无法读取: %s", path, e)
+        return []
+    rules = []
+    for i, entry in enumerate(entries if isinstance(entries, list) else ()):
+        try:
+            rules.append(AlertRule.from_dict(entry, rule_id=i))
+        except (AttributeError, TypeError, ValueError) as e:
+            log.warning("跳过提醒规则 #%d: %s", i, e)
+    return rules
@@ -0,0 +1,164 @@
+"""
+asyncio 数据抓取引擎
+在调用线程（FetchWorker 所在线程）中持有一个事件循环，所有数据源请求在同一循环内并发执行，
+按主机共享 aiohttp 连接池；超过单源超时或单次刷新截止时间的请求会被取消，而不是占着线程等待
+
+依赖可选库 aiohttp（pip install aiohttp），未安装时 GoldDataFetcher 回退到线程池引擎
+"""
+import asyncio
+import json
+
+from .config import AppConfig
+from .http_sessions import BYTES_RECEIVED
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncHttpClient:
+    """aiohttp 会话封装：首次请求时在事件循环内创建会话，按主机复用连接"""
+
+    def __init__(self, headers=None, limit_per_host=None):
+        """
+        初始化HTTP客户端
+
+        Args:
+            headers: 默认请求头（单次请求传入的同名头部优先）
+            limit_per_host: 每个主机的连接池上限，默认取 AppConfig.ASYNC_CONNECTIONS_PER_HOST
+        """
+        self.headers = dict(headers or {})
+        self.limit_per_host = limit_per_host or AppConfig.ASYNC_CONNECTIONS_PER_HOST
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        return self._session
+
+    async def get(self, url, params=None, headers=None, timeout=2.0):
+        """
+        发起GET请求
+
+        Returns:
+            bytes: 响应体
+        """
+        async with self._get_session().get(
+            url, params=params, headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            body = await resp.read()
+        BYTES_RECEIVED.inc(len(body), host=resp.url.host or "")
+        return body
+
+    async def get_json(self, url, params=None, headers=None, timeout=2.0):
+        """发起GET请求并解析JSON（不校验Content-Type，新浪/东方财富常返回text/plain）"""
+        return json.loads(await self.get(url, params=params, headers=headers, timeout=timeout))
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class AsyncFetchEngine:
+    """事件循环抓取引擎，与 FetchEngine 保持相同的 run()/close() 约定"""
+
+    is_async = True
+
+    def __init__(self, deadline=None, timeouts=None, headers=None):
+        """
+        初始化抓取引擎
+
+        Args:
+            deadline: 单次刷新的截止时间（秒），默认取 AppConfig.FETCH_DEADLINE_S
+            timeouts: 任务名 -> 单源超时（秒），默认取 AppConfig.FETCH_SOURCE_TIMEOUTS
+            headers: HTTP客户端的默认请求头（各主机的专用请求头由调用方逐请求传入）
+        """
+        self.deadline = deadline if deadline is not None else AppConfig.FETCH_DEADLINE_S
+        self.timeouts = dict(AppConfig.FETCH_SOURCE_TIMEOUTS if timeouts is None else timeouts)
+        self.http = AsyncHttpClient(headers)
+        self._loop = asyncio.new_event_loop()
+        self._closed = False
+        self.durations = {}  # 最近一次 run 中按时完成的任务 -> 执行耗时（秒）
+
+    @staticmethod
+    def available():
+        """是否安装了 aiohttp"""
+        return aiohttp is not None
+
+    @property
+    def closed(self):
+        return self._closed
+
+    async def _call(self, fn):
+        """协程函数直接等待，普通函数放到默认线程池执行（无法取消，只能放弃等待）；返回 (值, 耗时)"""
+        start = self._loop.time()
+        if asyncio.iscoroutinefunction(fn):
+            value = await fn()
+        else:
+            value = await self._loop.run_in_executor(None, fn)
+        return value, self._loop.time() - start
+
+    async def _run(self, tasks, deadline):
+        futures = {}
+        for name, fn in tasks.items():
+            timeout = min(self.timeouts.get(name, deadline), deadline)
+            futures[name] = asyncio.ensure_future(asyncio.wait_for(self._call(fn), timeout))
+        if futures:
+            await asyncio.wait(futures.values(), timeout=deadline)
+
+        results, errors = {}, {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                errors[name] = "timeout"
+                continue
+            if future.cancelled():
+                errors[name] = "cancelled"
+                continue
+            exc = future.exception()
+            if isinstance(exc, asyncio.TimeoutError):
+                errors[name] = "timeout"
+            elif exc is not None:
+                errors[name] = str(exc) or type(exc).__name__
+            else:
+                results[name], self.durations[name] = future.result()
+        # 让被取消的任务完成清理（释放连接），再把控制权交还调用方
+        pending = [f for f in futures.values() if not f.done()]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        return results, errors
+
+    def run(self, tasks, deadline=None):
+        """
+        在事件循环中并发执行一组任务，最多等待到截止时间
+
+        Args:
+            tasks: 任务名 -> 无参协程函数（或普通可调用对象）
+            deadline: 本次截止时间（秒），默认使用引擎配置
+
+        Returns:
+            tuple: (results, errors)，含义与 FetchEngine.run 相同；超时的任务会被取消
+        """
+        self.durations = {}
+        if self._closed:
+            return {}, {name: "engine closed" for name in tasks}
+        timeout = self.deadline if deadline is None else deadline
+        return self._loop.run_until_complete(self._run(tasks, timeout))
+
+    def close(self, wait_for_tasks=False):
+        """关闭HTTP会话与事件循环（须在事件循环空闲时调用，如工作线程退出后）"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._loop.is_running():
+            return
+        try:
+            self._loop.run_until_complete(self.http.close())
+            if hasattr(self._loop, "shutdown_default_executor"):  # Python 3.9+
+                self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        finally:
+            self._loop.close()
@@ -2,8 +2,57 @@
 应用配置模块
 管理应用的全局配置，包括窗口设置、API配置等
 """
+import json
+import logging
 import os
 
+log = logging.getLogger(__name__)
+
+# 默认关注列表：币种名 -> OKX交易对（去掉连字符）
+DEFAULT_WATCHLIST = {
+    "BTC": "BTCUSDT",
+    "ETH": "ETHUSDT",
+    "BNB": "BNBUSDT",
+    "SOL": "SOLUSDT",
+    "HYPE": "HYPEUSDT",
+}
+
+
+def _data_dir():
+    return os.environ.get("MFW_DATA_DIR") or os.path.join(
+        os.path.expanduser("~"), ".market-floating-window"
+    )
+
+
+def load_watchlist(path=None):
+    """
+    读取加密货币关注列表（可容纳数百个币种，抓取为每种产品类型一次批量请求）
+
+    文件为JSON：["BTC", "ETH", ...]（交易对默认为 <币种>USDT），
+    或 {"BTC": "BTCUSDT", ...}（按书写顺序显示）
+
+    Args:
+        path: 文件路径，默认取环境变量 MFW_WATCHLIST，其次为数据目录下的 watchlist.json
+
+    Returns:
+        dict: 币种名 -> 交易对；文件不存在或格式无效时返回默认关注列表
+    """
+    path = path or os.environ.get("MFW_WATCHLIST") or os.path.join(_data_dir(), "watchlist.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return dict(DEFAULT_WATCHLIST)
+    except (OSError, ValueError) as e:
+        log.warning("关注列表 %s 无法读取，使用默认列表: %s", path, e)
+        return dict(DEFAULT_WATCHLIST)
+    if isinstance(entries, list):
+        entries = {str(name).upper(): f"{str(name).upper()}USDT" for name in entries}
+    if not isinstance(entries, dict) or not entries:
+        log.warning("关注列表 %s 格式无效，使用默认列表", path)
+        return dict(DEFAULT_WATCHLIST)
+    return {str(name): str(sym).upper() for name, sym in entries.items()}
+
 
 class AppConfig:
     """应用配置类"""
@@ -12,15 +61,111 @@ class AppConfig:
     WINDOW_WIDTH = 360
     WINDOW_HEIGHT = 700
     DEFAULT_OPACITY = 1.0  # 默认透明度
+    # 渲染方式：web（QtWebEngine 页面）或 native（QPainter 绘制，不启动 Chromium），亦可用 --native 启动参数选择
+    RENDERER = os.environ.get("MFW_RENDERER") or "web"
     
     # 数据更新间隔（毫秒）
     UPDATE_INTERVAL_MS = 1000
     
+    # 抓取引擎配置
+    FETCH_WORKERS = 4  # 常驻线程池大小
+    FETCH_DEADLINE_S = 0.9  # 单次刷新截止时间（秒），须小于更新间隔
+    # 抓取引擎类型：thread（常驻线程池）或 asyncio（单事件循环，需安装 aiohttp，未安装时回退到 thread）
+    FETCH_ENGINE = os.environ.get("MFW_FETCH_ENGINE", "thread")
+    # 各数据源的单独超时（秒），不超过单次刷新截止时间；asyncio 引擎超时后取消该请求
+    FETCH_SOURCE_TIMEOUTS = {"sina": 0.8, "crypto": 0.9, "eastmoney": 0.9}
+    ASYNC_CONNECTIONS_PER_HOST = 8  # asyncio 引擎每个主机的连接池上限
+    HTTP_POOL_SIZE = FETCH_WORKERS  # 线程池引擎每个主机的连接池大小，与抓取线程数一致
+    HTTP_PREWARM = True  # 启动时后台预先建立各主机连接
+    
+    # 数据源熔断：连续失败达到阈值后在冷却期内跳过请求，继续展示最后有效值并标记为过期
+    BREAKER_FAILURE_THRESHOLD = 3
+    BREAKER_COOLDOWN_S = 10.0  # 首次熔断冷却时间，半开探测失败后加倍
+    BREAKER_MAX_COOLDOWN_S = 120.0
+    # 自适应请求超时：近期延迟分位数 × 系数，限制在 [最小, 最大] 秒之间
+    # 最大值须小于单次刷新截止时间，否则超时不会先于截止时间生效，失效的数据源仍会占用抓取线程
+    LATENCY_WINDOW = 50  # 保留的延迟样本数
+    LATENCY_MIN_SAMPLES = 5  # 样本不足时使用最大超时
+    ADAPTIVE_TIMEOUT_PERCENTILE = 0.95
+    ADAPTIVE_TIMEOUT_FACTOR = 3.0
+    ADAPTIVE_TIMEOUT_MIN_S = 0.3
+    ADAPTIVE_TIMEOUT_MAX_S = FETCH_DEADLINE_S - 0.1  # 样本不足时亦使用该值
+    
+    # 分源刷新节奏（秒）：数据源 -> (基础间隔, 最大间隔, 有效期TTL)
+    # 值未变化时按退避系数拉长间隔直至最大间隔；国内休市时上金所直接使用最大间隔
+    # 加密货币按显示精度比较，交易活跃时几乎每秒变化而保持基础间隔，此时上游请求约为统一1秒轮询的 58%；
+    # 启用 OKX 行情流（MFW_CRYPTO_STREAM=1）后行情流在线期间不再发起加密货币 REST 请求
+    SOURCE_SCHEDULE = {
+        "crypto": (1.0, 4.0, 10.0),  # 加密货币：快
+        "intl_metals": (2.0, 8.0, 30.0),  # 新浪国际金银：中
+        "sge": (3.0, 60.0, 180.0),  # 新浪上金所现货：中，休市时拉长
+        "fx": (30.0, 300.0, 900.0),  # 美元人民币汇率：慢
+        "eastmoney": (30.0, 120.0, 300.0),  # 东方财富：仅新浪缺失国内报价时请求
+    }
+    SCHEDULE_BACKOFF = 2.0  # 值未变化时的间隔放大系数
+    SCHEDULE_SLACK_S = 0.1  # 到期判断容差，吸收定时器抖动
+    # 停用的数据源（逗号分隔的数据源名，如 MFW_DISABLED_SOURCES=eastmoney,fx），停用后不请求、不参与合并
+    DISABLED_SOURCES = [name.strip() for name in os.environ.get("MFW_DISABLED_SOURCES", "").split(",") if name.strip()]
+    
+    # 内存行情历史（每个品种固定容量，内存占用不随运行时长增长）
+    HISTORY_TICK_CAPACITY = 900  # 逐笔保留数量（1秒节奏约15分钟）
+    HISTORY_BARS = {60: 240, 300: 288, 3600: 168}  # K线周期（秒） -> 保留数量：4小时/1天/7天
+    SPARKLINE_POINTS = 60  # 走势线点数
+    SPARKLINE_INTERVAL_MS = 5000  # 走势线推送间隔
+    
+    # 本地行情存储（SQLite，WAL模式，后台批量写入）
+    TICK_STORE_ENABLED = True
+    TICK_STORE_BATCH_SIZE = 500  # 累积行数达到后批量写入
+    TICK_STORE_FLUSH_INTERVAL_S = 2.0  # 最长写入间隔（秒）
+    TICK_STORE_QUEUE_MAX = 10000  # 待写入快照上限，超出后丢弃（不阻塞抓取）
+    TICK_STORE_COMPACT_INTERVAL_S = 3600  # 压缩周期（秒）
+    TICK_RETENTION_S = 2 * 86400  # 逐笔保留时长，过期后聚合为1分钟K线
+    BAR_RETENTION_S = 365 * 86400  # K线保留时长
+    TICK_STORE_PRELOAD_HOURS = 1  # 启动时加载到内存历史的时长
+    
+    # 最近快照缓存（首屏秒开 + 溢价持久化）
+    SNAPSHOT_CACHE_MIN_INTERVAL_S = 5.0  # 两次写盘的最小间隔，关闭窗口时总会写入
+    
+    # 诊断：本地指标端点端口（0 为关闭，也可发送 SIGUSR1 将指标写入数据目录）与日志限流周期
+    METRICS_PORT = int(os.environ.get("MFW_METRICS_PORT") or 0)
+    LOG_RATE_LIMIT_S = 60.0  # 同一条日志在该周期内只输出一次
+    
+    # 本地行情中枢（python -m src.hub）：只运行一个抓取循环，经 127.0.0.1 的 HTTP/SSE 向多个窗口/脚本推送快照
+    HUB_PORT = int(os.environ.get("MFW_HUB_PORT") or 8760)
+    # 设置后窗口作为中枢客户端订阅快照，不再自行抓取（如 http://127.0.0.1:8760）
+    HUB_URL = os.environ.get("MFW_HUB_URL") or ""
+    HUB_KEEPALIVE_S = 15.0  # 无新快照时的SSE心跳间隔
+    HUB_RECONNECT_INITIAL_S = 0.5  # 客户端断线重连初始等待
+    HUB_RECONNECT_MAX_S = 10.0  # 客户端断线重连最长等待
+    
+    # 独立抓取进程（MFW_FETCH_PROCESS=1）：抓取与解析在子进程中进行，快照经共享内存交给窗口，子进程退出后自动重启
+    FETCH_PROCESS = os.environ.get("MFW_FETCH_PROCESS") == "1"
+    SHM_SNAPSHOT_BYTES = 256 * 1024  # 共享内存快照区容量（JSON字节），超出的快照丢弃并记录日志
+    SHM_POLL_INTERVAL_MS = 50  # 窗口读取线程检查新快照的间隔（只读取序号，无新快照时不解析）
+    FETCH_PROCESS_RESTART_INITIAL_S = 1.0  # 子进程退出后的重启等待，连续退出时加倍
+    FETCH_PROCESS_RESTART_MAX_S = 30.0
+    
+    # 后台（窗口隐藏或最小化）：停止渲染与页面轮询，按较低频率抓取并只更新托盘提示；恢复显示时立即补绘最新快照
+    BACKGROUND_UPDATE_INTERVAL_MS = 15000
+    
+    # 价格提醒（规则见 alerts.json / MFW_ALERTS），前台与后台均评估，经托盘通知显示
+    ALERT_MESSAGE_MS = 10000  # 托盘通知显示时长
+    ALERT_MESSAGE_MAX_LINES = 5  # 同一快照触发多条时，通知中最多列出的条数
+    
+    # 冷启动预算（毫秒），--profile-startup 超出时以非零状态退出
+    STARTUP_BUDGET_MS = 3000
+    
     # 线程轮询间隔（毫秒）
     PIN_POLL_INTERVAL_MS = 100  # 置顶状态轮询
     DRAG_POLL_INTERVAL_MS = 16  # 拖动状态轮询（约60fps）
     MENU_POLL_INTERVAL_MS = 100  # 右键菜单轮询
     
+    # 页面事件推送（QWebChannel）；设置 MFW_LEGACY_POLLING=1 回退到上述定时轮询（用于对比测量）
+    USE_WEB_CHANNEL = os.environ.get("MFW_LEGACY_POLLING") != "1"
+    # IPC测量模式（MFW_MEASURE_IPC=1）：定期输出 runJavaScript/桥接调用速率与本进程CPU占用
+    MEASURE_IPC = os.environ.get("MFW_MEASURE_IPC") == "1"
+    MEASURE_REPORT_INTERVAL_MS = 5000
+    
     # UI资源路径（相对于项目根目录）
     @staticmethod
     def get_ui_path():
@@ -29,6 +174,21 @@ class AppConfig:
         root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         return os.path.join(root_dir, "resources", "ui")
     
+    @staticmethod
+    def get_data_dir():
+        """获取用户数据目录（可通过环境变量 MFW_DATA_DIR 覆盖）"""
+        return _data_dir()
+    
+    @staticmethod
+    def get_tick_db_path():
+        """获取本地行情数据库路径"""
+        return os.path.join(AppConfig.get_data_dir(), "ticks.sqlite3")
+    
+    @staticmethod
+    def get_snapshot_cache_path():
+        """获取最近快照缓存文件路径"""
+        return os.path.join(AppConfig.get_data_dir(), "last_snapshot.json")
+    
     @staticmethod
     def get_icon_path():
         """获取应用图标路径"""
@@ -41,20 +201,25 @@ class AppConfig:
         ui_path = AppConfig.get_ui_path()
         return os.path.join(ui_path, "index.html")
     
-    # 加密货币配置
-    CRYPTO_SYMBOLS = {
-        "BTC": "BTCUSDT",
-        "ETH": "ETHUSDT", 
-        "BNB": "BNBUSDT",
-        "SOL": "SOLUSDT",
-        "HYPE": "HYPEUSDT"
-    }
+    # 加密货币关注列表（见 load_watchlist）：币种名 -> 交易对，字典顺序即显示顺序
+    CRYPTO_SYMBOLS = load_watchlist()
     
-    # 加密货币显示顺序
-    CRYPTO_ORDER = ['BTC', 'ETH', 'BNB', 'SOL', 'HYPE']
+    # 加密货币显示顺序（页面与右键菜单均由此生成）
+    CRYPTO_ORDER = list(CRYPTO_SYMBOLS)
+    CRYPTO_MENU_PAGE_SIZE = 25  # 右键菜单中每个子菜单最多列出的币种数
     
     # 数据源配置
     SINA_URL = "https://hq.sinajs.cn/list=hf_XAU,hf_SI,fx_susdcny"
+    SINA_LIST_URL = "https://hq.sinajs.cn/list="
+    OKX_API_URL = "https://www.okx.com"
+    EASTMONEY_API_URL = "https://push2.eastmoney.com/api/qt/stock/get"
+    
+    # OKX WebSocket 实时行情（可选，需安装 websocket-client；设置 MFW_CRYPTO_STREAM=1 启用）
+    CRYPTO_STREAM_ENABLED = os.environ.get("MFW_CRYPTO_STREAM") == "1"
+    OKX_WS_URL = os.environ.get("MFW_OKX_WS_URL") or "wss://ws.okx.com:8443/ws/v5/public"
+    STREAM_STALE_S = 5.0  # 超过该时长未推送的币种视为过期，改用REST获取
+    STREAM_BACKOFF_INITIAL_S = 1.0  # 断线重连初始等待
+    STREAM_BACKOFF_MAX_S = 60.0  # 断线重连最长等待
     
     # 初始溢价值（用于休市期间推演）
     INITIAL_PREMIUM_GOLD = 9.5
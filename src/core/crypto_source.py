@@ -0,0 +1,145 @@
+"""
+加密货币批量行情源
+通过OKX批量行情接口（现货/永续合约）一次性获取所有关注币种的报价
+"""
+import asyncio
+import logging
+
+from .config import AppConfig
+
+log = logging.getLogger(__name__)
+
+
+class OkxBatchCryptoSource:
+    """OKX批量行情源：每次刷新最多发起两次请求（现货+合约），结果按币种分发"""
+
+    # 按优先级排列的产品类型：现货优先，合约兜底（如 HYPE 等仅上线合约的币种）
+    INST_TYPES = ("SPOT", "SWAP")
+
+    def __init__(self, session, symbols, base_url=None, timeout=2.0):
+        """
+        初始化批量行情源
+
+        Args:
+            session: requests.Session实例，复用连接池
+            symbols: 币种映射，如 {"BTC": "BTCUSDT"}
+            base_url: OKX REST接口根地址，默认取 AppConfig.OKX_API_URL
+            timeout: 单次请求超时（秒）
+        """
+        self.session = session
+        self.symbols = dict(symbols)
+        self.base_url = (base_url or AppConfig.OKX_API_URL).rstrip("/")
+        self.timeout = timeout
+        # 已解析成功的币种 -> 产品类型（SPOT/SWAP），解析后不再探测其他类型
+        self.resolved = {}
+
+    @staticmethod
+    def inst_id(sym, inst_type):
+        """将 BTCUSDT 转换为 OKX 的 instId（BTC-USDT / BTC-USDT-SWAP）"""
+        inst = sym.replace("USDT", "-USDT")
+        return inst + "-SWAP" if inst_type == "SWAP" else inst
+
+    @staticmethod
+    def _to_float(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    @classmethod
+    def parse_ticker(cls, ticker):
+        """将单条OKX行情转换为 {"price", "change"} 字典"""
+        last = cls._to_float(ticker.get("last"))
+        open24 = cls._to_float(ticker.get("open24h"))
+        change = (last - open24) / open24 * 100 if open24 > 0 else 0.0
+        return {"price": last, "change": change}
+
+    def _fetch_tickers(self, inst_type):
+        """
+        获取某一产品类型的全部行情
+
+        Returns:
+            dict: instId -> ticker 原始字典；失败时返回空字典
+        """
+        try:
+            resp = self.session.get(
+                f"{self.base_url}/api/v5/market/tickers",
+                params={"instType": inst_type},
+                timeout=self.timeout,
+            ).json()
+        except Exception as e:
+            log.warning("OKX 批量行情 %s 获取失败: %s", inst_type, e)
+            return {}
+        if not isinstance(resp, dict) or resp.get("code") != "0":
+            return {}
+        return {t.get("instId"): t for t in resp.get("data") or ()}
+
+    def _types_to_fetch(self):
+        """本次需要请求的产品类型：已解析币种所用类型 + 未解析币种需要探测的类型"""
+        needed = set(self.resolved.values())
+        if len(self.resolved) < len(self.symbols):
+            # 仍有未解析的币种：按优先级依次探测
+            needed.update(self.INST_TYPES)
+        return [t for t in self.INST_TYPES if t in needed]
+
+    async def _fetch_tickers_async(self, http, inst_type):
+        """_fetch_tickers 的协程版本，http 为 AsyncHttpClient"""
+        try:
+            resp = await http.get_json(
+                f"{self.base_url}/api/v5/market/tickers",
+                params={"instType": inst_type},
+                headers=dict(self.session.headers),
+                timeout=self.timeout,
+            )
+        except Exception as e:
+            log.warning("OKX 批量行情 %s 获取失败: %s", inst_type, e)
+            return {}
+        if not isinstance(resp, dict) or resp.get("code") != "0":
+            return {}
+        return {t.get("instId"): t for t in resp.get("data") or ()}
+
+    def _collect(self, inst_types, get_tickers):
+        """
+        按优先级将各产品类型的行情分发到币种
+
+        Args:
+            inst_types: 本次请求的产品类型（_types_to_fetch 的结果）
+            get_tickers: inst_type -> instId到行情的字典，仅在该类型有待匹配币种时调用
+        """
+        result = {}
+        # 前一优先级的请求失败时，不对未解析币种探测后备类型，避免把现货误判为合约
+        can_probe = True
+        for inst_type in inst_types:
+            pending = [
+                name for name in self.symbols
+                if name not in result and (
+                    self.resolved.get(name) == inst_type
+                    or (name not in self.resolved and can_probe)
+                )
+            ]
+            if not pending:
+                continue
+            tickers = get_tickers(inst_type)
+            can_probe = can_probe and bool(tickers)
+            for name in pending:
+                ticker = tickers.get(self.inst_id(self.symbols[name], inst_type))
+                if ticker is None:
+                    continue
+                result[name] = self.parse_ticker(ticker)
+                self.resolved.setdefault(name, inst_type)
+        return result
+
+    def fetch_all(self):
+        """
+        获取全部关注币种的行情
+
+        Returns:
+            dict: 币种名 -> {"price": float, "change": float}，获取失败的币种不包含在内
+        """
+        return self._collect(self._types_to_fetch(), self._fetch_tickers)
+
+    async def fetch_all_async(self, http):
+        """fetch_all 的协程版本：各产品类型的请求并发发出，再按优先级分发"""
+        inst_types = self._types_to_fetch()
+        fetched = await asyncio.gather(*(self._fetch_tickers_async(http, t) for t in inst_types))
+        return self._collect(inst_types, dict(zip(inst_types, fetched)).get)
@@ -0,0 +1,168 @@
+"""
+加密货币实时行情流
+通过一个OKX WebSocket连接订阅全部关注币种的 tickers 频道，最新值保存在快照字典中供抓取时即时读取；
+断线后指数退避重连，行情流不可用时由调用方回退到REST批量接口
+
+依赖可选库 websocket-client（pip install websocket-client），未安装时行情流不可用
+"""
+import json
+import logging
+import random
+import threading
+import time
+
+from .config import AppConfig
+from .crypto_source import OkxBatchCryptoSource
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+log = logging.getLogger(__name__)
+
+
+class OkxTickerStream:
+    """OKX tickers 频道订阅：单写者（连接线程）原地更新快照，读者复制后使用，无需加锁"""
+
+    def __init__(self, symbols, url=None, resolved=None):
+        """
+        初始化行情流
+
+        Args:
+            symbols: 币种映射，如 {"BTC": "BTCUSDT"}
+            url: WebSocket地址，默认取 AppConfig.OKX_WS_URL（测试时指向本地回放服务）
+            resolved: 已知的币种 -> 产品类型（SPOT/SWAP），通常来自 OkxBatchCryptoSource.resolved；
+                      未知类型的币种同时订阅现货与合约，现货优先
+        """
+        self.symbols = dict(symbols)
+        self.url = url or AppConfig.OKX_WS_URL
+        self.resolved = resolved if resolved is not None else {}
+        self._latest = {}  # 币种名 -> {"price", "change"}（存入后不再修改）
+        self._updated_at = {}  # 币种名 -> 最近更新时间（monotonic）
+        self._spot_seen = set()  # 已收到现货行情的币种，忽略其合约行情
+        self._stop = threading.Event()
+        self._thread = None
+        self._ws = None
+        self.connected = False
+        self.messages = 0  # 已处理的行情消息数
+        self.reconnects = 0
+
+    @staticmethod
+    def available():
+        """是否安装了 websocket-client"""
+        return websocket is not None
+
+    def _subscriptions(self):
+        """构造订阅参数：instId -> (币种名, 产品类型)"""
+        subs = {}
+        for name, sym in self.symbols.items():
+            inst_type = self.resolved.get(name)
+            for t in ([inst_type] if inst_type else OkxBatchCryptoSource.INST_TYPES):
+                subs[OkxBatchCryptoSource.inst_id(sym, t)] = (name, t)
+        return subs
+
+    def start(self):
+        """启动后台连接线程（未安装依赖时不启动）"""
+        if not self.available() or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="okx-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """断开连接并停止重连"""
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _run(self):
+        backoff = AppConfig.STREAM_BACKOFF_INITIAL_S
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self._connect_once()
+            if self._stop.is_set():
+                break
+            self.reconnects += 1
+            if time.monotonic() - started > AppConfig.STREAM_BACKOFF_MAX_S:
+                backoff = AppConfig.STREAM_BACKOFF_INITIAL_S  # 连接曾稳定运行，重置退避
+            # 指数退避 + 抖动，避免多个客户端同时重连
+            self._stop.wait(backoff * random.uniform(0.8, 1.2))
+            backoff = min(backoff * 2, AppConfig.STREAM_BACKOFF_MAX_S)
+
+    def _connect_once(self):
+        subs = self._subscriptions()
+
+        def on_open(ws):
+            self.connected = True
+            ws.send(json.dumps({
+                "op": "subscribe",
+                "args": [{"channel": "tickers", "instId": inst} for inst in subs],
+            }))
+
+        def on_message(ws, message):
+            self._handle_message(message, subs)
+
+        def on_close(ws, *args):
+            self.connected = False
+
+        self._ws = websocket.WebSocketApp(
+            self.url, on_open=on_open, on_message=on_message, on_close=on_close
+        )
+        try:
+            self._ws.run_forever(ping_interval=20, ping_timeout=10)
+        except Exception as e:
+            log.warning("OKX 行情流异常: %s", e)
+        finally:
+            self.connected = False
+            self._ws = None
+
+    def _handle_message(self, message, subs):
+        if message == "pong":
+            return
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return
+        arg = msg.get("arg") or {}
+        if arg.get("channel") != "tickers" or not msg.get("data"):
+            return
+        target = subs.get(arg.get("instId"))
+        if target is None:
+            return
+        name, inst_type = target
+        if inst_type == "SPOT":
+            self._spot_seen.add(name)
+        elif name in self._spot_seen:
+            return  # 现货优先
+        self._latest[name] = OkxBatchCryptoSource.parse_ticker(msg["data"][-1])
+        self._updated_at[name] = time.monotonic()
+        self.messages += 1
+
+    def latest(self, max_age=None):
+        """
+        读取最新行情快照
+
+        Args:
+            max_age: 只返回在该秒数内更新过的币种，默认取 AppConfig.STREAM_STALE_S
+
+        Returns:
+            dict: 币种名 -> {"price", "change"}
+        """
+        max_age = AppConfig.STREAM_STALE_S if max_age is None else max_age
+        now = time.monotonic()
+        latest, updated = dict(self._latest), dict(self._updated_at)
+        return {
+            name: info for name, info in latest.items()
+            if now - updated.get(name, 0.0) <= max_age
+        }
+
+    def is_live(self):
+        """连接正常且收到过行情"""
+        return self.connected and bool(self._latest)
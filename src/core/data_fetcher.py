@@ -1,29 +1,111 @@
-import requests
-import re
+import asyncio
+import logging
 import json
-from concurrent.futures import ThreadPoolExecutor
+import time
+from functools import partial
+
+from .config import AppConfig
+from .crypto_source import OkxBatchCryptoSource
+from .crypto_stream import OkxTickerStream
+from .fetch_engine import FetchEngine
+from .health import HealthTracker
+from .http_sessions import SessionRegistry
+from .metrics import REGISTRY
+from .scheduler import SourceScheduler
+from .sina_parser import SinaQuote, parse_quotes
+
+log = logging.getLogger(__name__)
+
+SOURCE_LATENCY = REGISTRY.histogram(
+    "mfw_source_request_seconds", "Per-source fetch task latency", ("source",)
+)
+SOURCE_ERRORS = REGISTRY.counter(
+    "mfw_source_errors_total", "Per-source fetch failures by reason", ("source", "reason")
+)
 
 class GoldDataFetcher:
+    # 新浪财经行情代码：
+    # hf_XAU - 国际黄金现货, hf_SI - 国际白银现货
+    # fx_susdcny - 美元人民币汇率
+    # SGE_AUTD, SGE_AGTD - 上金所黄金/白银延期（国内现货）
+    # 抓取时由各新浪数据源插件（sources.py）声明的代码合并而成，此处为全部代码
+    SINA_SYMBOLS = ["hf_XAU", "hf_SI", "fx_susdcny", "SGE_AUTD", "SGE_AGTD"]
+
+    # 东方财富上金所代码（新浪缺失国内报价时的补充来源）
+    EASTMONEY_SGE_SECIDS = {"gold": "118.AUTD", "silver": "118.AGTD"}
+
+    # 各主机的请求头：新浪需要 Referer；东方财富使用独立请求头，避免新浪的 Referer 导致反爬
+    SINA_HEADERS = {
+        "Referer": "https://finance.sina.com.cn/",
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    OKX_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    EASTMONEY_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Referer": "https://quote.eastmoney.com/",
+    }
+
     def __init__(self):
-        # 建立持久化会话连接池
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Referer": "https://finance.sina.com.cn/",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        })
-        # 使用新浪财经接口：
-        # hf_XAU - 国际黄金现货, hf_SI - 国际白银现货
-        # fx_susdcny - 美元人民币汇率
-        # SGE_AUTD, SGE_AGTD 已移除，改用东方财富接口
-        self.sina_url = "https://hq.sinajs.cn/list=hf_XAU,hf_SI,fx_susdcny"
+        # 使用新浪财经接口，代码列表见 SINA_SYMBOLS
+        self.sina_base_url = AppConfig.SINA_LIST_URL
+        self.eastmoney_url = AppConfig.EASTMONEY_API_URL
+
+        # 每个主机一个持久化会话（独立请求头与连接池），启动时后台预先建立连接
+        self.sessions = SessionRegistry()
+        self.session = self.sessions.register("sina", self.sina_base_url, self.SINA_HEADERS)
+        self.sessions.register("okx", AppConfig.OKX_API_URL, self.OKX_HEADERS)
+        self.sessions.register("eastmoney", self.eastmoney_url, self.EASTMONEY_HEADERS)
+        if AppConfig.HTTP_PREWARM:
+            self.sessions.prewarm()
+        # 各数据源的熔断状态与延迟统计，请求超时按近期延迟自适应
+        self.health = HealthTracker()
 
         # 记录国内外溢价（Premium），用于在休市期间进行"无缝推演"
-        self.last_premium_gold = 9.5  # 初始经验值
-        self.last_premium_silver = 0.15 # 初始经验值（白银国内相比国际通常有固定溢价）
+        # 初始经验值；启动后由快照缓存恢复上次记录的溢价
+        self.last_premium_gold = AppConfig.INITIAL_PREMIUM_GOLD
+        self.last_premium_silver = AppConfig.INITIAL_PREMIUM_SILVER  # 白银国内相比国际通常有固定溢价
+
+        # 加密货币：OKX批量行情接口，每次刷新最多两次请求（现货+合约）
+        self.crypto_source = OkxBatchCryptoSource(self.sessions.get("okx"), AppConfig.CRYPTO_SYMBOLS)
+        # 可选：OKX WebSocket 实时行情流，可用时优先读取，断线时自动回退到上面的REST批量接口
+        self.crypto_stream = None
+        if AppConfig.CRYPTO_STREAM_ENABLED and OkxTickerStream.available():
+            self.crypto_stream = OkxTickerStream(
+                AppConfig.CRYPTO_SYMBOLS, resolved=self.crypto_source.resolved
+            )
+            self.crypto_stream.start()
 
-        # API 配置：币安优先，OKX备用
-        self.crypto_apis = ['binance', 'okx']
-        self.current_api_index = 0  # 当前使用的API索引
+        # 常驻抓取引擎：固定线程池或单事件循环 + 单次刷新截止时间，避免每秒创建/销毁线程池
+        self.engine = self._create_engine()
+        # fetch_all 使用的数据源注册表（首次调用时创建；按节奏刷新时由调用方另建 SourceScheduler）
+        self._registry = None
+
+    def _create_engine(self):
+        """按 AppConfig.FETCH_ENGINE 创建抓取引擎，asyncio 引擎依赖缺失时回退到线程池"""
+        if AppConfig.FETCH_ENGINE == "asyncio":
+            # 仅在选用时导入（aiohttp 导入较慢，线程池引擎与命令行入口不需要）
+            from .async_engine import AsyncFetchEngine
+            if AsyncFetchEngine.available():
+                return AsyncFetchEngine()
+            log.info("未安装 aiohttp，使用线程池抓取引擎")
+        return FetchEngine()
+
+    def task(self, method, *args):
+        """
+        构造当前引擎可执行的抓取任务
+
+        Args:
+            method: 抓取方法名，如 "fetch_sina"；asyncio 引擎下使用同名的 *_async 协程版本
+            args: 传给抓取方法的参数
+
+        Returns:
+            callable: 无参任务，交给 self.engine.run 执行
+        """
+        if self.engine.is_async:
+            return partial(getattr(self, method + "_async"), *args)
+        return partial(getattr(self, method), *args)
 
     def _safe_float(self, value, default=0.0):
         if not value: return default
@@ -35,223 +117,294 @@ class GoldDataFetcher:
     def _fetch_eastmoney_spot(self, secid):
         """从东方财富获取国内现货数据"""
         try:
-            url = "https://push2.eastmoney.com/api/qt/stock/get"
-            params = {
-                "secid": secid,
-                "fields": "f43,f60,f57,f58"  # f43:最新价, f60:昨收, f57:代码, f58:名称
-            }
-            # 使用独立请求头，避免新浪的 Referer 导致反爬
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Referer": "https://quote.eastmoney.com/",
-                "Host": "push2.eastmoney.com"
-            }
-            # 不使用 self.session 及其默认头部，而是直接使用 requests.get 或创建新 session
-            # 为简单起见，这里直接用 requests.get (非持久化连接对于低频请求可接受，或清除 header)
-            resp = requests.get(url, params=params, headers=headers, timeout=2.0).json()
-            
-            if resp and resp.get("data"):
-                data = resp["data"]
-                return {
-                    "price": self._safe_float(data.get("f43")),
-                    "prev_close": self._safe_float(data.get("f60"))
-                }
+            resp = self.sessions.get("eastmoney").get(
+                self.eastmoney_url, params=self._eastmoney_params(secid),
+                timeout=self.health.timeout("eastmoney"),
+            ).json()
+            return self._parse_eastmoney(resp)
         except Exception as e:
-            print(f"东方财富 API 获取 {secid} 失败: {e}")
+            log.warning("东方财富 API 获取 %s 失败: %s", secid, e)
         return None
 
+    async def _fetch_eastmoney_spot_async(self, secid):
+        """_fetch_eastmoney_spot 的协程版本（asyncio 引擎）"""
+        try:
+            resp = await self.engine.http.get_json(
+                self.eastmoney_url, params=self._eastmoney_params(secid),
+                headers=self.sessions.headers("eastmoney"), timeout=self.health.timeout("eastmoney"),
+            )
+            return self._parse_eastmoney(resp)
+        except Exception as e:
+            log.warning("东方财富 API 获取 %s 失败: %s", secid, e)
+        return None
+
+    @staticmethod
+    def _eastmoney_params(secid):
+        return {
+            "secid": secid,
+            "fields": "f43,f60,f57,f58",  # f43:最新价, f60:昨收, f57:代码, f58:名称
+            "fltt": "2"  # 返回带小数的价格，而非按精度放大的整数
+        }
+
+    def _parse_eastmoney(self, resp):
+        if resp and resp.get("data"):
+            data = resp["data"]
+            return {
+                "price": self._safe_float(data.get("f43")),
+                "prev_close": self._safe_float(data.get("f60"))
+            }
+        return None
+
+    def close(self):
+        """释放抓取引擎与网络连接（窗口关闭时调用）"""
+        if self.crypto_stream is not None:
+            self.crypto_stream.stop()
+        self.engine.close()
+        self.sessions.close()
+
+    def record_outcomes(self, names, results, errors):
+        """
+        记录一轮抓取中各任务的结果：更新熔断/延迟统计与指标
+
+        Args:
+            names: 本轮执行的任务名
+            results: engine.run 返回的结果
+            errors: engine.run 返回的错误
+        """
+        for name in names:
+            ok = bool(results.get(name))
+            reason = None if ok else errors.get(name, "empty")
+            duration = self.engine.durations.get(name)
+            if reason not in ("busy", "cancelled"):
+                # busy 表示上一次请求仍在执行、本轮未发出新请求，cancelled 表示请求被放弃，均不计入熔断
+                self.health.record(name, ok, duration)
+            if duration is not None:
+                SOURCE_LATENCY.observe(duration, source=name)
+            if not ok:
+                if reason not in ("timeout", "busy", "empty", "cancelled"):
+                    reason = "error"
+                SOURCE_ERRORS.inc(source=name, reason=reason)
+
+    def connection_stats(self):
+        """
+        各主机的连接复用统计
+
+        Returns:
+            dict: 会话名 -> {"requests", "connections", "reuse"}，connections 即TCP+TLS握手次数
+        """
+        return self.sessions.stats()
+
+    def fetch_sina(self, symbols):
+        """
+        批量获取新浪行情并解析为逐代码记录
 
+        Args:
+            symbols: 新浪行情代码列表，如 ["hf_XAU", "fx_susdcny"]
 
-    def _fetch_crypto_from_okx(self, name, sym):
-        """从OKX获取单个加密货币现货数据"""
+        Returns:
+            dict: 代码 -> SinaQuote；请求失败时返回空字典，缺失的代码不包含在内
+        """
+        # 注意：确保 headers 中 Referer 正确 (已在 __init__ 中设置)
+        url = self.sina_base_url + ",".join(symbols)
         try:
-            # OKX 使用不同的交易对格式，如 BTC-USDT
-            okx_sym = sym.replace('USDT', '-USDT')
-            url = f"https://www.okx.com/api/v5/market/ticker?instId={okx_sym}"
-            resp = self.session.get(url, timeout=2.0).json()
-            if isinstance(resp, dict) and resp.get('code') == '0' and resp.get('data'):
-                ticker = resp['data'][0]
-                last = self._safe_float(ticker.get('last'))
-                open24 = self._safe_float(ticker.get('open24h'))
-                
-                change = 0.0
-                if open24 > 0:
-                    change = (last - open24) / open24 * 100
-
-                return name, {
-                    "price": last,
-                    "change": change
-                }
-        except Exception as e:
-            print(f"OKX API 获取 {name} 失败: {e}")
-        return name, None
+            resp = self.session.get(url, timeout=self.health.timeout("sina"))
+        except Exception:
+            return {}
+        return parse_quotes(resp.content, symbols)
 
-    def _fetch_contract_from_okx(self, name, sym):
-        """从OKX获取合约数据（用于只有合约无现货的币种）"""
+    async def fetch_sina_async(self, symbols):
+        """fetch_sina 的协程版本（asyncio 引擎）"""
+        url = self.sina_base_url + ",".join(symbols)
         try:
-            # OKX 合约使用不同的交易对格式，如 BTC-USDT-SWAP
-            okx_sym = sym.replace('USDT', '-USDT-SWAP')
-            url = f"https://www.okx.com/api/v5/market/ticker?instId={okx_sym}"
-            resp = self.session.get(url, timeout=2.0).json()
-            if isinstance(resp, dict) and resp.get('code') == '0' and resp.get('data'):
-                ticker = resp['data'][0]
-                last = self._safe_float(ticker.get('last'))
-                open24 = self._safe_float(ticker.get('open24h'))
-                
-                change = 0.0
-                if open24 > 0:
-                    change = (last - open24) / open24 * 100
-
-                return name, {
-                    "price": last,
-                    "change": change
-                }
-        except Exception as e:
-            print(f"OKX 合约 API 获取 {name} 失败: {e}")
-        return name, None
-
-    def _fetch_single_crypto(self, name, sym):
-        """获取单个加密货币数据，仅使用OKX"""
-        
-        # 1. 尝试 OKX 现货
-        result = self._fetch_crypto_from_okx(name, sym)
-        if result[1] is not None:
-            return result
-            
-        # 2. 现货失败，尝试 OKX 合约 (主要针对 HYPE 等可能只在合约上线的币种)
-        print(f"OKX 现货获取 {name} 失败，尝试 OKX 合约...")
-        result = self._fetch_contract_from_okx(name, sym)
-        if result[1] is not None:
+            content = await self.engine.http.get(
+                url, headers=self.sessions.headers("sina"), timeout=self.health.timeout("sina")
+            )
+        except Exception:
+            return {}
+        return parse_quotes(content, symbols)
+
+    def fetch_crypto(self):
+        """获取全部关注币种行情：行情流在线时直接读取快照，缺失的币种或断线时使用OKX批量接口"""
+        self.crypto_source.timeout = self.health.timeout("crypto")
+        stream = self.crypto_stream
+        if stream is not None and stream.is_live():
+            streamed = stream.latest()
+            if len(streamed) == len(self.crypto_source.symbols):
+                return streamed
+            result = self.crypto_source.fetch_all()
+            result.update(streamed)
             return result
-            
-        # 3. 都失败
-        print(f"OKX 所有渠道获取 {name} 失败")
-        return name, None
+        return self.crypto_source.fetch_all()
 
-    def fetch_all(self):
-        """全时段无缝跳动引擎：国内休市期间自动对标国际盘面推演价格"""
-        data = {
+    async def fetch_crypto_async(self):
+        """fetch_crypto 的协程版本（asyncio 引擎），现货与合约请求并发发出"""
+        self.crypto_source.timeout = self.health.timeout("crypto")
+        stream = self.crypto_stream
+        streamed = stream.latest() if stream is not None and stream.is_live() else {}
+        if streamed and len(streamed) == len(self.crypto_source.symbols):
+            return streamed
+        result = await self.crypto_source.fetch_all_async(self.engine.http)
+        result.update(streamed)
+        return result
+
+    def fetch_sge_fallback(self):
+        """
+        新浪缺失上金所报价时，从东方财富补充国内现货
+
+        Returns:
+            dict: {"gold": {...}, "silver": {...}}，价格单位与新浪一致（黄金元/克，白银元/千克）
+        """
+        result = {}
+        for name, secid in self.EASTMONEY_SGE_SECIDS.items():
+            spot = self._fetch_eastmoney_spot(secid)
+            if spot and spot["price"] > 0:
+                result[name] = spot
+        return result
+
+    async def fetch_sge_fallback_async(self):
+        """fetch_sge_fallback 的协程版本（asyncio 引擎），黄金与白银并发请求"""
+        names = list(self.EASTMONEY_SGE_SECIDS)
+        spots = await asyncio.gather(
+            *(self._fetch_eastmoney_spot_async(self.EASTMONEY_SGE_SECIDS[n]) for n in names)
+        )
+        return {name: spot for name, spot in zip(names, spots) if spot and spot["price"] > 0}
+
+    def new_snapshot(self):
+        """创建空白数据字典（updateUI 消费的结构）"""
+        return {
             "gold": {"intl": 0.0, "intl_change": 0.0, "dom": 0.0, "dom_change": 0.0},
             "silver": {"intl": 0.0, "intl_change": 0.0, "dom": 0.0, "dom_change": 0.0},
             "crypto": {},
             "exchange_rate": 0.0,
             "market_status": {"gold": "open", "silver": "open"},  # open/closed
-            "error": None
+            "error": None,
+            "stale_rows": {},  # 行 -> 是否为过期值（数据源失败或熔断时继续展示最后有效值）
+            "timestamp": time.time()
         }
 
-        try:
-            # 恢复 SGE_AUTD 和 SGE_AGTD 到新浪 URL
-            # 注意：确保 headers 中 Referer 正确 (已在 __init__ 中设置)
-            full_sina_url = self.sina_url + ",SGE_AUTD,SGE_AGTD"
+    def fetch_all(self):
+        """
+        立即抓取全部数据源（不按刷新节奏跳过）并组装数据字典，国内休市期间自动对标国际盘面推演价格
+
+        Returns:
+            dict: updateUI 使用的数据字典
+        """
+        if self._registry is None:
+            self._registry = SourceScheduler(self)
+        return self._registry.fetch_all(force=True)
+
+    def build_snapshot(self, data, quotes, crypto, dom_spot=None):
+        """
+        由新浪行情字段与加密货币报价组装数据字典，并执行休市推演
+
+        Args:
+            data: new_snapshot() 创建的数据字典，原地填充
+            quotes: 新浪代码 -> SinaQuote
+            crypto: 币种名 -> {"price", "change"}
+            dom_spot: 可选的国内现货补充报价（东方财富），{"gold"/"silver": {"price", "prev_close"}}
+
+        Returns:
+            dict: 填充后的 data
+        """
+        dom_spot = dom_spot or {}
+
+        # 1. 解析新浪数据
+        # 抓取汇率与国际盘（永不休市，作为基准）
+        ex = quotes.get("fx_susdcny")
+        if ex and ex.has_price: data["exchange_rate"] = ex.price
+
+        xau = quotes.get("hf_XAU")
+        if xau:
+            data["gold"]["intl"] = xau.price
+            pc = xau.prev_close
+            if pc > 0: data["gold"]["intl_change"] = round((data["gold"]["intl"] - pc) / pc * 100, 2)
+
+        si = quotes.get("hf_SI")
+        if si:
+            data["silver"]["intl"] = si.price
+            pc = si.prev_close  # 昨收为空时解析器已回退到昨结
+            if pc > 0: data["silver"]["intl_change"] = round((data["silver"]["intl"] - pc) / pc * 100, 2)
+
+        # 2. 抓取国内现货（新浪为主，东方财富补充）
+        # SGE_AUTD: [代码, 名称, 简拼, 最新价, 昨收, 开盘, 最高, 最低, 买价, 卖价, 昨结, ..., 时间]
+        # 字段位置见 sina_parser.LAYOUTS（index 3 是最新价, index 4 是昨收）
+        au_spot = quotes.get("SGE_AUTD")
+        ag_spot = quotes.get("SGE_AGTD")
+        if not (au_spot and au_spot.has_price) and "gold" in dom_spot:
+            au_spot = SinaQuote("SGE_AUTD", dom_spot["gold"]["price"], dom_spot["gold"]["prev_close"])
+        if not (ag_spot and ag_spot.has_price) and "silver" in dom_spot:
+            ag_spot = SinaQuote("SGE_AGTD", dom_spot["silver"]["price"], dom_spot["silver"]["prev_close"])
+
+        #单位转换常数: 1 盎司 = 31.1034768 克
+        oz_to_g = AppConfig.OZ_TO_GRAM
+
+        # --- 黄金逻辑：无缝推演 ---
+        if data["gold"]["intl"] > 0 and data["exchange_rate"] > 0:
+            theoretical_dom = data["gold"]["intl"] * data["exchange_rate"] / oz_to_g
             
-            def fetch_sina():
-                try:
-                    resp = self.session.get(full_sina_url, timeout=2.0)
-                    return resp.content.decode('gb18030', errors='ignore')
-                except: return ""
+            actual_dom = au_spot.price if au_spot else 0
+            yesterday_close = au_spot.prev_close if au_spot else 0
+
+            # SGE_AUTD 特定判断：如果有 latest_price 且 > 0，则为开市
+            is_market_closed = not (au_spot and au_spot.has_price) or actual_dom <= 0
             
-            # 并行获取新浪数据（国际+汇率+国内现货）和加密货币数据
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_sina = executor.submit(fetch_sina)
-                
-                crypto_map = {"BTC": "BTCUSDT", "ETH": "ETHUSDT", "BNB": "BNBUSDT", "SOL": "SOLUSDT", "HYPE": "HYPEUSDT"}
-                crypto_futures = [executor.submit(self._fetch_single_crypto, n, s) for n, s in crypto_map.items()]
-
-                # 1. 解析新浪数据
-                html = future_sina.result()
-                if html:
-                    def parse_sina(key):
-                        m = re.search(f'{key}="([^"]+)"', html)
-                        return m.group(1).split(',') if m else []
-
-                    # 抓取汇率与国际盘（永不休市，作为基准）
-                    ex = parse_sina("fx_susdcny")
-                    if ex: data["exchange_rate"] = self._safe_float(ex[1])
-
-                    xau = parse_sina("hf_XAU")
-                    if xau:
-                        data["gold"]["intl"] = self._safe_float(xau[0])
-                        pc = self._safe_float(xau[1])
-                        if pc > 0: data["gold"]["intl_change"] = round((data["gold"]["intl"] - pc) / pc * 100, 2)
-
-                    si = parse_sina("hf_SI")
-                    if si:
-                        data["silver"]["intl"] = self._safe_float(si[0])
-                        pc = self._safe_float(si[1]) or self._safe_float(si[7])
-                        if pc > 0: data["silver"]["intl_change"] = round((data["silver"]["intl"] - pc) / pc * 100, 2)
-
-                    # 2. 抓取国内现货（恢复新浪数据源）
-                    # SGE_AUTD: [代码, 名称, 简拼, 最新价, 昨收, 开盘, 最高, 最低, 买价, 卖价, 昨结, ..., 时间]
-                    # 注意新浪数据格式: index 3 是最新价, index 4 是昨收
-                    au_spot = parse_sina("SGE_AUTD")
-                    ag_spot = parse_sina("SGE_AGTD")
-
-                    #单位转换常数: 1 盎司 = 31.1034768 克
-                    oz_to_g = 31.1034768
-
-                    # --- 黄金逻辑：无缝推演 ---
-                    if data["gold"]["intl"] > 0 and data["exchange_rate"] > 0:
-                        theoretical_dom = data["gold"]["intl"] * data["exchange_rate"] / oz_to_g
-                        
-                        actual_dom = self._safe_float(au_spot[3]) if len(au_spot) > 3 else 0
-                        yesterday_close = self._safe_float(au_spot[4]) if len(au_spot) > 4 else 0
-
-                        # SGE_AUTD 特定判断：如果有 latest_price 且 > 0，则为开市
-                        is_market_closed = len(au_spot) < 4 or actual_dom <= 0
-                        
-                        if actual_dom > 0 and not is_market_closed:
-                            # 正常交易时段：记录最新溢价
-                            self.last_premium_gold = actual_dom - theoretical_dom
-                            data["gold"]["dom"] = actual_dom
-                            data["market_status"]["gold"] = "open"
-                            # 正常交易时段：使用昨收价计算涨跌幅
-                            if yesterday_close > 0:
-                                data["gold"]["dom_change"] = round((actual_dom - yesterday_close) / yesterday_close * 100, 2)
-                        else:
-                            # 休市期间：基于国际走势 + 最后记录的溢价进行"动态推演"
-                            data["gold"]["dom"] = round(theoretical_dom + self.last_premium_gold, 2)
-                            data["market_status"]["gold"] = "closed"
-                            # 休市期间：使用国际盘涨跌幅作为国内涨跌幅
-                            data["gold"]["dom_change"] = data["gold"]["intl_change"]
-
-                    # --- 白银逻辑：无缝推演 ---
-                    if data["silver"]["intl"] > 0 and data["exchange_rate"] > 0:
-                        # 国际盎司到国内克的理论换算
-                        theoretical_dom = data["silver"]["intl"] * data["exchange_rate"] / oz_to_g
-                        
-                        # AGTD 是 元/千克
-                        actual_dom_kg = self._safe_float(ag_spot[3]) if len(ag_spot) > 3 else 0
-                        actual_dom = actual_dom_kg / 1000
-                        yesterday_close_kg = self._safe_float(ag_spot[4]) if len(ag_spot) > 4 else 0
-                        yesterday_close = yesterday_close_kg / 1000
-                        
-                        is_market_closed = len(ag_spot) < 4 or actual_dom <= 0
-
-                        if actual_dom > 0 and not is_market_closed:
-                            self.last_premium_silver = actual_dom - theoretical_dom
-                            data["silver"]["dom"] = round(actual_dom, 3)
-                            data["market_status"]["silver"] = "open"
-                            # 正常交易时段：使用昨收价计算涨跌幅
-                            if yesterday_close > 0:
-                                data["silver"]["dom_change"] = round((actual_dom - yesterday_close) / yesterday_close * 100, 2)
-                        else:
-                            # 溢价推演
-                            data["silver"]["dom"] = round(theoretical_dom + self.last_premium_silver, 3)
-                            data["market_status"]["silver"] = "closed"
-                            # 休市期间：使用国际盘涨跌幅作为国内涨跌幅
-                            data["silver"]["dom_change"] = data["silver"]["intl_change"]
-
-                # 3. 收集加密货币结果
-                for f in crypto_futures:
-                    res = f.result()
-                    if res[1]: data["crypto"][res[0]] = res[1]
+            if actual_dom > 0 and not is_market_closed:
+                # 正常交易时段：记录最新溢价
+                self.last_premium_gold = actual_dom - theoretical_dom
+                data["gold"]["dom"] = actual_dom
+                data["market_status"]["gold"] = "open"
+                # 正常交易时段：使用昨收价计算涨跌幅
+                if yesterday_close > 0:
+                    data["gold"]["dom_change"] = round((actual_dom - yesterday_close) / yesterday_close * 100, 2)
+            else:
+                # 休市期间：基于国际走势 + 最后记录的溢价进行"动态推演"
+                data["gold"]["dom"] = round(theoretical_dom + self.last_premium_gold, 2)
+                data["market_status"]["gold"] = "closed"
+                # 休市期间：使用国际盘涨跌幅作为国内涨跌幅
+                data["gold"]["dom_change"] = data["gold"]["intl_change"]
 
-        except Exception as e:
-            data["error"] = str(e)
+        # --- 白银逻辑：无缝推演 ---
+        if data["silver"]["intl"] > 0 and data["exchange_rate"] > 0:
+            # 国际盎司到国内克的理论换算
+            theoretical_dom = data["silver"]["intl"] * data["exchange_rate"] / oz_to_g
+            
+            # AGTD 是 元/千克
+            actual_dom_kg = ag_spot.price if ag_spot else 0
+            actual_dom = actual_dom_kg / 1000
+            yesterday_close_kg = ag_spot.prev_close if ag_spot else 0
+            yesterday_close = yesterday_close_kg / 1000
+            
+            is_market_closed = not (ag_spot and ag_spot.has_price) or actual_dom <= 0
+
+            if actual_dom > 0 and not is_market_closed:
+                self.last_premium_silver = actual_dom - theoretical_dom
+                data["silver"]["dom"] = round(actual_dom, 3)
+                data["market_status"]["silver"] = "open"
+                # 正常交易时段：使用昨收价计算涨跌幅
+                if yesterday_close > 0:
+                    data["silver"]["dom_change"] = round((actual_dom - yesterday_close) / yesterday_close * 100, 2)
+            else:
+                # 溢价推演
+                data["silver"]["dom"] = round(theoretical_dom + self.last_premium_silver, 3)
+                data["market_status"]["silver"] = "closed"
+                # 休市期间：使用国际盘涨跌幅作为国内涨跌幅
+                data["silver"]["dom_change"] = data["silver"]["intl_change"]
+
+        # 3. 收集加密货币结果
+        data["crypto"] = dict(crypto)
 
         return data
 
 if __name__ == "__main__":
-    # 测试代码
-    fetcher = GoldDataFetcher()
-    print(fetcher.fetch_all())
+    # 测试代码：本地行情中枢运行时直接读取其快照，不再单独请求上游接口；
+    # 带 --sources 参数时逐个单独抓取各数据源并输出耗时
+    import sys
+    from .hub import fetch_snapshot
+    if "--sources" in sys.argv:
+        registry = SourceScheduler(GoldDataFetcher())
+        for name in registry.sources:
+            value, seconds = registry.run_source(name)
+            elapsed = f"{seconds * 1000:.1f} ms" if seconds is not None else "failed"
+            print(f"{name:<12} {elapsed:>10}  {len(value or ())} items")
+    else:
+        print(fetch_snapshot() or GoldDataFetcher().fetch_all())
@@ -0,0 +1,99 @@
+"""
+常驻数据抓取引擎
+持有固定大小的线程池，为每次刷新并发执行各数据源任务，并施加单次刷新的截止时间
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .config import AppConfig
+
+
+class FetchEngine:
+    """常驻线程池抓取引擎，生命周期与 GoldDataFetcher 一致"""
+
+    is_async = False
+
+    def __init__(self, max_workers=None, deadline=None):
+        """
+        初始化抓取引擎
+
+        Args:
+            max_workers: 线程池大小，默认取 AppConfig.FETCH_WORKERS
+            deadline: 单次刷新的截止时间（秒），默认取 AppConfig.FETCH_DEADLINE_S
+        """
+        self.max_workers = max_workers or AppConfig.FETCH_WORKERS
+        self.deadline = deadline if deadline is not None else AppConfig.FETCH_DEADLINE_S
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="fetch"
+        )
+        self._lock = threading.Lock()
+        self._inflight = {}  # 任务名 -> 尚未完成的 Future（慢源不重复提交）
+        self._closed = False
+        self.durations = {}  # 最近一次 run 中按时完成的任务 -> 执行耗时（秒）
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @staticmethod
+    def _timed(fn):
+        start = time.perf_counter()
+        value = fn()
+        return value, time.perf_counter() - start
+
+    def run(self, tasks, deadline=None):
+        """
+        并发执行一组任务，最多等待到截止时间
+
+        Args:
+            tasks: 任务名 -> 无参可调用对象
+            deadline: 本次截止时间（秒），默认使用引擎配置
+
+        Returns:
+            tuple: (results, errors)
+                results: 任务名 -> 返回值，仅包含按时成功完成的任务（耗时记录在 self.durations）
+                errors: 任务名 -> 错误描述，包含超时、异常以及仍在执行而被跳过的任务
+        """
+        results, errors = {}, {}
+        self.durations = {}
+        if self._closed:
+            return results, {name: "engine closed" for name in tasks}
+
+        futures = {}
+        with self._lock:
+            for name, fn in tasks.items():
+                previous = self._inflight.get(name)
+                if previous is not None and not previous.done():
+                    # 上一次的同名任务尚未返回：本次跳过，避免慢源在队列中堆积
+                    errors[name] = "busy"
+                    continue
+                future = self._executor.submit(self._timed, fn)
+                self._inflight[name] = future
+                futures[name] = future
+
+        timeout = self.deadline if deadline is None else deadline
+        wait(futures.values(), timeout=timeout)
+
+        for name, future in futures.items():
+            if not future.done():
+                errors[name] = "timeout"
+                continue
+            exc = future.exception()
+            if exc is not None:
+                errors[name] = str(exc)
+            else:
+                results[name], self.durations[name] = future.result()
+        return results, errors
+
+    def close(self, wait_for_tasks=False):
+        """
+        关闭线程池
+
+        Args:
+            wait_for_tasks: 是否等待正在执行的任务结束
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=wait_for_tasks)
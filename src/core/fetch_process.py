@@ -0,0 +1,262 @@
+"""
+独立抓取进程
+抓取、解析与本地存储写入在子进程中进行，不与界面线程争用GIL；每个快照写入一块固定布局的共享内存：
+
+    [0:8]   序号 seq（uint64，写入期间为奇数，写完为偶数）
+    [8:16]  快照长度（uint64）
+    [16:]   快照JSON字节（容量 AppConfig.SHM_SNAPSHOT_BYTES）
+
+单写者（子进程）+ 顺序锁：读者先后读取两次序号，一致且为偶数即为完整快照，不加锁、不阻塞写者。
+FetcherSupervisor 在窗口进程中持有共享内存并监督子进程，子进程退出后按退避重启
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import struct
+import time
+from multiprocessing import shared_memory
+
+from .config import AppConfig
+from .hub import QuoteHub
+
+log = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<QQ")  # seq, length
+_READ_RETRIES = 8
+
+
+class SnapshotBlock:
+    """共享内存快照区（顺序锁，单写者多读者）"""
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner  # 创建者负责 unlink
+        self.capacity = shm.size - _HEADER.size
+        seq, _ = _HEADER.unpack_from(shm.buf, 0)
+        self._seq = seq + (seq & 1)  # 上一个写者中途退出时序号为奇数，从下一个偶数继续
+        self.dropped = 0  # 超出容量而未写入的快照数
+
+    @classmethod
+    def create(cls, capacity=None):
+        capacity = capacity or AppConfig.SHM_SNAPSHOT_BYTES
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity)
+        _HEADER.pack_into(shm.buf, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, body):
+        """
+        写入一个快照（仅写者进程调用）
+
+        Returns:
+            bool: 超出容量时返回False
+        """
+        n = len(body)
+        if n > self.capacity:
+            self.dropped += 1
+            log.warning("快照 %d 字节超出共享内存容量 %d，已丢弃", n, self.capacity)
+            return False
+        buf = self.shm.buf
+        self._seq += 1
+        struct.pack_into("<Q", buf, 0, self._seq)  # 奇数：写入中
+        buf[_HEADER.size:_HEADER.size + n] = body
+        self._seq += 1
+        _HEADER.pack_into(buf, 0, self._seq, n)
+        return True
+
+    def sequence(self):
+        return struct.unpack_from("<Q", self.shm.buf, 0)[0]
+
+    def read(self, after=0):
+        """
+        读取比 after 更新的快照
+
+        Returns:
+            tuple: (序号, 快照JSON字节)；没有新快照或多次重试仍与写入冲突时为 (after, None)
+        """
+        buf = self.shm.buf
+        for _ in range(_READ_RETRIES):
+            seq, n = _HEADER.unpack_from(buf, 0)
+            if seq == after:
+                return after, None
+            if seq & 1:
+                time.sleep(0)  # 写者正在写入，让出时间片后重试
+                continue
+            # 顺序锁要求先复制再校验序号，这是读取路径上唯一的一次复制
+            body = bytes(buf[_HEADER.size:_HEADER.size + n])
+            if struct.unpack_from("<Q", buf, 0)[0] == seq:
+                return seq, body
+        return after, None
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class _BlockHub(QuoteHub):
+    """每个发布的快照同时写入共享内存"""
+
+    def __init__(self, block, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.block = block
+
+    def publish(self, data):
+        published = super().publish(data)
+        if published:
+            self.block.write(self.latest()[1])
+        return published
+
+
+def run_fetcher(block_name, refresh, stop, parent_pid, configure=None, background=None):
+    """
+    子进程入口：运行抓取循环，直到收到停止信号或父进程退出
+
+    Args:
+        block_name: 共享内存名
+        refresh: multiprocessing.Event，置位时立即抓取一次（窗口的手动刷新）
+        stop: multiprocessing.Event，置位时退出
+        parent_pid: 窗口进程ID，父进程不存在时自行退出
+        configure: 可选，以 GoldDataFetcher 为参数调用的可序列化函数（基准测试用于指向本地桩服务）
+        background: 可选的 multiprocessing.Event，置位期间按 BACKGROUND_UPDATE_INTERVAL_MS 降低抓取频率
+    """
+    from .data_fetcher import GoldDataFetcher
+    from .logs import setup_logging
+    from .scheduler import SourceScheduler
+    from .snapshot_cache import SnapshotCache
+    from .tick_store import TickStore
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # 终端 Ctrl+C 由窗口进程处理
+    setup_logging()
+    block = SnapshotBlock.attach(block_name)
+    fetcher = GoldDataFetcher()
+    if configure is not None:
+        configure(fetcher)
+    snapshot_cache = SnapshotCache(fetcher)
+    snapshot_cache.load()  # 恢复休市推演用的溢价
+    tick_store = None
+    if AppConfig.TICK_STORE_ENABLED:
+        try:
+            tick_store = TickStore()
+        except Exception as e:
+            log.warning("本地行情存储不可用: %s", e)
+    sinks = [snapshot_cache] + ([tick_store] if tick_store else [])
+
+    hub = _BlockHub(block, SourceScheduler(fetcher), sinks, fetcher=fetcher).start()
+    try:
+        while not stop.is_set() and os.getppid() == parent_pid:
+            hidden = background is not None and background.is_set()
+            hub.interval = (AppConfig.BACKGROUND_UPDATE_INTERVAL_MS if hidden else AppConfig.UPDATE_INTERVAL_MS) / 1000
+            if refresh.wait(0.25):
+                refresh.clear()
+                hub.refresh()
+    finally:
+        hub.stop()
+        fetcher.close()
+        snapshot_cache.flush()
+        if tick_store is not None:
+            tick_store.close()
+        block.close()
+
+
+class FetcherSupervisor:
+    """在窗口进程中创建共享内存、启动并监督抓取子进程"""
+
+    def __init__(self, capacity=None, configure=None):
+        """
+        Args:
+            capacity: 快照区容量（字节），默认取 AppConfig.SHM_SNAPSHOT_BYTES
+            configure: 传给子进程的 run_fetcher(configure=...)
+        """
+        self.configure = configure
+        self.block = SnapshotBlock.create(capacity)
+        self._ctx = multiprocessing.get_context("spawn")  # 不继承Qt等已初始化的状态
+        self._refresh = self._ctx.Event()
+        self._stop = self._ctx.Event()
+        self._background = self._ctx.Event()
+        self.process = None
+        self.restarts = 0
+        self._backoff = AppConfig.FETCH_PROCESS_RESTART_INITIAL_S
+        self._restart_at = None
+        self._started_at = 0.0
+
+    def start(self):
+        self._spawn()
+        return self
+
+    def _spawn(self):
+        self.process = self._ctx.Process(
+            target=run_fetcher,
+            args=(self.block.name, self._refresh, self._stop, os.getpid(), self.configure, self._background),
+            name="mfw-fetcher",
+            daemon=True,
+        )
+        self.process.start()
+        self._started_at = time.monotonic()
+
+    def poll(self):
+        """
+        检查子进程状态，已退出时按退避重启（由窗口的轮询定时器调用，开销为一次非阻塞 waitpid）
+
+        Returns:
+            bool: 子进程是否在运行
+        """
+        if self.process is None or self._stop.is_set():
+            return False
+        now = time.monotonic()
+        if self.process.is_alive():
+            if now - self._started_at > AppConfig.FETCH_PROCESS_RESTART_MAX_S:
+                self._backoff = AppConfig.FETCH_PROCESS_RESTART_INITIAL_S  # 曾稳定运行，重置退避
+            return True
+        if self._restart_at is None:
+            log.warning("抓取进程已退出（exitcode=%s），%.1f 秒后重启", self.process.exitcode, self._backoff)
+            self._restart_at = now + self._backoff
+        elif now >= self._restart_at:
+            self._restart_at = None
+            self.restarts += 1
+            self._backoff = min(self._backoff * 2, AppConfig.FETCH_PROCESS_RESTART_MAX_S)
+            self._spawn()
+        return False
+
+    def read(self, after=0):
+        return self.block.read(after)
+
+    def refresh(self):
+        """请求子进程立即抓取一次（不阻塞）"""
+        self._refresh.set()
+
+    def set_background(self, background):
+        """窗口进入/离开后台：子进程相应降低/恢复抓取频率"""
+        if background:
+            self._background.set()
+        else:
+            self._background.clear()
+
+    def stats(self):
+        return {
+            "pid": self.process.pid if self.process else None,
+            "alive": bool(self.process and self.process.is_alive()),
+            "restarts": self.restarts,
+            "sequence": self.block.sequence(),
+        }
+
+    def stop(self, timeout=3.0):
+        """停止子进程（超时后强制结束）并释放共享内存"""
+        self._stop.set()
+        if self.process is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(1.0)
+        self.block.close()
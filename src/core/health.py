@@ -0,0 +1,143 @@
+"""
+数据源健康跟踪模块
+为每个数据源维护熔断状态（closed/open/half_open）与近期延迟样本：
+连续失败达到阈值后熔断，冷却期内跳过请求；冷却结束后只放行一次探测（结果记录前其余请求继续跳过），成功即恢复。
+请求超时按近期延迟分位数自适应，而不是固定2秒
+"""
+from collections import deque
+import threading
+import time
+
+from .config import AppConfig
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SourceHealth:
+    """单个数据源的熔断器与延迟统计"""
+
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0  # 连续失败次数
+        self.cooldown = AppConfig.BREAKER_COOLDOWN_S
+        self.opened_at = None
+        self.probe_started = None  # half_open 探测请求的放行时刻，结果记录后清空
+        self.latencies = deque(maxlen=AppConfig.LATENCY_WINDOW)  # 近期成功请求耗时（秒）
+        self.successes_total = 0
+        self.failures_total = 0
+        self.skipped_total = 0  # 熔断期间被跳过的请求数
+
+    def allow(self, now):
+        """
+        本次是否放行请求（open 状态冷却结束后转为 half_open 放行一次探测，探测结果记录前其余请求跳过）
+
+        Args:
+            now: 单调时钟当前值
+        """
+        if self.state == OPEN:
+            if now - self.opened_at < self.cooldown:
+                self.skipped_total += 1
+                return False
+            self.state = HALF_OPEN
+        elif self.state == HALF_OPEN:
+            # 探测在途；结果超过一个冷却时间仍未记录（如任务被取消）时放行新的探测
+            if self.probe_started is not None and now - self.probe_started < self.cooldown:
+                self.skipped_total += 1
+                return False
+        else:
+            return True
+        self.probe_started = now
+        return True
+
+    def record_success(self, latency=None):
+        if latency is not None:
+            self.latencies.append(latency)
+        self.successes_total += 1
+        self.failures = 0
+        self.probe_started = None
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.cooldown = AppConfig.BREAKER_COOLDOWN_S
+
+    def record_failure(self, now):
+        self.failures_total += 1
+        self.failures += 1
+        self.probe_started = None
+        if self.state == HALF_OPEN:
+            # 探测失败：重新熔断，冷却时间加倍
+            self.cooldown = min(self.cooldown * 2, AppConfig.BREAKER_MAX_COOLDOWN_S)
+            self._open(now)
+        elif self.state == CLOSED and self.failures >= AppConfig.BREAKER_FAILURE_THRESHOLD:
+            self._open(now)
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+
+    def percentile(self, q):
+        """近期延迟的分位数（秒），样本不足时返回None"""
+        if len(self.latencies) < AppConfig.LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def timeout(self):
+        """
+        自适应请求超时：近期延迟分位数 × 系数，限制在 [最小, 最大] 之间；样本不足时使用最大值
+        """
+        high = AppConfig.ADAPTIVE_TIMEOUT_MAX_S
+        p = self.percentile(AppConfig.ADAPTIVE_TIMEOUT_PERCENTILE)
+        if p is None:
+            return high
+        return max(AppConfig.ADAPTIVE_TIMEOUT_MIN_S, min(high, p * AppConfig.ADAPTIVE_TIMEOUT_FACTOR))
+
+    def stats(self):
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "state": self.state,
+            "timeout": round(self.timeout(), 3),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "successes": self.successes_total,
+            "failures": self.failures_total,
+            "skipped": self.skipped_total,
+        }
+
+
+class HealthTracker:
+    """按数据源名称管理 SourceHealth（首次访问时创建）"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.sources = {}
+        self._lock = threading.Lock()  # 放行判断与结果记录须原子进行（half_open 只放行一次探测）
+
+    def get(self, name):
+        health = self.sources.get(name)
+        if health is None:
+            health = self.sources[name] = SourceHealth(name)
+        return health
+
+    def allow(self, name):
+        with self._lock:
+            return self.get(name).allow(self.clock())
+
+    def is_healthy(self, name):
+        return self.get(name).state == CLOSED
+
+    def timeout(self, name):
+        return self.get(name).timeout()
+
+    def record(self, name, ok, latency=None):
+        """记录一次请求结果（ok 为 False 表示失败或无数据）"""
+        with self._lock:
+            if ok:
+                self.get(name).record_success(latency)
+            else:
+                self.get(name).record_failure(self.clock())
+
+    def stats(self):
+        return {name: health.stats() for name, health in self.sources.items()}
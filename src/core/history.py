@@ -0,0 +1,275 @@
+"""
+行情历史模块
+为每个品种维护固定容量的环形缓冲（array存储），增量聚合1m/5m/1h K线，
+并提供降采样后的走势线数据；内存占用与运行时长无关
+"""
+import threading
+import time
+from array import array
+
+from .config import AppConfig
+
+
+def _zeros(n):
+    return array("d", [0.0]) * n
+
+
+def snapshot_instruments(data):
+    """
+    从数据字典中提取各品种的最新价
+
+    Yields:
+        tuple: (品种名, 价格)，品种名如 "gold.intl"、"fx.usdcny"、"crypto.BTC"；价格为0的品种跳过
+    """
+    for metal in ("gold", "silver"):
+        section = data.get(metal) or {}
+        for key in ("intl", "dom"):
+            value = section.get(key)
+            if value:
+                yield f"{metal}.{key}", value
+    if data.get("exchange_rate"):
+        yield "fx.usdcny", data["exchange_rate"]
+    for symbol, info in (data.get("crypto") or {}).items():
+        if info and info.get("price"):
+            yield f"crypto.{symbol}", info["price"]
+
+
+class TickRing:
+    """定长环形缓冲：时间戳与价格分别存放在两个 array('d') 中"""
+
+    __slots__ = ("capacity", "ts", "values", "head", "count")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.ts = _zeros(capacity)
+        self.values = _zeros(capacity)
+        self.head = 0  # 下一个写入位置
+        self.count = 0
+
+    def append(self, ts, value):
+        self.ts[self.head] = ts
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self, n=None):
+        """
+        按时间顺序返回最近的n条价格
+
+        Returns:
+            list: 价格列表（旧 -> 新）
+        """
+        n = self.count if n is None else min(n, self.count)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.values[start:start + n].tolist()
+        return self.values[start:].tolist() + self.values[:self.head].tolist()
+
+    def items(self):
+        """
+        按时间顺序返回全部逐笔
+
+        Returns:
+            list: [(时间戳, 价格), ...]（旧 -> 新）
+        """
+        start = (self.head - self.count) % self.capacity
+        order = [(start + i) % self.capacity for i in range(self.count)]
+        return [(self.ts[i], self.values[i]) for i in order]
+
+
+class OhlcRing:
+    """定长K线环形缓冲：对落在同一周期的价格原地更新最高/最低/收盘"""
+
+    __slots__ = ("resolution", "capacity", "start", "open", "high", "low", "close", "head", "count")
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution  # 周期（秒）
+        self.capacity = capacity
+        self.start = _zeros(capacity)
+        self.open = _zeros(capacity)
+        self.high = _zeros(capacity)
+        self.low = _zeros(capacity)
+        self.close = _zeros(capacity)
+        self.head = 0
+        self.count = 0
+
+    def update(self, ts, value):
+        bucket = ts - ts % self.resolution
+        if self.count:
+            i = (self.head - 1) % self.capacity
+            current = self.start[i]
+            if bucket == current:
+                if value > self.high[i]:
+                    self.high[i] = value
+                elif value < self.low[i]:
+                    self.low[i] = value
+                self.close[i] = value
+                return
+            if bucket < current:
+                return  # 乱序的过期数据
+        i = self.head
+        self.start[i] = bucket
+        self.open[i] = self.high[i] = self.low[i] = self.close[i] = value
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def bars(self, limit=None):
+        """
+        按时间顺序返回最近的K线
+
+        Returns:
+            list: [(开始时间, 开, 高, 低, 收), ...]（旧 -> 新）
+        """
+        n = self.count if limit is None else min(limit, self.count)
+        result = []
+        for k in range(n, 0, -1):
+            i = (self.head - k) % self.capacity
+            result.append((self.start[i], self.open[i], self.high[i], self.low[i], self.close[i]))
+        return result
+
+
+class InstrumentHistory:
+    """单个品种的逐笔环形缓冲与多周期K线"""
+
+    __slots__ = ("ticks", "ohlc")
+
+    def __init__(self, tick_capacity, bar_config):
+        self.ticks = TickRing(tick_capacity)
+        self.ohlc = {res: OhlcRing(res, cap) for res, cap in bar_config.items()}
+
+    def append(self, ts, value):
+        self.ticks.append(ts, value)
+        for ring in self.ohlc.values():
+            ring.update(ts, value)
+
+
+class TickHistory:
+    """全部品种的内存历史，线程安全（抓取线程写入，主线程读取）"""
+
+    def __init__(self, tick_capacity=None, bar_config=None):
+        """
+        初始化历史存储
+
+        Args:
+            tick_capacity: 每个品种保留的逐笔数量，默认取 AppConfig.HISTORY_TICK_CAPACITY
+            bar_config: 周期秒数 -> 保留K线数量，默认取 AppConfig.HISTORY_BARS
+        """
+        self.tick_capacity = tick_capacity or AppConfig.HISTORY_TICK_CAPACITY
+        self.bar_config = dict(bar_config or AppConfig.HISTORY_BARS)
+        self.instruments = {}
+        self._lock = threading.Lock()
+
+    def _append(self, instrument, value, ts):
+        """追加一笔价格（调用方须持有锁）"""
+        history = self.instruments.get(instrument)
+        if history is None:
+            history = self.instruments[instrument] = InstrumentHistory(
+                self.tick_capacity, self.bar_config
+            )
+        history.append(ts, value)
+
+    def append(self, instrument, value, ts=None):
+        """追加单个品种的一笔价格"""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self._append(instrument, value, ts)
+
+    def load(self, series):
+        """
+        批量载入历史数据（启动时由本地存储预热）
+
+        预热在后台线程中进行，实时快照可能已先写入：早于已有数据的部分排在其前面，
+        该品种的逐笔与K线按时间顺序重建
+
+        Args:
+            series: 品种名 -> [(时间戳, 价格), ...]（按时间升序）
+        """
+        with self._lock:
+            for instrument, rows in series.items():
+                existing = self.instruments.pop(instrument, None)
+                live = existing.ticks.items() if existing is not None else []
+                if live:
+                    first = live[0][0]
+                    rows = [row for row in rows if row[0] < first]
+                for ts, value in list(rows) + live:
+                    self._append(instrument, value, ts)
+
+    def record(self, data, ts=None):
+        """
+        记录一次快照中的全部品种
+
+        Args:
+            data: fetch_all 返回的数据字典
+            ts: 时间戳（秒），默认取快照的 timestamp 字段或当前时间
+        """
+        ts = ts or data.get("timestamp") or time.time()
+        with self._lock:
+            for instrument, value in snapshot_instruments(data):
+                self._append(instrument, value, ts)
+
+    def bars(self, instrument, resolution, limit=None):
+        """
+        获取某品种的K线
+
+        Args:
+            instrument: 品种名
+            resolution: 周期（秒），须为 bar_config 中的周期
+            limit: 最多返回的数量
+
+        Returns:
+            list: [(开始时间, 开, 高, 低, 收), ...]
+        """
+        with self._lock:
+            history = self.instruments.get(instrument)
+            if history is None or resolution not in history.ohlc:
+                return []
+            return history.ohlc[resolution].bars(limit)
+
+    def sparkline(self, instrument, points=None, resolution=None):
+        """
+        获取降采样后的走势线数据
+
+        Args:
+            instrument: 品种名
+            points: 输出点数上限，默认取 AppConfig.SPARKLINE_POINTS
+            resolution: 为None时基于逐笔数据，否则基于该周期K线的收盘价
+
+        Returns:
+            list: 价格列表（旧 -> 新），长度不超过 points
+        """
+        points = points or AppConfig.SPARKLINE_POINTS
+        with self._lock:
+            history = self.instruments.get(instrument)
+            if history is None:
+                return []
+            if resolution is None:
+                series = history.ticks.latest()
+            else:
+                series = [bar[4] for bar in history.ohlc[resolution].bars()]
+        return downsample(series, points)
+
+    def sparklines(self, points=None, resolution=None):
+        """获取全部品种的走势线：品种名 -> 价格列表"""
+        with self._lock:
+            names = list(self.instruments)
+        return {name: self.sparkline(name, points, resolution) for name in names}
+
+
+def downsample(series, points):
+    """
+    将序列降采样到不超过 points 个点：每段取末值，最后一点始终为最新价
+
+    Args:
+        series: 价格列表
+        points: 目标点数
+
+    Returns:
+        list: 降采样后的价格列表
+    """
+    n = len(series)
+    if n <= points:
+        return list(series)
+    step = n / points
+    return [series[min(n - 1, int((k + 1) * step) - 1)] for k in range(points)]
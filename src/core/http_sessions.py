@@ -0,0 +1,113 @@
+"""
+HTTP会话注册表
+每个数据源主机一个 requests.Session：独立请求头、与抓取线程数匹配的连接池，
+启动时预先建立连接（TCP+TLS），并统计各主机的连接复用情况
+"""
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import AppConfig
+from .metrics import REGISTRY
+
+BYTES_RECEIVED = REGISTRY.counter(
+    "mfw_http_bytes_received_total", "Response body bytes received", ("host",)
+)
+
+
+def _count_bytes(resp, *args, **kwargs):
+    """requests 响应钩子：按主机累计响应体字节数"""
+    BYTES_RECEIVED.inc(len(resp.content), host=urlsplit(resp.url).hostname or "")
+
+
+class SessionRegistry:
+    """按主机管理的长连接会话集合"""
+
+    def __init__(self, pool_size=None):
+        """
+        初始化注册表
+
+        Args:
+            pool_size: 每个主机的连接池大小，默认取 AppConfig.HTTP_POOL_SIZE
+        """
+        self.pool_size = pool_size or AppConfig.HTTP_POOL_SIZE
+        self._sessions = {}  # 名称 -> requests.Session
+        self._urls = {}  # 名称 -> 主机根地址（预热用）
+
+    def register(self, name, base_url, headers=None):
+        """
+        注册一个主机会话
+
+        Args:
+            name: 会话名，如 "sina"
+            base_url: 该主机的接口地址（仅使用协议与主机部分）
+            headers: 该主机专用的请求头
+
+        Returns:
+            requests.Session: 新建的会话
+        """
+        parts = urlsplit(base_url)
+        root = f"{parts.scheme}://{parts.netloc}/"
+        session = requests.Session()
+        if headers:
+            session.headers.update(headers)
+        session.hooks["response"].append(_count_bytes)
+        # 每个会话只访问一个主机：连接池只需一个，大小与抓取线程数一致，避免并发时临时建连后丢弃
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self._sessions[name] = session
+        self._urls[name] = root
+        return session
+
+    def get(self, name):
+        return self._sessions[name]
+
+    def headers(self, name):
+        """某个会话的请求头副本（供 asyncio 引擎逐请求传入）"""
+        return dict(self._sessions[name].headers)
+
+    def prewarm(self, names=None, timeout=2.0):
+        """
+        后台预先建立连接，首次抓取时直接复用（失败不影响后续正常请求）
+
+        Args:
+            names: 要预热的会话名，默认全部
+            timeout: 单次预热请求超时（秒）
+        """
+        def warm(name):
+            try:
+                self._sessions[name].head(self._urls[name], timeout=timeout, allow_redirects=False)
+            except Exception:
+                pass
+
+        for name in (names or list(self._sessions)):
+            threading.Thread(target=warm, args=(name,), name=f"prewarm-{name}", daemon=True).start()
+
+    def stats(self):
+        """
+        各会话的连接复用统计（来自 urllib3 连接池计数）
+
+        Returns:
+            dict: 会话名 -> {"requests": 请求数, "connections": 新建连接数（即握手次数）, "reuse": 复用率}
+        """
+        result = {}
+        for name, session in self._sessions.items():
+            requests_count = connections = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_count += pool.num_requests
+                    connections += pool.num_connections
+            reuse = 1 - connections / requests_count if requests_count else 0.0
+            result[name] = {"requests": requests_count, "connections": connections, "reuse": round(reuse, 3)}
+        return result
+
+    def close(self):
+        for session in self._sessions.values():
+            session.close()
@@ -0,0 +1,362 @@
+"""
+本地行情中枢
+一个进程运行唯一的抓取循环，经 127.0.0.1 上的 HTTP 接口发布快照，多个窗口/脚本订阅同一份数据，
+上游接口的请求量不随客户端数量增加。不依赖 PySide6
+
+接口：
+    GET  /events    SSE 推送（每个快照一个 data: 事件，无新快照时定期发送心跳注释）
+    GET  /snapshot  最新快照（JSON）
+    GET  /stats     抓取循环、订阅者与数据源统计
+    GET  /metrics   Prometheus 文本格式指标
+    POST /refresh   立即抓取一次（窗口的手动刷新）
+"""
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from .config import AppConfig
+from .metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+HUB_FETCH_SECONDS = REGISTRY.histogram("mfw_hub_fetch_seconds", "Hub fetch_all + sinks time per tick")
+HUB_PUBLISHED = REGISTRY.counter("mfw_hub_published_total", "Snapshots published by outcome", ("outcome",))
+HUB_SUBSCRIBERS = REGISTRY.gauge("mfw_hub_subscribers", "Connected SSE subscribers")
+
+
+def hub_url():
+    """客户端使用的中枢地址：MFW_HUB_URL，未设置时为本机默认端口"""
+    return (AppConfig.HUB_URL or f"http://127.0.0.1:{AppConfig.HUB_PORT}").rstrip("/")
+
+
+def fetch_snapshot(url=None, timeout=2.0):
+    """
+    从中枢读取一次最新快照（供脚本使用，代替自行调用 GoldDataFetcher().fetch_all()）
+
+    Returns:
+        dict | None: 中枢未运行或尚无快照时返回None
+    """
+    try:
+        resp = requests.get(f"{(url or hub_url()).rstrip('/')}/snapshot", timeout=timeout)
+        if resp.status_code != 200:
+            return None
+        return resp.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+class QuoteHub:
+    """抓取循环 + 快照发布：每轮结果只序列化一次，所有订阅者共享同一份字节"""
+
+    def __init__(self, source, sinks=(), interval=None, fetcher=None):
+        """
+        初始化中枢
+
+        Args:
+            source: 提供 fetch_all() 的对象（通常为 SourceScheduler）
+            sinks: 快照接收者列表（提供 record(data) 方法），在抓取线程中调用
+            interval: 抓取间隔（秒），默认取 AppConfig.UPDATE_INTERVAL_MS
+            fetcher: GoldDataFetcher，可选，用于在 /stats 中附带连接复用与熔断状态
+        """
+        self.source = source
+        self.sinks = list(sinks)
+        self.interval = AppConfig.UPDATE_INTERVAL_MS / 1000 if interval is None else interval
+        self.fetcher = fetcher
+        self._cond = threading.Condition()
+        self._version = 0
+        self._body = None  # 最新快照的JSON字节
+        self._content = None  # 最新快照除 timestamp 外的JSON字节（判断内容是否变化）
+        self._closed = False
+        self._wake = threading.Event()
+        self._thread = None
+        self.ticks = 0
+        self.unchanged = 0  # 与上一快照完全相同、未发布的轮数
+        self.subscribers = 0
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def publish(self, data):
+        """
+        序列化并发布快照，除 timestamp 外内容与上一快照相同时不唤醒订阅者
+
+        每个快照都带有新的 timestamp，因此比较时将其排除；新时间戳随下一次内容变化一并发布
+        """
+        content = json.dumps({k: v for k, v in data.items() if k != "timestamp"}, separators=(",", ":")).encode()
+        with self._cond:
+            if content == self._content:
+                self.unchanged += 1
+                HUB_PUBLISHED.inc(outcome="unchanged")
+                return False
+            body = json.dumps(data, separators=(",", ":")).encode()
+            self._version += 1
+            self._body = body
+            self._content = content
+            self._cond.notify_all()
+        HUB_PUBLISHED.inc(outcome="published")
+        return True
+
+    def latest(self):
+        """
+        Returns:
+            tuple: (版本号, 快照JSON字节)，尚无快照时为 (0, None)
+        """
+        with self._cond:
+            return self._version, self._body
+
+    def wait(self, after, timeout):
+        """
+        等待版本号大于 after 的快照
+
+        Returns:
+            tuple: (版本号, 快照JSON字节)；超时或中枢关闭时为 (after, None)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._version > after or self._closed, timeout)
+            if self._version > after:
+                return self._version, self._body
+            return after, None
+
+    def refresh(self):
+        """提前开始下一轮抓取（可在任意线程调用，多次请求合并为一次）"""
+        self._wake.set()
+
+    def tick(self):
+        """执行一轮抓取、写入接收者并发布"""
+        start = time.perf_counter()
+        try:
+            data = self.source.fetch_all()
+            for sink in self.sinks:
+                sink.record(data)
+        except Exception as e:
+            log.warning("中枢抓取失败: %s", e)
+            data = {"error": str(e)}
+        HUB_FETCH_SECONDS.observe(time.perf_counter() - start)
+        self.ticks += 1
+        self.publish(data)
+
+    def _run(self):
+        while not self._closed:
+            started = time.monotonic()
+            self._wake.clear()
+            self.tick()
+            self._wake.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="hub-fetch", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止抓取循环并唤醒所有订阅者（其连接随后关闭）"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def stats(self):
+        with self._cond:
+            stats = {
+                "version": self._version,
+                "ticks": self.ticks,
+                "unchanged": self.unchanged,
+                "subscribers": self.subscribers,
+            }
+        if self.fetcher is not None:
+            stats["connections"] = self.fetcher.connection_stats()
+            stats["health"] = self.fetcher.health.stats()
+        return stats
+
+    def _subscribed(self, delta):
+        with self._cond:
+            self.subscribers += delta
+            HUB_SUBSCRIBERS.set(self.subscribers)
+
+
+class HubServer:
+    """中枢的本地HTTP服务（仅监听 127.0.0.1）"""
+
+    def __init__(self, hub, port=None):
+        """
+        Args:
+            hub: QuoteHub 实例
+            port: 监听端口，默认取 AppConfig.HUB_PORT，0 为自动分配
+        """
+        self.hub = hub
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", AppConfig.HUB_PORT if port is None else port), self._handler()
+        )
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def _handler(self):
+        hub = self.hub
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _send(self, status, body=b"", content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/events":
+                    self._stream()
+                elif path == "/snapshot":
+                    _, body = hub.latest()
+                    self._send(200, body) if body is not None else self._send(503)
+                elif path == "/stats":
+                    self._send(200, json.dumps(hub.stats()).encode())
+                elif path == "/metrics":
+                    self._send(200, REGISTRY.render().encode(), "text/plain; version=0.0.4")
+                else:
+                    self._send(404)
+
+            def do_POST(self):
+                if self.path.split("?")[0] != "/refresh":
+                    self._send(404)
+                    return
+                hub.refresh()
+                self._send(204)
+
+            def _stream(self):
+                """SSE：分块传输，每个事件一个分块，客户端收到即可解析"""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self.close_connection = True
+                hub._subscribed(1)
+                try:
+                    version, body = hub.latest()
+                    if body is not None:
+                        self._chunk(b"data: " + body + b"\n\n")
+                    while not hub.closed:
+                        version, body = hub.wait(version, AppConfig.HUB_KEEPALIVE_S)
+                        if body is not None:
+                            self._chunk(b"data: " + body + b"\n\n")
+                        elif not hub.closed:
+                            self._chunk(b": keepalive\n\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 客户端断开
+                finally:
+                    hub._subscribed(-1)
+
+            def _chunk(self, payload):
+                self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="hub-http", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class HubClient:
+    """中枢订阅者：后台线程读取SSE，每个快照回调一次；断线后指数退避重连"""
+
+    def __init__(self, on_snapshot, url=None):
+        """
+        Args:
+            on_snapshot: 回调函数，参数为快照字典（在客户端线程中调用）
+            url: 中枢地址，默认取 hub_url()
+        """
+        self.on_snapshot = on_snapshot
+        self.url = (url or hub_url()).rstrip("/")
+        self.session = requests.Session()
+        self._stop = threading.Event()
+        self._thread = None
+        self._resp = None
+        self.connected = False
+        self.received = 0  # 已收到的快照数
+        self.reconnects = 0
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hub-client", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """断开连接并停止重连"""
+        self._stop.set()
+        resp = self._resp
+        if resp is not None:
+            try:
+                resp.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self.session.close()
+
+    def refresh(self, timeout=1.0):
+        """请求中枢立即抓取一次"""
+        try:
+            self.session.post(f"{self.url}/refresh", timeout=timeout)
+            return True
+        except requests.RequestException:
+            return False
+
+    def stats(self):
+        return {"hub": self.url, "connected": self.connected,
+                "received": self.received, "reconnects": self.reconnects}
+
+    def _run(self):
+        backoff = AppConfig.HUB_RECONNECT_INITIAL_S
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._stream_once()
+            except Exception as e:
+                if not self._stop.is_set():
+                    log.warning("行情中枢连接断开: %s", e)
+            finally:
+                self.connected = False
+                self._resp = None
+            if self._stop.is_set():
+                break
+            self.reconnects += 1
+            if time.monotonic() - started > AppConfig.HUB_RECONNECT_MAX_S:
+                backoff = AppConfig.HUB_RECONNECT_INITIAL_S  # 连接曾稳定运行，重置退避
+            self._stop.wait(backoff * random.uniform(0.8, 1.2))
+            backoff = min(backoff * 2, AppConfig.HUB_RECONNECT_MAX_S)
+
+    def _stream_once(self):
+        # 读超时为心跳间隔的两倍：中枢无响应时断开重连
+        timeout = (2.0, AppConfig.HUB_KEEPALIVE_S * 2)
+        with self.session.get(f"{self.url}/events", stream=True, timeout=timeout) as resp:
+            resp.raise_for_status()
+            self._resp = resp
+            self.connected = True
+            for line in resp.iter_lines(chunk_size=None):
+                if self._stop.is_set():
+                    return
+                if line.startswith(b"data: "):
+                    data = json.loads(line[6:])
+                    self.received += 1
+                    self.on_snapshot(data)
@@ -0,0 +1,63 @@
+"""
+日志模块
+统一的日志格式与限流：相同来源的同一条日志（按未格式化的消息模板区分）在限流周期内只输出一次，
+周期结束后的下一条附带被抑制的条数，避免数据源持续失败时每秒刷屏
+"""
+import logging
+import os
+import threading
+import time
+
+from .config import AppConfig
+from .metrics import REGISTRY
+
+SUPPRESSED = REGISTRY.counter(
+    "mfw_log_suppressed_total", "Log records dropped by the rate limiter", ("logger",)
+)
+
+
+class RateLimitFilter(logging.Filter):
+    """按 (logger, 级别, 消息模板) 限流的日志过滤器"""
+
+    def __init__(self, interval=None, clock=time.monotonic):
+        """
+        Args:
+            interval: 限流周期（秒），默认取 AppConfig.LOG_RATE_LIMIT_S
+            clock: 单调时钟函数
+        """
+        super().__init__()
+        self.interval = AppConfig.LOG_RATE_LIMIT_S if interval is None else interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = {}  # key -> [上次输出时间, 被抑制条数]
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.msg)
+        now = self.clock()
+        with self._lock:
+            entry = self._state.get(key)
+            if entry is not None and now - entry[0] < self.interval:
+                entry[1] += 1
+                SUPPRESSED.inc(logger=record.name)
+                return False
+            suppressed = entry[1] if entry else 0
+            self._state[key] = [now, 0]
+        if suppressed:
+            record.msg = f"{record.msg} (已抑制 {suppressed} 条相同日志)"
+        return True
+
+
+def setup_logging(level=None):
+    """
+    配置根日志：单行格式 + 限流（应用入口调用一次）
+
+    Args:
+        level: 日志级别，默认取环境变量 MFW_LOG_LEVEL，未设置时为 INFO
+    """
+    level = level or os.environ.get("MFW_LOG_LEVEL", "INFO")
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
@@ -0,0 +1,54 @@
+"""
+启动耗时分析模块
+按阶段记录启动时间点，输出逐阶段耗时明细（用于 --profile-startup）
+"""
+import time
+
+
+class StartupProfiler:
+    """启动阶段计时器：mark() 记录阶段结束时间，report() 输出明细"""
+
+    def __init__(self, enabled=True, origin=None):
+        """
+        初始化计时器
+
+        Args:
+            enabled: 未启用时 mark/report 均为空操作
+            origin: 计时起点（time.perf_counter 值），默认取创建时刻
+        """
+        self.enabled = enabled
+        self.origin = time.perf_counter() if origin is None else origin
+        self.marks = []  # [(阶段名, 时间点)]
+
+    def mark(self, phase):
+        """记录某阶段完成（同名阶段只记录第一次）"""
+        if not self.enabled or any(name == phase for name, _ in self.marks):
+            return
+        self.marks.append((phase, time.perf_counter()))
+
+    def has(self, phase):
+        return any(name == phase for name, _ in self.marks)
+
+    def total_ms(self):
+        return (self.marks[-1][1] - self.origin) * 1000 if self.marks else 0.0
+
+    def report(self, budget_ms=None):
+        """
+        生成逐阶段耗时报告
+
+        Args:
+            budget_ms: 冷启动预算（毫秒），超出时在报告末尾标注
+
+        Returns:
+            str: 报告文本
+        """
+        lines = [f"{'phase':<16}{'delta ms':>10}{'total ms':>10}"]
+        previous = self.origin
+        for name, ts in self.marks:
+            lines.append(f"{name:<16}{(ts - previous) * 1000:>10.1f}{(ts - self.origin) * 1000:>10.1f}")
+            previous = ts
+        if budget_ms is not None:
+            total = self.total_ms()
+            verdict = "OK" if total <= budget_ms else "OVER BUDGET"
+            lines.append(f"budget {budget_ms:.0f} ms: {verdict} ({total:.1f} ms)")
+        return "\n".join(lines)
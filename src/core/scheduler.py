@@ -0,0 +1,253 @@
+"""
+数据源调度模块
+数据源注册表：按各数据源插件（见 sources.py）声明的节奏维护独立的刷新间隔与有效期，
+值未变化或市场休市时自动拉长间隔，并将各源缓存结果合并为 updateUI 使用的数据字典
+"""
+import time
+
+from .config import AppConfig
+from .sources import default_sources
+
+
+class SourceState:
+    """单个数据源的调度状态"""
+
+    __slots__ = (
+        "name", "interval", "max_interval", "ttl", "current_interval",
+        "next_due", "value", "fingerprint", "fetched_at", "requests", "failed", "latency",
+    )
+
+    def __init__(self, name, interval, max_interval, ttl):
+        self.name = name
+        self.interval = interval  # 基础间隔（秒）
+        self.max_interval = max_interval  # 拉长后的上限（秒）
+        self.ttl = ttl  # 缓存值有效期（秒），过期后不再参与合并
+        self.current_interval = interval
+        self.next_due = 0.0
+        self.value = None
+        self.fingerprint = None
+        self.fetched_at = None
+        self.requests = 0  # 累计发起的抓取次数
+        self.failed = False  # 最近一次抓取失败或被熔断跳过（此时展示的是最后有效值）
+        self.latency = None  # 最近一次成功抓取的耗时（秒）；合并请求的数据源记录共享请求的耗时
+
+    def is_fresh(self, now):
+        return self.fetched_at is not None and now - self.fetched_at <= self.ttl
+
+    def is_servable(self, now):
+        """有效期内，或数据源失败时保留的最后有效值（标记为过期展示）"""
+        return self.value is not None and (self.failed or self.is_fresh(now))
+
+
+class SourceScheduler:
+    """
+    数据源注册表：包装 GoldDataFetcher 调度各数据源插件，对外提供与 fetch_all 相同的调用约定
+
+    同一时刻到期、batch 相同的数据源（如新浪各源）合并为一次请求，各请求并发执行；
+    东方财富仅在新浪缺失上金所报价时请求
+    """
+
+    def __init__(self, fetcher, schedule=None, clock=time.monotonic, sources=None):
+        """
+        初始化调度器
+
+        Args:
+            fetcher: GoldDataFetcher实例
+            schedule: 数据源 -> (基础间隔, 最大间隔, TTL)，覆盖数据源声明的节奏（默认为 AppConfig.SOURCE_SCHEDULE）
+            clock: 单调时钟函数（便于测试时注入）
+            sources: DataSource 列表，默认为 default_sources()
+        """
+        self.fetcher = fetcher
+        self.clock = clock
+        self.schedule = dict(schedule or {})
+        self.sources = {}
+        self.states = {}
+        # 通过 MFW_DISABLED_SOURCES 或 set_enabled 停用的数据源：不请求、不参与合并
+        self.disabled = set(AppConfig.DISABLED_SOURCES)
+        for source in default_sources() if sources is None else sources:
+            self.register(source)
+
+    def register(self, source):
+        """
+        注册数据源（同名数据源被替换）
+
+        Args:
+            source: DataSource 实例
+        """
+        cadence = self.schedule.get(source.name) or source.cadence()
+        self.sources[source.name] = source
+        self.states[source.name] = SourceState(source.name, *cadence)
+
+    def set_enabled(self, name, enabled):
+        """
+        启用或停用单个数据源
+
+        Args:
+            name: 数据源名
+            enabled: 是否启用；重新启用后下一轮立即抓取
+        """
+        if enabled:
+            self.disabled.discard(name)
+            self.states[name].next_due = 0.0
+        else:
+            self.disabled.add(name)
+
+    def _fetch_tasks(self, due):
+        """
+        为到期的数据源构造抓取任务：batch 相同的合并为一个请求（代码取并集），按成本从高到低排列
+
+        Returns:
+            dict: 任务名 -> 无参任务
+        """
+        groups = {}
+        for name in due:
+            source = self.sources[name]
+            groups.setdefault(source.task_name, []).append(source)
+        ordered = sorted(groups.items(), key=lambda item: -max(s.cost for s in item[1]))
+        tasks = {}
+        for task_name, members in ordered:
+            symbols = list(dict.fromkeys(sym for source in members for sym in source.symbols))
+            tasks[task_name] = members[0].task(self.fetcher, symbols)
+        return tasks
+
+    def _store(self, state, value, now):
+        """记录抓取结果，值未变化时按退避系数拉长间隔，变化时恢复基础间隔"""
+        fingerprint = self.sources[state.name].fingerprint(value)
+        if state.fingerprint is not None and fingerprint == state.fingerprint:
+            state.current_interval = min(
+                state.current_interval * AppConfig.SCHEDULE_BACKOFF, state.max_interval
+            )
+        else:
+            state.current_interval = state.interval
+        state.value = value
+        state.fingerprint = fingerprint
+        state.fetched_at = now
+        state.next_due = now + state.current_interval
+
+    def fetch_all(self, force=False):
+        """
+        刷新到期的数据源并合并出完整数据字典
+
+        Args:
+            force: 忽略刷新节奏，请求全部启用的数据源（补充源仍只在需要时请求）
+
+        Returns:
+            dict: 与 GoldDataFetcher.fetch_all 相同结构的数据字典
+        """
+        now = self.clock()
+        data = self.fetcher.new_snapshot()
+
+        try:
+            due = [name for name, state in self.states.items()
+                   if name not in self.disabled
+                   and (force or now + AppConfig.SCHEDULE_SLACK_S >= state.next_due)]
+            for name in list(due):
+                if not self.sources[name].wanted(self):
+                    # 如新浪报价完整，无需请求东方财富
+                    due.remove(name)
+                    state = self.states[name]
+                    state.next_due = now + state.interval
+
+            # 熔断中的数据源本次跳过，继续展示最后有效值
+            health = self.fetcher.health
+            allowed = {}
+            for name in list(due):
+                task = self.sources[name].task_name
+                if task not in allowed:
+                    allowed[task] = health.allow(task)
+                if not allowed[task]:
+                    due.remove(name)
+                    state = self.states[name]
+                    state.failed = True
+                    state.next_due = now + state.interval
+
+            tasks = self._fetch_tasks(due)
+            results, errors = self.fetcher.engine.run(tasks) if tasks else ({}, {})
+            if errors:
+                data["error"] = "; ".join(f"{name}: {err}" for name, err in errors.items())
+            self.fetcher.record_outcomes(tasks, results, errors)
+            durations = self.fetcher.engine.durations
+
+            for name in due:
+                source = self.sources[name]
+                state = self.states[name]
+                state.requests += 1
+                result = results.get(source.task_name)
+                value = source.select(result) if result else None
+                if value:
+                    self._store(state, value, now)
+                    state.failed = False
+                    state.latency = durations.get(source.task_name)
+                else:
+                    # 失败或无数据：按基础间隔重试
+                    state.failed = True
+                    state.current_interval = state.interval
+                    state.next_due = now + state.interval
+
+            self._merge(data, now)
+        except Exception as e:
+            data["error"] = str(e)
+
+        return data
+
+    def _merge(self, data, now):
+        """将仍在有效期内的缓存值合并为数据字典（失败源保留最后有效值并标记过期行），再由各数据源调整调度状态"""
+        fresh = {
+            name: state.value for name, state in self.states.items()
+            if name not in self.disabled and state.is_servable(now)
+        }
+        parts = {"quotes": {}, "crypto": {}, "dom_spot": {}}
+        for name, value in fresh.items():
+            self.sources[name].contribute(value, parts)
+        self.fetcher.build_snapshot(data, parts["quotes"], parts["crypto"], parts["dom_spot"])
+
+        stale = {}
+        for name, source in self.sources.items():
+            failed = self.states[name].failed and name not in self.disabled
+            if failed and source.covered_by:
+                # 如新浪缺失上金所报价时，东方财富补充成功的国内价格不算过期
+                cover = self.states.get(source.covered_by)
+                failed = not (cover and cover.is_fresh(now) and not cover.failed)
+            for row in source.rows:
+                stale[row] = failed
+        data["stale_rows"] = stale
+
+        for name in fresh:
+            self.sources[name].after_merge(self.states[name], data)
+
+    def run_source(self, name):
+        """
+        立即单独抓取一个数据源（不与其他数据源合并，不改变调度状态），用于诊断与计时
+
+        Args:
+            name: 数据源名
+
+        Returns:
+            tuple: (值, 耗时秒数)；失败时值为None，超时或出错时耗时为None
+        """
+        source = self.sources[name]
+        task_name = f"probe.{name}"
+        results, _ = self.fetcher.engine.run({task_name: source.task(self.fetcher, list(source.symbols))})
+        result = results.get(task_name)
+        return (source.select(result) if result else None), self.fetcher.engine.durations.get(task_name)
+
+    def stats(self):
+        """
+        获取各数据源调度统计
+
+        Returns:
+            dict: 数据源 -> {"interval": 当前间隔, "requests": 累计抓取次数, "failed": 是否在展示过期值,
+                  "latency_ms": 最近一次成功抓取耗时, "batch": 合并请求键, "cost": 单次请求数, "enabled": 是否启用}
+        """
+        return {
+            name: {
+                "interval": state.current_interval,
+                "requests": state.requests,
+                "failed": state.failed,
+                "latency_ms": None if state.latency is None else round(state.latency * 1000, 1),
+                "batch": self.sources[name].batch,
+                "cost": self.sources[name].cost,
+                "enabled": name not in self.disabled,
+            }
+            for name, state in self.states.items()
+        }
@@ -0,0 +1,96 @@
+"""
+新浪行情解析模块
+对 `var hq_str_<代码>="f0,f1,...";` 格式的响应做单遍扫描：直接在字节上匹配，
+只转换用到的价格字段，名称等中文字段在需要时才解码，代码数量增加不会带来逐代码的重复扫描
+"""
+import re
+
+_QUOTE_RE = re.compile(rb'var hq_str_([A-Za-z0-9_]+)="([^"]*)"')
+
+# 代码前缀 -> (最新价字段, 昨收字段, 昨收为空时的后备字段)
+# hf_ 国际期货/现货：[最新价, 昨收, ..., 7:昨结]
+# fx_ 外汇：[时间, 最新价, ...]
+# SGE_ 上金所：[代码, 名称, 简拼, 最新价, 昨收, ...]
+LAYOUTS = {
+    "hf_": (0, 1, 7),
+    "fx_": (1, None, None),
+    "SGE_": (3, 4, None),
+}
+DEFAULT_LAYOUT = (0, 1, None)
+
+
+def _to_float(raw):
+    try:
+        return float(raw)
+    except ValueError:  # 空字段或 "-"
+        return 0.0
+
+
+def layout_for(symbol):
+    for prefix, layout in LAYOUTS.items():
+        if symbol.startswith(prefix):
+            return layout
+    return DEFAULT_LAYOUT
+
+
+class SinaQuote:
+    """单个代码的行情记录：价格字段已转换为浮点数，原始字段按需解码"""
+
+    __slots__ = ("symbol", "price", "prev_close", "has_price", "raw")
+
+    def __init__(self, symbol, price=0.0, prev_close=0.0, has_price=True, raw=b""):
+        self.symbol = symbol
+        self.price = price  # 最新价（外汇为汇率）
+        self.prev_close = prev_close  # 昨收，缺失时为0
+        self.has_price = has_price  # 响应中是否包含最新价字段（上金所休市时可能只返回部分字段）
+        self.raw = raw  # 引号内的原始字节
+
+    @classmethod
+    def from_payload(cls, symbol, payload):
+        """由引号内的原始字节构造记录"""
+        fields = payload.split(b",")
+        price_idx, prev_idx, fallback_idx = layout_for(symbol)
+        n = len(fields)
+        price = _to_float(fields[price_idx]) if n > price_idx else 0.0
+        prev_close = _to_float(fields[prev_idx]) if prev_idx is not None and n > prev_idx else 0.0
+        if not prev_close and fallback_idx is not None and n > fallback_idx:
+            prev_close = _to_float(fields[fallback_idx])
+        return cls(symbol, price, prev_close, n > price_idx, payload)
+
+    @property
+    def fields(self):
+        """全部字段（解码为字符串），仅在需要名称/时间等字段时使用"""
+        return self.raw.decode("gb18030", errors="ignore").split(",")
+
+    def key(self):
+        """用于判断"值是否变化"的特征（不含时间戳）"""
+        return (self.price, self.prev_close, self.has_price)
+
+    def __repr__(self):
+        return f"SinaQuote({self.symbol!r}, price={self.price}, prev_close={self.prev_close})"
+
+
+def parse_quotes(content, symbols=None):
+    """
+    单遍解析新浪响应
+
+    Args:
+        content: 响应体（bytes；str 会按 gb18030 编码后处理）
+        symbols: 只保留这些代码，默认保留全部
+
+    Returns:
+        dict: 代码 -> SinaQuote；空报价（未知代码）不包含在内
+    """
+    if isinstance(content, str):
+        content = content.encode("gb18030")
+    wanted = set(symbols) if symbols is not None else None
+    quotes = {}
+    for m in _QUOTE_RE.finditer(content):
+        payload = m.group(2)
+        if not payload:
+            continue
+        symbol = m.group(1).decode("ascii")
+        if wanted is not None and symbol not in wanted:
+            continue
+        quotes[symbol] = SinaQuote.from_payload(symbol, payload)
+    return quotes
@@ -0,0 +1,101 @@
+"""
+快照缓存模块
+将最近一次有效快照与国内外溢价写入小型JSON文件，启动时读取用于首屏秒开与休市推演
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from .config import AppConfig
+
+log = logging.getLogger(__name__)
+
+
+def has_prices(data):
+    """快照是否包含有效价格（全部抓取失败的快照不写入缓存）"""
+    return bool(
+        (data.get("gold") or {}).get("intl")
+        or (data.get("silver") or {}).get("intl")
+        or data.get("crypto")
+    )
+
+
+class SnapshotCache:
+    """最近快照缓存，作为快照接收者挂在 FetchWorker 上"""
+
+    def __init__(self, fetcher=None, path=None, min_interval=None):
+        """
+        初始化缓存
+
+        Args:
+            fetcher: GoldDataFetcher实例，用于读取/恢复 last_premium_*
+            path: 缓存文件路径，默认取 AppConfig.get_snapshot_cache_path()
+            min_interval: 两次写盘的最小间隔（秒）
+        """
+        self.fetcher = fetcher
+        self.path = path or AppConfig.get_snapshot_cache_path()
+        self.min_interval = (
+            AppConfig.SNAPSHOT_CACHE_MIN_INTERVAL_S if min_interval is None else min_interval
+        )
+        self._lock = threading.Lock()
+        self._latest = None
+        self._dirty = False
+        self._last_write = 0.0
+
+    def load(self):
+        """
+        读取缓存并恢复溢价到 fetcher
+
+        Returns:
+            dict | None: 缓存的快照，不存在或损坏时返回None
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        premium = cached.get("premium") or {}
+        if self.fetcher is not None:
+            if premium.get("gold") is not None:
+                self.fetcher.last_premium_gold = float(premium["gold"])
+            if premium.get("silver") is not None:
+                self.fetcher.last_premium_silver = float(premium["silver"])
+        snapshot = cached.get("snapshot")
+        return snapshot if isinstance(snapshot, dict) else None
+
+    def record(self, data):
+        """记录最新快照，距上次写盘超过最小间隔时写入文件"""
+        if not has_prices(data):
+            return
+        with self._lock:
+            self._latest = data
+            self._dirty = True
+            if time.monotonic() - self._last_write < self.min_interval:
+                return
+        self.flush()
+
+    def flush(self):
+        """立即将最新快照写入文件（窗口关闭时调用）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "snapshot": self._latest,
+                "premium": {
+                    "gold": getattr(self.fetcher, "last_premium_gold", None),
+                    "silver": getattr(self.fetcher, "last_premium_silver", None),
+                },
+                "saved_at": time.time(),
+            }
+            self._dirty = False
+            self._last_write = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)  # 原子替换，避免写到一半被读取
+        except OSError as e:
+            log.warning("快照缓存写入失败: %s", e)
@@ -0,0 +1,119 @@
+"""
+快照差分模块
+记录上一次已渲染的数据，按显示精度比较新快照，仅输出发生变化的字段（补丁）
+"""
+
+# 显示精度：与页面 toFixed 保持一致，精度以下的抖动不会产生补丁
+PRICE_PRECISION = 2
+CHANGE_PRECISION = 2
+EXCHANGE_RATE_PRECISION = 4
+
+_MISSING = object()
+
+
+def round_display(value, digits):
+    """按显示精度取整（无效值视为0），用于判断两个值在界面上是否相同"""
+    try:
+        return round(float(value or 0), digits)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def summary_text(data, crypto_limit=2):
+    """
+    快照的单行摘要（窗口隐藏时作为托盘提示）
+
+    Args:
+        data: 数据字典
+        crypto_limit: 最多包含的币种数量
+
+    Returns:
+        str: 如 "黄金 615.50 (+0.52%) | 白银 7.52 (+0.43%) | BTC 98000.00"；无有效价格时为空字符串
+    """
+    parts = []
+    for metal, label in (("gold", "黄金"), ("silver", "白银")):
+        section = data.get(metal) or {}
+        price = section.get("dom") or section.get("intl")
+        if price:
+            change = section.get("dom_change" if section.get("dom") else "intl_change") or 0
+            parts.append(f"{label} {round_display(price, PRICE_PRECISION):.{PRICE_PRECISION}f} "
+                         f"({round_display(change, CHANGE_PRECISION):+.{CHANGE_PRECISION}f}%)")
+    for symbol, info in list((data.get("crypto") or {}).items())[:crypto_limit]:
+        if info and info.get("price"):
+            parts.append(f"{symbol} {round_display(info['price'], PRICE_PRECISION):.{PRICE_PRECISION}f}")
+    return " | ".join(parts)
+
+
+class SnapshotDiffer:
+    """计算数据字典相对上次渲染结果的补丁，补丁结构与数据字典一致但只含变化字段"""
+
+    def __init__(self):
+        self.last = {}  # 已渲染的扁平化显示值：路径元组 -> 值
+
+    def reset(self):
+        """清空已渲染记录（页面重新加载后调用，下一次将输出完整快照）"""
+        self.last = {}
+
+    @staticmethod
+    def flatten(data):
+        """
+        将数据字典转换为按显示精度取整的扁平值
+
+        Returns:
+            dict: 路径元组 -> 显示值，如 ("gold", "intl") -> 2400.12
+        """
+        flat = {}
+        for metal in ("gold", "silver"):
+            section = data.get(metal)
+            if not section:
+                continue
+            for key in ("intl", "dom"):
+                if key in section:
+                    flat[(metal, key)] = round_display(section[key], PRICE_PRECISION)
+                change_key = key + "_change"
+                if change_key in section:
+                    flat[(metal, change_key)] = round_display(section[change_key], CHANGE_PRECISION)
+
+        for symbol, info in (data.get("crypto") or {}).items():
+            if not info:
+                continue
+            flat[("crypto", symbol, "price")] = round_display(info.get("price"), PRICE_PRECISION)
+            flat[("crypto", symbol, "change")] = round_display(info.get("change"), CHANGE_PRECISION)
+
+        if data.get("exchange_rate"):
+            flat[("exchange_rate",)] = round_display(data["exchange_rate"], EXCHANGE_RATE_PRECISION)
+
+        for metal, status in (data.get("market_status") or {}).items():
+            flat[("market_status", metal)] = status
+
+        for row, stale in (data.get("stale_rows") or {}).items():
+            flat[("stale_rows", row)] = bool(stale)
+
+        if "error" in data:
+            flat[("error",)] = data["error"]
+        return flat
+
+    def diff(self, data):
+        """
+        计算补丁并将其记为已渲染
+
+        Args:
+            data: 抓取到的数据字典
+
+        Returns:
+            dict | None: 只含变化字段的嵌套字典；没有变化时返回None
+        """
+        flat = self.flatten(data)
+        patch = {}
+        for path, value in flat.items():
+            if self.last.get(path, _MISSING) == value:
+                continue
+            node = patch
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = value
+        if not patch:
+            return None
+        self.last.update(flat)
+        return patch
+
@@ -0,0 +1,172 @@
+"""
+数据源插件模块
+每个数据源声明行情代码、刷新节奏、请求成本与页面上受其影响的行，由 SourceScheduler（数据源注册表）统一调度：
+batch 相同的到期数据源合并为一次请求，各请求并发执行，耗时按数据源分别记录。
+新增数据源只需实现 DataSource 子类并注册到 SourceScheduler，无需修改 fetch_all
+"""
+from .config import AppConfig
+from .crypto_source import OkxBatchCryptoSource
+from .snapshot_diff import CHANGE_PRECISION, PRICE_PRECISION, round_display
+
+
+class DataSource:
+    """数据源插件基类"""
+
+    name = None  # 数据源名（SOURCE_SCHEDULE、统计与 MFW_DISABLED_SOURCES 使用的键）
+    symbols = ()  # 声明的行情代码，合并请求时取并集
+    batch = None  # 合并请求的键：batch 相同的到期数据源合并为一次请求并共用熔断状态；None 表示独立请求
+    cost = 1  # 单次抓取发起的上游请求数，同一轮中成本高的任务先提交
+    rows = ()  # 页面上受其影响的行（stale_rows 的键）
+    covered_by = None  # 本数据源失败时，若该数据源有效则其行不标记为过期
+
+    @property
+    def task_name(self):
+        """抓取任务名（引擎、熔断与延迟指标使用的键）"""
+        return self.batch or self.name
+
+    def cadence(self):
+        """
+        刷新节奏
+
+        Returns:
+            tuple: (基础间隔, 最大间隔, TTL)，单位秒
+        """
+        return AppConfig.SOURCE_SCHEDULE[self.name]
+
+    def task(self, fetcher, symbols):
+        """
+        构造抓取任务
+
+        Args:
+            fetcher: GoldDataFetcher实例（持有会话、熔断状态与抓取引擎）
+            symbols: 行情代码；合并请求时为同批到期数据源代码的并集
+
+        Returns:
+            callable: 无参任务，交给 fetcher.engine.run 执行
+        """
+        raise NotImplementedError
+
+    def select(self, result):
+        """从（可能是合并的）请求结果中取出本数据源的值，无数据时返回空值"""
+        return result
+
+    def fingerprint(self, value):
+        """用于判断"值是否变化"的特征，未变化时拉长刷新间隔"""
+        return value
+
+    def wanted(self, registry):
+        """本轮到期时是否确实需要请求（如仅在主数据源缺失时才请求的补充源）"""
+        return True
+
+    def contribute(self, value, parts):
+        """
+        将有效值并入组装材料
+
+        Args:
+            value: 本数据源最近的有效值
+            parts: {"quotes": 新浪代码 -> SinaQuote, "crypto": 币种 -> 报价, "dom_spot": 国内现货补充报价}
+        """
+        raise NotImplementedError
+
+    def after_merge(self, state, data):
+        """数据字典组装完成后调用，可按结果调整本数据源的调度状态"""
+
+
+class SinaSource(DataSource):
+    """新浪行情：各数据源按变化频率拆分代码，同一轮到期的合并为一次请求"""
+
+    batch = "sina"
+
+    def __init__(self, name, symbols, rows=()):
+        self.name = name
+        self.symbols = tuple(symbols)
+        self.rows = tuple(rows)
+
+    def task(self, fetcher, symbols):
+        return fetcher.task("fetch_sina", list(symbols))
+
+    def select(self, result):
+        result = result or {}
+        return {sym: result[sym] for sym in self.symbols if sym in result}
+
+    def fingerprint(self, value):
+        # 新浪字段含时间戳，仅比较价格相关字段
+        return tuple((sym, quote.key()) for sym, quote in sorted(value.items()))
+
+    def contribute(self, value, parts):
+        parts["quotes"].update(value)
+
+
+class SgeSource(SinaSource):
+    """新浪上金所现货：缺失时由东方财富补充，国内休市时使用最大间隔"""
+
+    covered_by = "eastmoney"
+
+    def __init__(self):
+        super().__init__("sge", ("SGE_AUTD", "SGE_AGTD"), ("gold.dom", "silver.dom"))
+
+    def after_merge(self, state, data):
+        status = data["market_status"]
+        if status["gold"] == "closed" and status["silver"] == "closed":
+            # 国内休市：上金所报价不会变化，直接使用最大间隔
+            state.current_interval = state.max_interval
+            state.next_due = max(state.next_due, state.fetched_at + state.max_interval)
+
+
+class EastmoneySgeSource(DataSource):
+    """东方财富上金所现货：仅在新浪缺失上金所报价时请求"""
+
+    name = "eastmoney"
+    cost = 2  # 黄金、白银各一次请求
+
+    def task(self, fetcher, symbols):
+        return fetcher.task("fetch_sge_fallback")
+
+    def wanted(self, registry):
+        sge = registry.states.get("sge")
+        quotes = sge.value if sge and sge.value else {}
+        return any(sym not in quotes or not quotes[sym].has_price for sym in registry.sources["sge"].symbols)
+
+    def contribute(self, value, parts):
+        parts["dom_spot"].update(value)
+
+
+class OkxCryptoSource(DataSource):
+    """OKX加密货币：全部关注币种经批量行情接口（或行情流）一次获取"""
+
+    name = "crypto"
+    cost = len(OkxBatchCryptoSource.INST_TYPES)  # 现货 + 合约
+    rows = ("crypto",)
+
+    def __init__(self, symbols=None):
+        self.symbols = tuple(symbols or AppConfig.CRYPTO_SYMBOLS)
+
+    def task(self, fetcher, symbols):
+        return fetcher.task("fetch_crypto")
+
+    def fingerprint(self, value):
+        # 按显示精度比较：精度以下的抖动不算变化，价格在屏幕上不变时拉长刷新间隔
+        return tuple(
+            (sym, round_display(info.get("price"), PRICE_PRECISION),
+             round_display(info.get("change"), CHANGE_PRECISION))
+            for sym, info in sorted(value.items()) if info
+        )
+
+    def contribute(self, value, parts):
+        parts["crypto"].update(value)
+
+
+def default_sources():
+    """
+    内置数据源（注册顺序即新浪合并请求中的代码顺序）
+
+    Returns:
+        list: DataSource 实例列表
+    """
+    return [
+        OkxCryptoSource(),
+        SinaSource("intl_metals", ("hf_XAU", "hf_SI"), ("gold.intl", "silver.intl")),
+        SgeSource(),
+        SinaSource("fx", ("fx_susdcny",), ("exchange_rate",)),
+        EastmoneySgeSource(),
+    ]
@@ -0,0 +1,284 @@
+"""
+本地行情存储模块
+将每次快照写入SQLite（WAL模式），由后台线程批量插入；
+支持按品种与时间范围查询、过期逐笔压缩为1分钟K线，以及启动时快速加载最近数小时数据
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .config import AppConfig
+from .history import snapshot_instruments
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instruments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS ticks (
+    inst_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (inst_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS bars (
+    inst_id INTEGER NOT NULL,
+    resolution INTEGER NOT NULL,
+    start REAL NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    PRIMARY KEY (inst_id, resolution, start)
+) WITHOUT ROWID;
+"""
+
+# 将早于截止时间的逐笔聚合为1分钟K线（开/收取组内最早/最晚一笔）
+_ROLLUP_SQL = """
+INSERT OR REPLACE INTO bars (inst_id, resolution, start, open, high, low, close)
+SELECT g.inst_id, 60, g.bucket,
+       (SELECT value FROM ticks t WHERE t.inst_id = g.inst_id AND t.ts = g.first_ts),
+       g.high, g.low,
+       (SELECT value FROM ticks t WHERE t.inst_id = g.inst_id AND t.ts = g.last_ts)
+FROM (
+    SELECT inst_id, CAST(ts / 60 AS INTEGER) * 60 AS bucket,
+           MIN(ts) AS first_ts, MAX(ts) AS last_ts, MAX(value) AS high, MIN(value) AS low
+    FROM ticks WHERE ts < ?
+    GROUP BY inst_id, bucket
+) g
+"""
+
+_STOP = object()
+
+
+class TickStore:
+    """SQLite行情存储：record() 只入队不阻塞，写入、压缩均在后台线程完成"""
+
+    def __init__(self, path=None, batch_size=None, flush_interval=None, autostart=True):
+        """
+        初始化存储
+
+        Args:
+            path: 数据库文件路径，默认取 AppConfig.get_tick_db_path()
+            batch_size: 累积多少行触发一次批量写入
+            flush_interval: 最长多久写入一次（秒）
+            autostart: 是否立即启动后台写入线程
+        """
+        self.path = path or AppConfig.get_tick_db_path()
+        self.batch_size = batch_size or AppConfig.TICK_STORE_BATCH_SIZE
+        self.flush_interval = flush_interval or AppConfig.TICK_STORE_FLUSH_INTERVAL_S
+        self.dropped = 0  # 队列已满被丢弃的快照数
+        self.written = 0  # 已写入的逐笔行数
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._queue = queue.Queue(maxsize=AppConfig.TICK_STORE_QUEUE_MAX)
+        self._inst_ids = {}
+        self._inst_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._read_conn = self._connect()
+        self._read_conn.executescript(_SCHEMA)
+        self._load_instruments(self._read_conn)
+        self._thread = threading.Thread(target=self._writer_loop, name="tick-store", daemon=True)
+        if autostart:
+            self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _load_instruments(self, conn):
+        with self._inst_lock:
+            self._inst_ids.update({name: i for i, name in conn.execute("SELECT id, name FROM instruments")})
+
+    # ---------- 写入（任意线程调用，不阻塞） ----------
+
+    def record(self, data, ts=None):
+        """
+        将一次快照加入写入队列
+
+        Args:
+            data: fetch_all 返回的数据字典
+            ts: 时间戳（秒），默认取快照的 timestamp 字段或当前时间
+        """
+        ts = ts or data.get("timestamp") or time.time()
+        self.record_rows([(name, ts, value) for name, value in snapshot_instruments(data)])
+
+    def record_rows(self, rows, block=False):
+        """
+        将逐笔行加入写入队列，队列已满时丢弃并计数
+
+        Args:
+            rows: [(品种名, 时间戳, 价格), ...]
+            block: 队列已满时是否等待（仅用于批量导入/基准测试，界面与抓取线程不应阻塞）
+        """
+        if not rows:
+            return
+        try:
+            self._queue.put(rows, block=block)
+        except queue.Full:
+            self.dropped += 1
+
+    # ---------- 后台写入线程 ----------
+
+    def _inst_id(self, conn, name):
+        inst_id = self._inst_ids.get(name)
+        if inst_id is None:
+            conn.execute("INSERT OR IGNORE INTO instruments (name) VALUES (?)", (name,))
+            inst_id = conn.execute("SELECT id FROM instruments WHERE name = ?", (name,)).fetchone()[0]
+            with self._inst_lock:
+                self._inst_ids[name] = inst_id
+        return inst_id
+
+    def _flush(self, conn, rows):
+        if not rows:
+            return
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ticks (inst_id, ts, value) VALUES (?, ?, ?)",
+                [(self._inst_id(conn, name), ts, value) for name, ts, value in rows],
+            )
+            conn.execute("COMMIT")
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            log.warning("行情存储写入失败: %s", e)
+
+    def _writer_loop(self):
+        conn = self._connect()
+        # 启动时先压缩一次：运行时间短于压缩周期的会话（频繁重启）也能清理过期逐笔
+        self.compact(conn=conn)
+        pending = []
+        last_flush = time.monotonic()
+        last_compact = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(conn, pending)
+                conn.close()
+                return
+            if item:
+                pending.extend(item)
+
+            now = time.monotonic()
+            if len(pending) >= self.batch_size or now - last_flush >= self.flush_interval:
+                self._flush(conn, pending)
+                pending = []
+                last_flush = now
+            if now - last_compact >= AppConfig.TICK_STORE_COMPACT_INTERVAL_S:
+                self.compact(conn=conn)
+                last_compact = now
+
+    def compact(self, now=None, conn=None):
+        """
+        压缩：过期逐笔聚合为1分钟K线后删除，并清理超出保留期的K线
+
+        Args:
+            now: 当前时间（秒），默认取系统时间
+            conn: 使用的连接，默认使用读连接（加锁）
+        """
+        now = time.time() if now is None else now
+        # 截止时间按分钟对齐，避免把同一分钟拆成两根K线
+        cutoff = (now - AppConfig.TICK_RETENTION_S) // 60 * 60
+        bar_cutoff = now - AppConfig.BAR_RETENTION_S
+
+        def run(c):
+            c.execute("BEGIN")
+            try:
+                c.execute(_ROLLUP_SQL, (cutoff,))
+                c.execute("DELETE FROM ticks WHERE ts < ?", (cutoff,))
+                c.execute("DELETE FROM bars WHERE start < ?", (bar_cutoff,))
+                c.execute("COMMIT")
+            except sqlite3.Error as e:
+                c.execute("ROLLBACK")
+                log.warning("行情存储压缩失败: %s", e)
+
+        if conn is not None:
+            run(conn)
+        else:
+            with self._read_lock:
+                run(self._read_conn)
+
+    # ---------- 查询（任意线程调用） ----------
+
+    def query(self, instrument, start, end):
+        """
+        按品种与时间范围查询逐笔
+
+        Returns:
+            list: [(时间戳, 价格), ...]（按时间升序）
+        """
+        inst_id = self._inst_ids.get(instrument)
+        if inst_id is None:
+            return []
+        with self._read_lock:
+            return self._read_conn.execute(
+                "SELECT ts, value FROM ticks WHERE inst_id = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (inst_id, start, end),
+            ).fetchall()
+
+    def query_bars(self, instrument, start, end, resolution=60):
+        """
+        按品种与时间范围查询压缩后的K线
+
+        Returns:
+            list: [(开始时间, 开, 高, 低, 收), ...]（按时间升序）
+        """
+        inst_id = self._inst_ids.get(instrument)
+        if inst_id is None:
+            return []
+        with self._read_lock:
+            return self._read_conn.execute(
+                "SELECT start, open, high, low, close FROM bars "
+                "WHERE inst_id = ? AND resolution = ? AND start >= ? AND start < ? ORDER BY start",
+                (inst_id, resolution, start, end),
+            ).fetchall()
+
+    def load_recent(self, hours=None, now=None):
+        """
+        加载最近若干小时的逐笔（启动时预热内存历史）
+
+        Args:
+            hours: 小时数，默认取 AppConfig.TICK_STORE_PRELOAD_HOURS
+            now: 当前时间（秒），默认取系统时间
+
+        Returns:
+            dict: 品种名 -> [(时间戳, 价格), ...]（按时间升序）
+        """
+        hours = AppConfig.TICK_STORE_PRELOAD_HOURS if hours is None else hours
+        now = time.time() if now is None else now
+        since = now - hours * 3600
+        with self._inst_lock:
+            names = dict(self._inst_ids)
+        result = {}
+        with self._read_lock:
+            for name, inst_id in names.items():
+                rows = self._read_conn.execute(
+                    "SELECT ts, value FROM ticks WHERE inst_id = ? AND ts >= ? ORDER BY ts",
+                    (inst_id, since),
+                ).fetchall()
+                if rows:
+                    result[name] = rows
+        return result
+
+    def close(self):
+        """写入队列中剩余数据并关闭数据库"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        with self._read_lock:
+            self._read_conn.close()
@@ -0,0 +1,78 @@
+"""
+本地行情中枢 - 无界面入口（不依赖 PySide6）
+只运行一个抓取循环，经 127.0.0.1 的 HTTP/SSE 发布快照；窗口设置 MFW_HUB_URL 后作为客户端订阅，
+多个窗口与脚本共用一次上游轮询。中枢负责写入本地行情存储与最近快照缓存
+
+用法：
+    python -m src.hub [--port 8760]
+    MFW_HUB_URL=http://127.0.0.1:8760 python -m src.main
+    curl -N http://127.0.0.1:8760/events
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from .core.config import AppConfig
+from .core.data_fetcher import GoldDataFetcher
+from .core.hub import HubServer, QuoteHub
+from .core.logs import setup_logging
+from .core.metrics import install_dump_signal
+from .core.scheduler import SourceScheduler
+from .core.snapshot_cache import SnapshotCache
+from .core.tick_store import TickStore
+
+log = logging.getLogger(__name__)
+
+
+def _open_tick_store():
+    if not AppConfig.TICK_STORE_ENABLED:
+        return None
+    try:
+        return TickStore()
+    except Exception as e:
+        log.warning("本地行情存储不可用: %s", e)
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地行情中枢")
+    parser.add_argument("--port", type=int, default=AppConfig.HUB_PORT, help="监听端口（仅 127.0.0.1）")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    install_dump_signal()
+
+    fetcher = GoldDataFetcher()
+    snapshot_cache = SnapshotCache(fetcher)
+    snapshot_cache.load()  # 恢复休市推演用的溢价
+    tick_store = _open_tick_store()
+    sinks = [snapshot_cache] + ([tick_store] if tick_store else [])
+
+    hub = QuoteHub(SourceScheduler(fetcher), sinks, fetcher=fetcher).start()
+    try:
+        server = HubServer(hub, args.port).start()
+    except OSError as e:
+        log.error("中枢端口 %d 不可用: %s", args.port, e)
+        hub.stop()
+        fetcher.close()
+        return 1
+    log.info("行情中枢: %s/events", server.url)
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    while not stop.wait(1.0):
+        pass
+
+    hub.stop()
+    server.stop()
+    fetcher.close()
+    snapshot_cache.flush()
+    if tick_store is not None:
+        tick_store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
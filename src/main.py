@@ -1,38 +1,119 @@
 """
 市场行情浮动窗口应用 - 主入口
 显示实时黄金、白银和加密货币价格
+
+启动参数：
+    --profile-startup  输出逐阶段启动耗时（import / QApplication / window / page load / first data）后退出
+    --native           使用原生渲染（QPainter 绘制，不加载 QtWebEngine）
+
+环境变量：
+    MFW_METRICS_PORT   在 127.0.0.1 上提供 /metrics 指标端点（Prometheus文本格式）
+    MFW_LOG_LEVEL      日志级别，默认 INFO
+    MFW_RENDERER       渲染方式：web（默认）或 native
 """
+import logging
 import sys
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon
+import threading
+import time
+
+_START = time.perf_counter()
+
+from .core.config import AppConfig  # noqa: E402
+from .core.logs import setup_logging  # noqa: E402
+from .core.metrics import MetricsServer, install_dump_signal  # noqa: E402
+from .core.profiling import StartupProfiler  # noqa: E402
+
+log = logging.getLogger(__name__)
+
 
-from .core.config import AppConfig
-from .ui.window import GoldWindow
-from .ui.tray import TrayManager
+def _preload_network_stack():
+    """后台预加载抓取模块（requests 等），与主线程导入 Qt 并行"""
+    try:
+        from .core import data_fetcher  # noqa: F401
+    except Exception as e:
+        log.warning("预加载抓取模块失败: %s", e)
 
 
-def main():
+def main(argv=None):
     """应用主函数"""
+    argv = sys.argv if argv is None else argv
+    profiler = StartupProfiler(enabled="--profile-startup" in argv, origin=_START)
+    native = "--native" in argv or AppConfig.RENDERER == "native"
+    setup_logging()
+    _start_metrics()
+
+    # 抓取模块在后台线程导入，主线程同时加载Qt
+    threading.Thread(target=_preload_network_stack, name="preload", daemon=True).start()
+
+    from PySide6.QtCore import Qt, QCoreApplication
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QIcon
+    profiler.mark("import")
+
+    if not native:
+        # 允许在创建QApplication之后再导入QtWebEngine
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+
     # 创建应用实例
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
     app.setQuitOnLastWindowClosed(False)  # 即使窗口关闭也不退出进程
-    
+
     # 设置应用图标
     icon_path = AppConfig.get_icon_path()
     icon = QIcon(icon_path)
     app.setWindowIcon(icon)
-    
-    # 创建主窗口
-    window = GoldWindow()
+    profiler.mark("QApplication")
+
+    # 创建主窗口（此时才加载WebEngine与界面模块；首次抓取与页面加载并行进行）
+    if native:
+        from .ui.native_window import NativeWindow as Window
+    else:
+        from .ui.window import GoldWindow as Window
+    from .ui.tray import TrayManager
+    window = Window()
     window.show()
-    
+
     # 创建系统托盘
     tray_manager = TrayManager(icon_path, window)
     tray_manager.show()
-    
+    profiler.mark("window")
+
+    if profiler.enabled:
+        _attach_startup_profiler(profiler, app, window)
+
     # 启动应用循环
     sys.exit(app.exec())
 
 
+def _start_metrics():
+    """启动指标端点（配置了端口时），并注册 SIGUSR1 指标转储"""
+    install_dump_signal()
+    if AppConfig.METRICS_PORT:
+        try:
+            server = MetricsServer(AppConfig.METRICS_PORT).start()
+            log.info("指标端点: http://127.0.0.1:%d/metrics", server.port)
+        except OSError as e:
+            log.warning("指标端点启动失败: %s", e)
+
+
+def _attach_startup_profiler(profiler, app, window):
+    """页面加载完成（原生渲染时为面板就绪）与首个实时数据到达时记录阶段，二者都完成后输出报告并退出"""
+    def finish():
+        if profiler.has("page load") and profiler.has("first data"):
+            print(profiler.report(AppConfig.STARTUP_BUDGET_MS))
+            app.exit(0 if profiler.total_ms() <= AppConfig.STARTUP_BUDGET_MS else 1)
+
+    def on_page_loaded(_ok):
+        profiler.mark("page load")
+        finish()
+
+    def on_data(_data):
+        profiler.mark("first data")
+        finish()
+
+    window.view_ready.connect(on_page_loaded)
+    window.first_data_received.connect(on_data)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,457 @@
+"""
+主窗口基类模块
+两种渲染方式（WebEngine页面 / 原生QPainter绘制）共用的窗口逻辑：数据抓取、差分、价格提醒、
+后台模式、置顶与拖动；渲染相关的部分由子类实现
+"""
+import logging
+import platform
+import threading
+import time
+from PySide6.QtCore import Qt, QTimer, QThread, QEvent, Signal
+from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtGui import QMouseEvent
+
+from ..core.alerts import AlertEngine, load_rules
+from ..core.config import AppConfig
+from ..core.data_fetcher import GoldDataFetcher
+from ..core.scheduler import SourceScheduler
+from ..core.snapshot_diff import SnapshotDiffer
+from ..core.history import TickHistory
+from ..core.tick_store import TickStore
+from ..core.snapshot_cache import SnapshotCache
+from ..core.metrics import REGISTRY
+from ..workers.fetch_worker import FetchWorker
+from ..workers.hub_worker import HubWorker
+from ..workers.process_worker import ProcessWorker
+from .menu import MenuManager
+
+log = logging.getLogger(__name__)
+
+RENDER_SECONDS = REGISTRY.histogram("mfw_render_seconds", "handle_data diff + render dispatch time")
+RENDER_PATCHES = REGISTRY.counter("mfw_render_total", "handle_data calls by outcome", ("kind",))
+
+
+class MarketWindow(QMainWindow):
+    """市场行情浮动窗口基类，子类实现 _setup_view 与 render_* / toggle_section / show_pin_state"""
+    
+    # 信号：首个实时快照到达（启动耗时分析使用）
+    first_data_received = Signal(dict)
+    # 信号：渲染视图就绪（页面加载完成或原生视图首次显示），参数为是否成功
+    view_ready = Signal(bool)
+    # 信号：窗口处于后台（隐藏或最小化）期间到达的快照，托盘据此更新提示文字
+    background_data = Signal(dict)
+    # 信号：价格提醒触发，参数为 [(AlertRule, 值), ...]，托盘据此显示通知
+    alerts_fired = Signal(list)
+    # 信号：本地存储中的最近行情已在后台载入内存历史（刷新走势线）
+    history_loaded = Signal()
+    
+    def __init__(self):
+        """初始化主窗口"""
+        super().__init__()
+        
+        # 初始化状态变量
+        # 客户端模式（设置了 MFW_HUB_URL）：快照由本地行情中枢推送；
+        # 独立抓取进程模式（MFW_FETCH_PROCESS=1）：快照由子进程写入共享内存。
+        # 两种模式下抓取都不在本进程中进行，本窗口不持有 fetcher、不写本地存储
+        self.hub_url = AppConfig.HUB_URL
+        self.fetch_remote = bool(self.hub_url) or AppConfig.FETCH_PROCESS
+        self.fetcher = None if self.fetch_remote else GoldDataFetcher()
+        self.scheduler = SourceScheduler(self.fetcher) if self.fetcher else None  # 分源刷新节奏
+        self.history = TickHistory()  # 内存行情历史（逐笔 + K线）
+        self.tick_store = None if self.fetch_remote else self._open_tick_store()  # 本地行情存储（可能为None）
+        # 最近快照缓存：恢复溢价，并在视图就绪后先显示上次的数据（标记为过期）
+        self.snapshot_cache = SnapshotCache(self.fetcher)
+        self.cached_snapshot = self.snapshot_cache.load()
+        self.showing_cached = False  # 视图当前显示的是否为缓存数据
+        self.latest_data = None  # 最近一次实时快照（视图就绪前到达的数据在就绪后补绘）
+        self.old_pos = None  # 用于窗口拖动
+        self.is_loaded = False  # 渲染视图是否就绪
+        self.is_always_on_top = False  # 默认不置顶
+        self.in_background = False  # 窗口隐藏或最小化：不渲染、不轮询页面、降低抓取频率
+        self.differ = SnapshotDiffer()  # 记录已渲染快照，只向视图发送变化字段
+        self.alerts = AlertEngine(load_rules())  # 价格提醒（每个快照批量评估）
+        self._shut_down = False
+        
+        # 初始化菜单管理器
+        self.menu_manager = MenuManager(self)
+        
+        # 设置窗口
+        self._setup_window()
+        
+        # 设置渲染视图
+        self._setup_view()
+        
+        # 设置异步数据抓取
+        self._setup_worker_thread()
+        
+        # 设置定时器
+        self._setup_timers()
+        
+        # 设置初始尺寸
+        self.resize(AppConfig.WINDOW_WIDTH, AppConfig.WINDOW_HEIGHT)
+        
+        # 应用退出时（托盘或右键菜单的退出不会触发 closeEvent）停止抓取并写入缓存与本地存储
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+        
+        # 立即发起首次抓取，网络连接与视图加载并行预热
+        self.update_data()
+    
+    def _open_tick_store(self):
+        """
+        打开本地行情存储，并在后台线程中用最近数据预热内存历史（查询耗时随品种数增长，不占用主线程）
+        
+        Returns:
+            TickStore | None: 未启用或打开失败时返回None
+        """
+        if not AppConfig.TICK_STORE_ENABLED:
+            return None
+        try:
+            store = TickStore()
+        except Exception as e:
+            log.warning("本地行情存储不可用: %s", e)
+            return None
+        self.history_loaded.connect(self.push_sparklines)
+        threading.Thread(target=self._preload_history, args=(store,), name="history-preload", daemon=True).start()
+        return store
+    
+    def _preload_history(self, store):
+        """后台线程：读取最近的逐笔并载入内存历史（TickHistory 线程安全），完成后通知主线程刷新走势线"""
+        try:
+            self.history.load(store.load_recent())
+        except Exception as e:
+            log.warning("行情历史预热失败: %s", e)
+            return
+        self.history_loaded.emit()
+    
+    def _setup_window(self):
+        """设置窗口属性"""
+        self.update_window_flags()
+        self.setAttribute(Qt.WA_TranslucentBackground)  # 背景透明
+    
+    def _setup_view(self):
+        """创建渲染视图并设为中央控件（子类实现）"""
+        raise NotImplementedError
+    
+    def _setup_worker_thread(self):
+        """设置异步工作线程（客户端模式下改为订阅中枢，独立抓取进程模式下改为读取共享内存）"""
+        if self.fetch_remote:
+            self.worker_thread = None
+            if self.hub_url:
+                self.worker = HubWorker(self.hub_url, [self.history])
+            else:
+                self.worker = ProcessWorker([self.history])
+            self.worker.data_fetched.connect(self.handle_data)
+            self.worker.start()
+            return
+        
+        # 创建工作线程
+        self.worker_thread = QThread()
+        sinks = [self.history, self.snapshot_cache] + ([self.tick_store] if self.tick_store else [])
+        self.worker = FetchWorker(self.scheduler, sinks)
+        self.worker.moveToThread(self.worker_thread)
+        
+        # 连接信号：执行任务 -> 更新面板（触发统一经由 worker.request_fetch 合并去重）
+        self.worker.data_fetched.connect(self.handle_data)
+        
+        # 启动线程
+        self.worker_thread.start()
+    
+    def _setup_timers(self):
+        """设置各种定时器"""
+        # 数据更新定时器（抓取在其他进程中进行时按其自身节奏到达，无需定时请求）
+        self.timer = QTimer(self)
+        # 经由主线程的 update_data 调用，保证合并判断在工作线程忙碌时也能即时完成
+        self.timer.timeout.connect(self.update_data)
+        if not self.fetch_remote:
+            self.timer.start(AppConfig.UPDATE_INTERVAL_MS)
+        
+        # 走势线推送定时器
+        self.sparkline_timer = QTimer(self)
+        self.sparkline_timer.timeout.connect(self.push_sparklines)
+        self.sparkline_timer.start(AppConfig.SPARKLINE_INTERVAL_MS)
+    
+    # ============ 渲染接口（子类实现） ============
+    
+    def render_snapshot(self, data):
+        """渲染完整快照（首屏缓存数据）"""
+        raise NotImplementedError
+    
+    def render_patch(self, patch):
+        """渲染差分补丁（结构与数据字典一致，只含变化字段；无变化时为只含 ts 的心跳，仅更新时间）"""
+        raise NotImplementedError
+    
+    def render_sparklines(self, series):
+        """渲染走势线，series 为 品种名 -> 价格数组（旧 -> 新）"""
+        raise NotImplementedError
+    
+    def toggle_section(self, key):
+        """切换版块（gold/silver/crypto）或单个币种的显示"""
+        raise NotImplementedError
+    
+    def show_pin_state(self, pinned):
+        """同步置顶按钮的显示状态"""
+        raise NotImplementedError
+    
+    # ============ 数据 ============
+    
+    def _paint_cached_snapshot(self):
+        """首屏：在实时数据到达前先显示缓存的上次快照，并标记为过期"""
+        if not self.cached_snapshot:
+            return
+        snapshot = dict(self.cached_snapshot, stale=True)
+        self.cached_snapshot = None  # 只用于首屏
+        self.showing_cached = True
+        self.render_snapshot(snapshot)
+    
+    def handle_data(self, data):
+        """
+        主线程槽函数：将获取到的数据渲染到视图
+        
+        Args:
+            data: 抓取到的数据字典
+        """
+        if self.latest_data is None:
+            self.first_data_received.emit(data)
+        self.latest_data = data
+        fired = self.alerts.evaluate(data)
+        if fired:
+            self.alerts_fired.emit(fired)
+        if self.in_background:
+            self.background_data.emit(data)  # 显示时再由 _set_background 补绘最新快照
+            return
+        if not self.is_loaded:
+            return
+        start = time.perf_counter()
+        # 仅发送按显示精度发生变化的字段，无变化时不触发渲染
+        patch = self.differ.diff(data)
+        if self.showing_cached:
+            # 首个实时快照：清除过期标记（差分已重置，补丁包含完整字段）
+            self.showing_cached = False
+            patch = dict(patch or {}, stale=False)
+        if patch is None:
+            # 显示值无变化：只发送心跳，使视图中的更新时间保持准确
+            self.render_patch({"ts": data.get("timestamp")})
+            RENDER_PATCHES.inc(kind="unchanged")
+            return
+        self.render_patch(patch)
+        RENDER_SECONDS.observe(time.perf_counter() - start)
+        RENDER_PATCHES.inc(kind="patch")
+    
+    def push_sparklines(self):
+        """将降采样后的走势线推送到视图"""
+        if not self.is_loaded or self.in_background:
+            return
+        series = self.history.sparklines()
+        if series:
+            self.render_sparklines(series)
+    
+    def update_data(self):
+        """手动触发数据更新（与定时刷新共用在途合并逻辑，重复点击不会堆积请求）"""
+        self.worker.request_fetch()
+    
+    def fetch_stats(self):
+        """
+        获取抓取调度统计
+        
+        Returns:
+            dict: 包含 coalesced_ticks / dropped_ticks 等计数，各主机连接复用统计 connections 与数据源熔断状态 health；
+                  客户端模式下为中枢订阅统计（连接与熔断状态见中枢的 /stats），独立抓取进程模式下为子进程统计
+        """
+        stats = self.worker.stats()
+        if self.fetcher is not None:
+            stats["connections"] = self.fetcher.connection_stats()
+            stats["health"] = self.fetcher.health.stats()
+        return stats
+    
+    # ============ 窗口 ============
+    
+    def update_window_flags(self):
+        """更新窗口标志（置顶/不置顶）"""
+        if platform.system() == 'Darwin':
+            # macOS
+            flags = Qt.FramelessWindowHint
+            if self.is_always_on_top:
+                flags |= Qt.WindowStaysOnTopHint
+            self.setWindowFlags(flags)
+        else:
+            # Windows/Linux
+            flags = Qt.FramelessWindowHint | Qt.Tool
+            if self.is_always_on_top:
+                flags |= Qt.WindowStaysOnTopHint
+            self.setWindowFlags(flags)
+        
+        # setWindowFlags会隐藏窗口，需要重新显示并激活
+        self.show()
+        self.raise_()  # 确保窗口在最前面
+        self.activateWindow()  # 激活窗口获得焦点
+    
+    def toggle_always_on_top(self):
+        """
+        切换置顶状态
+        
+        Returns:
+            bool: 新的置顶状态
+        """
+        self.is_always_on_top = not self.is_always_on_top
+        self.update_window_flags()
+        self.show_pin_state(self.is_always_on_top)
+        return self.is_always_on_top
+    
+    def move_by(self, delta_x, delta_y):
+        """
+        按位移移动窗口
+        
+        Args:
+            delta_x: 水平位移
+            delta_y: 垂直位移
+        """
+        if delta_x != 0 or delta_y != 0:
+            self.move(self.x() + delta_x, self.y() + delta_y)
+    
+    def show_context_menu(self, pos):
+        """
+        显示右键上下文菜单
+        
+        Args:
+            pos: 菜单显示位置（全局坐标）
+        """
+        self.menu_manager.create_context_menu(pos)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_visibility_check()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._schedule_visibility_check()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._schedule_visibility_check()
+    
+    def _schedule_visibility_check(self):
+        """
+        在事件循环下一轮判断前后台状态
+        （update_window_flags 会先隐藏再显示窗口，合并为一次判断，避免无谓的暂停与补绘）
+        """
+        QTimer.singleShot(0, lambda: self._set_background(not self.isVisible() or self.isMinimized()))
+    
+    def _start_page_poll_timers(self):
+        """启动视图状态轮询（仅页面渲染且未启用QWebChannel时需要）"""
+    
+    def _page_poll_timers(self):
+        """已启动的视图轮询定时器"""
+        return []
+    
+    def _set_background(self, background):
+        """
+        切换后台模式：后台时停止渲染、走势线推送与页面轮询，按 BACKGROUND_UPDATE_INTERVAL_MS 抓取；
+        回到前台时恢复原有节奏，并立即补绘最新快照与走势线
+        
+        Args:
+            background: 窗口是否隐藏或最小化
+        """
+        if background == self.in_background:
+            return
+        self.in_background = background
+        if background:
+            self.sparkline_timer.stop()
+            for timer in self._page_poll_timers():
+                timer.stop()
+        else:
+            self.sparkline_timer.start(AppConfig.SPARKLINE_INTERVAL_MS)
+            self._start_page_poll_timers()
+        
+        if self.fetch_remote:
+            self.worker.set_background(background)
+        else:
+            self.timer.setInterval(
+                AppConfig.BACKGROUND_UPDATE_INTERVAL_MS if background else AppConfig.UPDATE_INTERVAL_MS
+            )
+        
+        if not background:
+            # 先补绘后台期间最后到达的快照（差分只发送变化字段），再立即抓取一次最新数据
+            if self.latest_data is not None:
+                self.handle_data(self.latest_data)
+            self.push_sparklines()
+            self.update_data()
+    
+    def mousePressEvent(self, event: QMouseEvent):
+        """
+        处理鼠标按下事件
+        
+        Args:
+            event: 鼠标事件对象
+        """
+        if event.button() == Qt.LeftButton:
+            # 左键任意位置开始拖动
+            try:
+                self.old_pos = event.globalPosition().toPoint()
+            except AttributeError:
+                self.old_pos = event.globalPos()
+        elif event.button() == Qt.RightButton:
+            # 右键打开菜单
+            try:
+                global_pos = event.globalPosition().toPoint()
+            except AttributeError:
+                global_pos = event.globalPos()
+            self.show_context_menu(global_pos)
+    
+    def mouseMoveEvent(self, event: QMouseEvent):
+        """
+        处理鼠标移动事件 - 拖动窗口
+        
+        Args:
+            event: 鼠标事件对象
+        """
+        if self.old_pos:
+            try:
+                curr_pos = event.globalPosition().toPoint()
+            except AttributeError:
+                curr_pos = event.globalPos()
+            delta = curr_pos - self.old_pos
+            self.move(self.x() + delta.x(), self.y() + delta.y())
+            self.old_pos = curr_pos
+    
+    def mouseReleaseEvent(self, event: QMouseEvent):
+        """
+        处理鼠标释放事件
+        
+        Args:
+            event: 鼠标事件对象
+        """
+        self.old_pos = None
+    
+    def shutdown(self):
+        """
+        停止后台线程，写入快照缓存并关闭本地存储（可重复调用，只执行一次）
+        
+        由 QApplication.aboutToQuit 与 closeEvent 调用：托盘与右键菜单的退出直接结束事件循环，不经过 closeEvent
+        """
+        if self._shut_down:
+            return
+        self._shut_down = True
+        self.timer.stop()
+        self.sparkline_timer.stop()
+        if self.worker_thread is not None:
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+            self.fetcher.close()
+            self.snapshot_cache.flush()
+        else:
+            self.worker.stop()  # 快照缓存由中枢或抓取子进程写入
+        if self.tick_store is not None:
+            self.tick_store.close()  # 写入队列中剩余的逐笔
+    
+    def closeEvent(self, event):
+        """
+        窗口关闭事件：安全终止后台线程
+        
+        Args:
+            event: 关闭事件对象
+        """
+        self.shutdown()
+        super().closeEvent(event)
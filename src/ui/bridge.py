@@ -0,0 +1,77 @@
+"""
+Web页面与Python的事件桥接模块
+通过QWebChannel由页面主动推送置顶、拖动、右键菜单事件，取代定时runJavaScript轮询
+"""
+import time
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+
+class WindowBridge(QObject):
+    """注册到QWebChannel的桥接对象，页面侧以 bridge.xxx() 调用"""
+
+    pin_changed = Signal(bool)  # 置顶按钮切换
+    drag_moved = Signal(int, int)  # 拖动位移（deltaX, deltaY）
+    context_menu_requested = Signal(int, int)  # 右键菜单请求（屏幕坐标）
+
+    def __init__(self, meter=None):
+        """
+        初始化桥接对象
+
+        Args:
+            meter: 可选的IpcMeter，用于统计页面推送次数
+        """
+        super().__init__()
+        self.meter = meter
+
+    def _count(self):
+        if self.meter is not None:
+            self.meter.count("bridge")
+
+    @Slot(bool)
+    def setPinned(self, pinned):
+        self._count()
+        self.pin_changed.emit(bool(pinned))
+
+    @Slot(int, int)
+    def dragMove(self, delta_x, delta_y):
+        self._count()
+        if delta_x or delta_y:
+            self.drag_moved.emit(delta_x, delta_y)
+
+    @Slot(int, int)
+    def contextMenu(self, x, y):
+        self._count()
+        self.context_menu_requested.emit(x, y)
+
+
+class IpcMeter:
+    """IPC测量：统计Python与渲染进程之间的调用次数及进程CPU占用"""
+
+    def __init__(self):
+        self.counts = {}
+        self._last_counts = {}
+        self._last_wall = time.perf_counter()
+        self._last_cpu = time.process_time()
+
+    def count(self, kind):
+        """记录一次调用（kind: runJavaScript / bridge）"""
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def report(self):
+        """
+        计算自上次报告以来的速率
+
+        Returns:
+            str: 形如 "runJavaScript=1.0/s bridge=0.0/s cpu=0.8%" 的报告文本
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        elapsed = max(wall - self._last_wall, 1e-9)
+        parts = []
+        for kind in sorted(set(self.counts) | {"runJavaScript", "bridge"}):
+            delta = self.counts.get(kind, 0) - self._last_counts.get(kind, 0)
+            parts.append(f"{kind}={delta / elapsed:.1f}/s")
+        parts.append(f"cpu={(cpu - self._last_cpu) / elapsed * 100:.1f}%")
+        self._last_counts = dict(self.counts)
+        self._last_wall, self._last_cpu = wall, cpu
+        return " ".join(parts)
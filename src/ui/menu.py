@@ -6,6 +6,8 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QMenu, QWidgetAction, QSlider, QLabel, QHBoxLayout, QWidget
 from PySide6.QtGui import QAction
 
+from ..core.config import AppConfig
+
 
 class MenuManager:
     """右键菜单管理器"""
@@ -64,7 +66,7 @@ class MenuManager:
         初始化菜单管理器
         
         Args:
-            window: 主窗口实例，用于调用窗口方法和访问browser对象
+            window: 主窗口实例（MarketWindow），用于调用窗口方法
         """
         self.window = window
     
@@ -119,39 +121,54 @@ class MenuManager:
         # 黄金版块
         gold_action = QAction("黄金版块", menu)
         gold_action.triggered.connect(
-            lambda: self.window.browser.page().runJavaScript("toggleSection('gold')")
+            lambda: self.window.toggle_section("gold")
         )
         menu.addAction(gold_action)
         
         # 白银版块
         silver_action = QAction("白银版块", menu)
         silver_action.triggered.connect(
-            lambda: self.window.browser.page().runJavaScript("toggleSection('silver')")
+            lambda: self.window.toggle_section("silver")
         )
         menu.addAction(silver_action)
         
         # 加密货币版块（全部）
         crypto_all_action = QAction("加密版块", menu)
         crypto_all_action.triggered.connect(
-            lambda: self.window.browser.page().runJavaScript("toggleSection('crypto')")
+            lambda: self.window.toggle_section("crypto")
         )
         menu.addAction(crypto_all_action)
     
     def _add_crypto_filters(self, menu):
         """
-        添加单个加密货币筛选选项
+        添加单个加密货币筛选选项（关注列表较长时按 CRYPTO_MENU_PAGE_SIZE 分为多个子菜单）
         
         Args:
             menu: 父菜单对象
         """
-        crypto_names = ["BTC", "ETH", "BNB", "SOL", "HYPE"]
+        crypto_names = AppConfig.CRYPTO_ORDER
+        page = AppConfig.CRYPTO_MENU_PAGE_SIZE
+        if len(crypto_names) > page:
+            for start in range(0, len(crypto_names), page):
+                chunk = crypto_names[start:start + page]
+                self._add_crypto_actions(menu.addMenu(f"{chunk[0]} … {chunk[-1]}"), chunk)
+        else:
+            self._add_crypto_actions(menu, crypto_names)
+    
+    def _add_crypto_actions(self, menu, crypto_names):
+        """
+        为每个币种添加一个筛选选项
         
+        Args:
+            menu: 父菜单对象
+            crypto_names: 币种名列表
+        """
         for name in crypto_names:
             action = QAction(name, menu)
             # 使用lambda的默认参数来捕获当前值
             action.triggered.connect(
                 lambda checked=False, symbol=name: 
-                self.window.browser.page().runJavaScript(f"toggleSection('{symbol}')")
+                self.window.toggle_section(symbol)
             )
             menu.addAction(action)
     
@@ -0,0 +1,406 @@
+"""
+原生渲染主窗口模块
+不加载 QtWebEngine：行情面板由 QPainter 直接绘制（黄金、白银、加密货币、休市标记、汇率与更新时间），
+配色与尺寸取自 resources/ui/style.css；鼠标事件由窗口直接处理，没有页面轮询与 runJavaScript 调用
+"""
+import time
+
+from PySide6.QtCore import Qt, QPointF, QRectF, QSettings, QTimer
+from PySide6.QtGui import QColor, QFont, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+from ..core.config import AppConfig
+from .base_window import MarketWindow
+
+# 配色（与 style.css 中的 :root 变量一致）
+BG_APP = QColor(14, 16, 18, 242)
+BORDER = QColor(255, 255, 255, 20)
+CARD_BG = QColor(255, 255, 255, 13)
+ROW_BG = QColor(255, 255, 255, 8)
+DIVIDER = QColor(255, 255, 255, 13)
+TEXT = QColor(255, 255, 255)
+TEXT_LABEL = QColor(255, 255, 255, 179)
+TEXT_SECONDARY = QColor(0x8E, 0x91, 0x99)
+UP = QColor(0x00, 0xEB, 0xA0)
+UP_BG = QColor(0, 235, 160, 38)
+DOWN = QColor(0xFF, 0x45, 0x55)
+DOWN_BG = QColor(255, 69, 85, 38)
+MARKET_TAG = QColor(0xFF, 0xAA, 0x00)
+MARKET_TAG_BG = QColor(255, 170, 0, 64)
+SPARKLINE = QColor(255, 255, 255, 179)
+STALE_OPACITY = 0.45
+
+NUM_FONTS = ["SF Mono", "Segoe UI", "Roboto", "Helvetica Neue", "Arial"]
+UI_FONTS = ["PingFang SC", "Microsoft YaHei", "Segoe UI", "Roboto"]
+
+# 尺寸（px）
+PANEL_WIDTH = 340
+PANEL_PADDING = 20
+PANEL_RADIUS = 24
+SECTION_GAP = 16
+HEADER_HEIGHT = 20
+FOOTER_HEIGHT = 14
+CARD_PAD_X = 16
+CARD_PAD_Y = 14
+CARD_RADIUS = 16
+CARD_HEADER_HEIGHT = 28  # 标题行 + 下边距
+DATA_ROW_HEIGHT = 26
+DIVIDER_HEIGHT = 17  # 8 + 1 + 8
+CRYPTO_ROW_HEIGHT = 24
+CRYPTO_ROW_GAP = 6
+CRYPTO_MAX_VISIBLE = 8  # 与页面一致：超过该行数时列表可滚动
+SPARK_WIDTH = 56
+SPARK_HEIGHT = 16
+
+# 版块 -> (标题, 代码, 行)，行为 (键, 标签, 价格字号)
+METALS = {
+    "gold": ("黄金", "XAU", (("intl", "国际 (USD/oz)", 22), ("dom", "国内 (CNY/g)", 22))),
+    "silver": ("白银", "XAG", (("intl", "国际 (USD/oz)", 20), ("dom", "国内 (CNY/g)", 20))),
+}
+
+
+def _font(families, px, weight=QFont.Normal):
+    font = QFont()
+    font.setFamilies(families)
+    font.setPixelSize(px)
+    font.setWeight(weight)
+    return font
+
+
+class QuoteBoard(QWidget):
+    """行情面板：保存已渲染的值（与页面中的 state 对应），补丁合并后整体重绘"""
+    
+    def __init__(self, window):
+        """
+        初始化面板
+        
+        Args:
+            window: NativeWindow 实例（置顶按钮点击时调用其 toggle_always_on_top）
+        """
+        super().__init__(window)
+        self.market_window = window
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.state = {"gold": {}, "silver": {}, "crypto": {}, "market_status": {}, "stale_rows": {}}
+        self.exchange_rate = None
+        self.stale = False  # 显示的是缓存快照
+        self.updated = "--:--:--"
+        self.sparklines = {}
+        self.pinned = False
+        self.crypto_order = list(AppConfig.CRYPTO_ORDER)
+        self._crypto_known = set(self.crypto_order)
+        # 版块与币种的显示开关（页面中保存在 localStorage，这里保存在 QSettings）
+        self.settings = QSettings("market-floating-window", "native")
+        self.hidden = set(self.settings.value("hidden", [], type=list) or [])
+        self.scroll = 0  # 加密货币列表第一个可见行
+        self._wheel_delta = 0  # 累计的滚轮角度（触控板每次只给出很小的增量）
+        self.pin_rect = QRectF()
+        self.crypto_rect = QRectF()
+        self.fonts = {
+            "app": _font(UI_FONTS, 14, QFont.Bold),
+            "label": _font(UI_FONTS, 12, QFont.Bold),
+            "tag": _font(UI_FONTS, 10),
+            "market": _font(UI_FONTS, 9, QFont.Bold),
+            "row": _font(UI_FONTS, 11),
+            "change": _font(NUM_FONTS, 12, QFont.Bold),
+            "sym": _font(UI_FONTS, 11, QFont.Bold),
+            "c_price": _font(NUM_FONTS, 14, QFont.DemiBold),
+            "c_change": _font(NUM_FONTS, 11, QFont.DemiBold),
+            "footer": _font(NUM_FONTS, 10),
+        }
+        self.price_fonts = {px: _font(NUM_FONTS, px, QFont.Bold) for px in (20, 22)}
+    
+    # ============ 数据 ============
+    
+    def apply(self, patch):
+        """
+        合并补丁或完整快照并重绘
+        
+        Args:
+            patch: 与数据字典结构一致的补丁（只含变化字段）
+        """
+        for key in ("gold", "silver", "market_status", "stale_rows"):
+            if patch.get(key):
+                self.state[key].update(patch[key])
+        for symbol, values in (patch.get("crypto") or {}).items():
+            self.state["crypto"].setdefault(symbol, {}).update(values)
+            if symbol not in self._crypto_known:
+                self._crypto_known.add(symbol)
+                self.crypto_order.append(symbol)
+        if patch.get("exchange_rate") is not None:
+            self.exchange_rate = patch["exchange_rate"]
+        if "stale" in patch:
+            self.stale = bool(patch["stale"])
+        self.updated = time.strftime("%H:%M:%S", time.localtime(patch.get("ts") or time.time()))
+        self.update()
+    
+    def set_sparklines(self, series):
+        self.sparklines = series
+        self.update()
+    
+    def set_pinned(self, pinned):
+        self.pinned = pinned
+        self.update()
+    
+    def toggle(self, key):
+        """切换版块或币种的显示，并保存"""
+        self.hidden.symmetric_difference_update({key})
+        self.settings.setValue("hidden", sorted(self.hidden))
+        self.scroll = min(self.scroll, self._max_scroll())
+        self.update()
+    
+    def _visible_crypto(self):
+        return [s for s in self.crypto_order if s not in self.hidden]
+    
+    def _max_scroll(self):
+        return max(0, len(self._visible_crypto()) - CRYPTO_MAX_VISIBLE)
+    
+    # ============ 布局 ============
+    
+    def _crypto_list_height(self):
+        rows = min(len(self._visible_crypto()), CRYPTO_MAX_VISIBLE)
+        return max(0, rows * (CRYPTO_ROW_HEIGHT + CRYPTO_ROW_GAP) - CRYPTO_ROW_GAP)
+    
+    def _sections(self):
+        """
+        可见版块及其卡片高度
+        
+        Returns:
+            list: [(版块, 高度)]
+        """
+        sections = []
+        for metal in METALS:
+            if metal not in self.hidden:
+                sections.append((metal, CARD_PAD_Y * 2 + CARD_HEADER_HEIGHT + DATA_ROW_HEIGHT * 2 + DIVIDER_HEIGHT))
+        if "crypto" not in self.hidden:
+            sections.append(("crypto", CARD_PAD_Y * 2 + CARD_HEADER_HEIGHT + self._crypto_list_height()))
+        return sections
+    
+    # ============ 绘制 ============
+    
+    def paintEvent(self, event):
+        sections = self._sections()
+        height = PANEL_PADDING * 2 + HEADER_HEIGHT + FOOTER_HEIGHT + SECTION_GAP * (len(sections) + 1) \
+            + sum(h for _, h in sections)
+        panel = QRectF((self.width() - PANEL_WIDTH) / 2, max(0, (self.height() - height) / 2), PANEL_WIDTH, height)
+        
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing)
+        p.setPen(QPen(BORDER, 1))
+        p.setBrush(BG_APP)
+        p.drawRoundedRect(panel.adjusted(0.5, 0.5, -0.5, -0.5), PANEL_RADIUS, PANEL_RADIUS)
+        
+        inner = panel.adjusted(PANEL_PADDING, PANEL_PADDING, -PANEL_PADDING, -PANEL_PADDING)
+        y = inner.top()
+        self._paint_header(p, QRectF(inner.left() + 4, y, inner.width() - 8, HEADER_HEIGHT))
+        y += HEADER_HEIGHT + SECTION_GAP
+        self.crypto_rect = QRectF()
+        for name, h in sections:
+            card = QRectF(inner.left(), y, inner.width(), h)
+            p.setPen(Qt.NoPen)
+            p.setBrush(CARD_BG)
+            p.drawRoundedRect(card, CARD_RADIUS, CARD_RADIUS)
+            body = card.adjusted(CARD_PAD_X, CARD_PAD_Y, -CARD_PAD_X, -CARD_PAD_Y)
+            if name == "crypto":
+                self._paint_crypto(p, body)
+            else:
+                self._paint_metal(p, name, body)
+            y += h + SECTION_GAP
+        self._paint_footer(p, QRectF(inner.left() + 4, y, inner.width() - 8, FOOTER_HEIGHT))
+        p.end()
+    
+    def _paint_header(self, p, rect):
+        p.setFont(self.fonts["app"])
+        p.setPen(TEXT)
+        p.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, "市场行情")
+        # 置顶按钮（图钉）与状态指示点
+        self.pin_rect = QRectF(rect.right() - 18, rect.center().y() - 9, 18, 18)
+        c = self.pin_rect.center()
+        color = QColor(255, 255, 255, 230 if self.pinned else 89)
+        p.setPen(QPen(color, 1.5))
+        p.setBrush(color if self.pinned else Qt.NoBrush)
+        p.drawEllipse(QPointF(c.x(), c.y() - 3), 3.5, 3.5)
+        p.drawLine(QPointF(c.x(), c.y() + 0.5), QPointF(c.x(), c.y() + 7))
+        p.setPen(Qt.NoPen)
+        p.setBrush(UP)
+        p.drawEllipse(QPointF(self.pin_rect.left() - 10, c.y()), 3, 3)
+    
+    def _paint_card_header(self, p, rect, label, symbol=None, closed=False):
+        p.setFont(self.fonts["label"])
+        p.setPen(QColor(255, 255, 255, 230))
+        line = QRectF(rect.left(), rect.top(), rect.width(), 18)
+        x = rect.left() + p.fontMetrics().horizontalAdvance(label) + 6
+        p.drawText(line, Qt.AlignLeft | Qt.AlignVCenter, label)
+        for text, font, fg, bg, show in (
+            (symbol, "tag", TEXT_SECONDARY, QColor(255, 255, 255, 26), bool(symbol)),
+            ("休市", "market", MARKET_TAG, MARKET_TAG_BG, closed),
+        ):
+            if not show:
+                continue
+            p.setFont(self.fonts[font])
+            w = p.fontMetrics().horizontalAdvance(text) + (8 if font == "tag" else 12)
+            tag = QRectF(x, line.center().y() - 8, w, 16)
+            p.setPen(Qt.NoPen)
+            p.setBrush(bg)
+            p.drawRoundedRect(tag, 4, 4)
+            p.setPen(fg)
+            p.drawText(tag, Qt.AlignCenter, text)
+            x += w + 6
+    
+    def _is_stale(self, row):
+        return self.stale or bool(self.state["stale_rows"].get(row))
+    
+    def _paint_metal(self, p, metal, body):
+        title, symbol, rows = METALS[metal]
+        values = self.state[metal]
+        closed = self.state["market_status"].get(metal) == "closed"
+        self._paint_card_header(p, body, title, symbol, closed)
+        y = body.top() + CARD_HEADER_HEIGHT
+        for i, (key, label, price_px) in enumerate(rows):
+            if i:
+                p.fillRect(QRectF(body.left(), y + 8, body.width(), 1), DIVIDER)
+                y += DIVIDER_HEIGHT
+            row = QRectF(body.left(), y, body.width(), DATA_ROW_HEIGHT)
+            p.setFont(self.fonts["row"])
+            p.setPen(TEXT_LABEL)
+            p.drawText(row, Qt.AlignLeft | Qt.AlignVCenter, label)
+            # 行内容自右向左：涨跌幅标签、价格、走势线
+            change = values.get(key + "_change")
+            price = values.get(key)
+            p.save()
+            if self._is_stale(f"{metal}.{key}"):
+                p.setOpacity(STALE_OPACITY)
+            p.setFont(self.fonts["change"])
+            text = "--" if change is None else f"{change:+.2f}%"
+            w = max(50, p.fontMetrics().horizontalAdvance(text) + 12)
+            tag = QRectF(row.right() - w, row.center().y() - 10, w, 20)
+            p.setPen(Qt.NoPen)
+            p.setBrush(UP_BG if (change or 0) >= 0 else DOWN_BG)
+            p.drawRoundedRect(tag, 6, 6)
+            p.setPen(UP if (change or 0) >= 0 else DOWN)
+            p.drawText(tag, Qt.AlignCenter, text)
+            p.setFont(self.price_fonts[price_px])
+            p.setPen(TEXT)
+            text = "--" if not price else f"{price:.2f}"
+            right = tag.left() - 8
+            p.drawText(QRectF(row.left(), row.top(), right - row.left(), row.height()),
+                       Qt.AlignRight | Qt.AlignVCenter, text)
+            p.restore()
+            spark_right = right - p.fontMetrics().horizontalAdvance(text) - 8
+            self._paint_sparkline(p, f"{metal}.{key}", spark_right, row.center().y())
+            y += DATA_ROW_HEIGHT
+    
+    def _paint_crypto(self, p, body):
+        self._paint_card_header(p, body, "加密货币")
+        top = body.top() + CARD_HEADER_HEIGHT
+        self.crypto_rect = QRectF(body.left(), top, body.width(), self._crypto_list_height())
+        symbols = self._visible_crypto()[self.scroll:self.scroll + CRYPTO_MAX_VISIBLE]
+        stale = self._is_stale("crypto")
+        for i, symbol in enumerate(symbols):
+            row = QRectF(body.left(), top + i * (CRYPTO_ROW_HEIGHT + CRYPTO_ROW_GAP), body.width(), CRYPTO_ROW_HEIGHT)
+            p.setPen(Qt.NoPen)
+            p.setBrush(ROW_BG)
+            p.drawRoundedRect(row, 8, 8)
+            inner = row.adjusted(6, 0, -6, 0)
+            p.setFont(self.fonts["sym"])
+            p.setPen(TEXT_LABEL)
+            p.drawText(inner, Qt.AlignLeft | Qt.AlignVCenter, symbol)
+            info = self.state["crypto"].get(symbol, {})
+            change, price = info.get("change"), info.get("price")
+            p.save()
+            if stale:
+                p.setOpacity(STALE_OPACITY)
+            p.setFont(self.fonts["c_change"])
+            p.setPen(UP if (change or 0) >= 0 else DOWN)
+            text = "--" if change is None else f"{change:+.2f}%"
+            change_rect = QRectF(inner.right() - 50, row.top(), 50, row.height())
+            p.drawText(change_rect, Qt.AlignRight | Qt.AlignVCenter, text)
+            p.setFont(self.fonts["c_price"])
+            p.setPen(TEXT)
+            text = "--" if price is None else f"{price:.2f}"
+            right = change_rect.left() - 10
+            p.drawText(QRectF(inner.left(), row.top(), right - inner.left(), row.height()),
+                       Qt.AlignRight | Qt.AlignVCenter, text)
+            p.restore()
+            spark_right = right - p.fontMetrics().horizontalAdvance(text) - 8
+            self._paint_sparkline(p, f"crypto.{symbol}", spark_right, row.center().y())
+    
+    def _paint_sparkline(self, p, key, right, center_y):
+        values = self.sparklines.get(key)
+        if not values or len(values) < 2:
+            return
+        low = min(values)
+        span = (max(values) - low) or 1
+        step = SPARK_WIDTH / (len(values) - 1)
+        left, top = right - SPARK_WIDTH, center_y - SPARK_HEIGHT / 2
+        points = QPolygonF([
+            QPointF(left + i * step, top + SPARK_HEIGHT - 1 - (v - low) / span * (SPARK_HEIGHT - 2))
+            for i, v in enumerate(values)
+        ])
+        p.save()
+        p.setOpacity(0.6)
+        p.setPen(QPen(SPARKLINE, 1.2))
+        p.setBrush(Qt.NoBrush)
+        p.drawPolyline(points)
+        p.restore()
+    
+    def _paint_footer(self, p, rect):
+        p.setFont(self.fonts["footer"])
+        p.setPen(QColor(255, 255, 255, 204))
+        rate = "--" if not self.exchange_rate else f"{self.exchange_rate:.4f}"
+        p.save()
+        if self._is_stale("exchange_rate"):
+            p.setOpacity(STALE_OPACITY)
+        p.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, f"汇率 {rate}")
+        p.restore()
+        p.drawText(rect, Qt.AlignRight | Qt.AlignVCenter, self.updated)
+    
+    # ============ 鼠标 ============
+    
+    def mousePressEvent(self, event):
+        """点击置顶按钮切换置顶；其余事件交给窗口处理（拖动与右键菜单）"""
+        if event.button() == Qt.LeftButton and self.pin_rect.contains(event.position()):
+            self.market_window.toggle_always_on_top()
+            event.accept()
+            return
+        event.ignore()
+    
+    def wheelEvent(self, event):
+        """在加密货币列表上滚动：累计滚轮角度，每满 120（鼠标滚轮一格）移动一行"""
+        dy = event.angleDelta().y()
+        if not dy or not self.crypto_rect.contains(event.position()) or not self._max_scroll():
+            event.ignore()
+            return
+        self._wheel_delta += dy
+        rows = -int(self._wheel_delta / 120)
+        if rows:
+            self._wheel_delta += rows * 120
+            self.scroll = max(0, min(self._max_scroll(), self.scroll + rows))
+            self.update()
+        event.accept()
+
+
+class NativeWindow(MarketWindow):
+    """市场行情浮动窗口（原生 QPainter 渲染，不加载 QtWebEngine）"""
+    
+    def _setup_view(self):
+        """创建行情面板；面板同步创建完成，立即显示缓存快照"""
+        self.board = QuoteBoard(self)
+        self.setCentralWidget(self.board)
+        self.is_loaded = True
+        self._paint_cached_snapshot()
+        QTimer.singleShot(0, lambda: self.view_ready.emit(True))
+    
+    def render_snapshot(self, data):
+        self.board.apply(data)
+    
+    def render_patch(self, patch):
+        self.board.apply(patch)
+    
+    def render_sparklines(self, series):
+        self.board.set_sparklines(series)
+    
+    def toggle_section(self, key):
+        self.board.toggle(key)
+    
+    def show_pin_state(self, pinned):
+        self.board.set_pinned(pinned)
@@ -2,11 +2,17 @@
 系统托盘管理模块
 管理系统托盘图标和托盘菜单
 """
+import logging
 import os
 from PySide6.QtWidgets import QSystemTrayIcon, QMenu
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtWidgets import QApplication
 
+from ..core.config import AppConfig
+from ..core.snapshot_diff import summary_text
+
+log = logging.getLogger(__name__)
+
 
 class TrayManager:
     """系统托盘管理器"""
@@ -33,6 +39,11 @@ class TrayManager:
         # 设置托盘菜单
         self.tray.setContextMenu(self.menu)
         
+        # 窗口在后台时只更新托盘提示文字
+        self.window.background_data.connect(self._update_tooltip)
+        # 价格提醒以托盘通知显示（前台与后台均生效）
+        self.window.alerts_fired.connect(self._show_alerts)
+        
     def _create_menu(self):
         """创建托盘右键菜单"""
         self.menu = QMenu()
@@ -59,10 +70,35 @@ class TrayManager:
         """切换窗口显示/隐藏状态"""
         self.window.setVisible(not self.window.isVisible())
     
+    def _update_tooltip(self, data):
+        """
+        以快照摘要更新托盘提示
+        
+        Args:
+            data: 窗口后台期间到达的数据字典
+        """
+        text = summary_text(data)
+        if text:
+            self.tray.setToolTip(text)
+    
+    def _show_alerts(self, fired):
+        """
+        以一条托盘通知显示本次触发的提醒
+        
+        Args:
+            fired: [(AlertRule, 值), ...]
+        """
+        limit = AppConfig.ALERT_MESSAGE_MAX_LINES
+        lines = [rule.message(value) for rule, value in fired[:limit]]
+        if len(fired) > limit:
+            lines.append(f"……另有 {len(fired) - limit} 条提醒")
+        title = "价格提醒" if len(fired) == 1 else f"价格提醒（{len(fired)}）"
+        self.tray.showMessage(title, "\n".join(lines), QSystemTrayIcon.Information, AppConfig.ALERT_MESSAGE_MS)
+    
     def show(self):
         """显示托盘图标"""
         if not QSystemTrayIcon.isSystemTrayAvailable():
-            print("系统托盘在此系统上不可用")
+            log.warning("系统托盘在此系统上不可用")
             return
         self.tray.show()
     
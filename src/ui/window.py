@@ -1,62 +1,34 @@
 """
 主窗口模块
-管理应用的主窗口，包括窗口设置、事件处理、数据更新等
+WebEngine 渲染的主窗口：界面为 resources/ui 中的页面，数据以补丁经 runJavaScript 推送，
+置顶/拖动/右键菜单事件经 QWebChannel 推送（不可用时轮询页面状态）
 """
-import platform
 import json
-from PySide6.QtCore import Qt, QTimer, QPoint, Signal, QUrl, QThread
-from PySide6.QtWidgets import QMainWindow
+import logging
+from PySide6.QtCore import Qt, QTimer, QPoint, QUrl
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebEngineCore import QWebEngineSettings
-from PySide6.QtGui import QMouseEvent
 
 from ..core.config import AppConfig
-from ..core.data_fetcher import GoldDataFetcher
-from ..workers.fetch_worker import FetchWorker
-from .menu import MenuManager
+from .base_window import MarketWindow
+from .bridge import WindowBridge, IpcMeter
 
+try:
+    from PySide6.QtWebChannel import QWebChannel
+except ImportError:  # 缺少QtWebChannel时回退到轮询
+    QWebChannel = None
 
-class GoldWindow(QMainWindow):
-    """市场行情浮动窗口主类"""
-    
-    # 定义信号：请求数据抓取
-    request_fetch = Signal()
-    
-    def __init__(self):
-        """初始化主窗口"""
-        super().__init__()
-        
-        # 初始化状态变量
-        self.fetcher = GoldDataFetcher()
-        self.old_pos = None  # 用于窗口拖动
-        self.is_loaded = False  # WebView是否加载完成
-        self.is_always_on_top = False  # 默认不置顶
-        
-        # 初始化菜单管理器
-        self.menu_manager = MenuManager(self)
-        
-        # 设置窗口
-        self._setup_window()
-        
-        # 设置WebView
-        self._setup_webview()
-        
-        # 设置异步数据抓取
-        self._setup_worker_thread()
-        
-        # 设置定时器
-        self._setup_timers()
-        
-        # 设置初始尺寸
-        self.resize(AppConfig.WINDOW_WIDTH, AppConfig.WINDOW_HEIGHT)
-    
-    def _setup_window(self):
-        """设置窗口属性"""
-        self.update_window_flags()
-        self.setAttribute(Qt.WA_TranslucentBackground)  # 背景透明
+log = logging.getLogger(__name__)
+
+
+class GoldWindow(MarketWindow):
+    """市场行情浮动窗口（WebEngine 渲染）"""
     
-    def _setup_webview(self):
+    def _setup_view(self):
         """设置WebView组件"""
+        self.bridge = None  # QWebChannel桥接对象（未启用时为None，使用轮询）
+        self.ipc_meter = IpcMeter() if AppConfig.MEASURE_IPC else None
+        
         # 创建Web视图
         self.browser = QWebEngineView(self)
         self.browser.setContextMenuPolicy(Qt.NoContextMenu)  # 禁用右键菜单
@@ -75,6 +47,10 @@ class GoldWindow(QMainWindow):
         # 开启鼠标事件穿透，让Python处理所有鼠标事件
         self.browser.setAttribute(Qt.WA_TransparentForMouseEvents)
         
+        # 页面事件推送通道：置顶/拖动/右键菜单由页面主动通知
+        if AppConfig.USE_WEB_CHANNEL and QWebChannel is not None:
+            self._setup_web_channel()
+        
         # 监听加载完成
         self.browser.loadFinished.connect(self.on_load_finished)
         
@@ -82,26 +58,44 @@ class GoldWindow(QMainWindow):
         html_path = AppConfig.get_html_path()
         self.browser.setUrl(QUrl.fromLocalFile(html_path))
     
-    def _setup_worker_thread(self):
-        """设置异步工作线程"""
-        # 创建工作线程
-        self.worker_thread = QThread()
-        self.worker = FetchWorker(self.fetcher)
-        self.worker.moveToThread(self.worker_thread)
-        
-        # 连接信号：触发任务 -> 执行任务 -> 更新面板
-        self.request_fetch.connect(self.worker.do_fetch)
-        self.worker.data_fetched.connect(self.handle_data)
-        
-        # 启动线程
-        self.worker_thread.start()
+    def _setup_web_channel(self):
+        """注册QWebChannel桥接对象，页面通过 qwebchannel.js 连接"""
+        self.bridge = WindowBridge(self.ipc_meter)
+        self.bridge.pin_changed.connect(self.handle_pin_state)
+        self.bridge.drag_moved.connect(self.move_by)
+        self.bridge.context_menu_requested.connect(
+            lambda x, y: self.show_context_menu(QPoint(x, y))
+        )
+        self.channel = QWebChannel(self.browser.page())
+        self.channel.registerObject("bridge", self.bridge)
+        self.browser.page().setWebChannel(self.channel)
     
     def _setup_timers(self):
         """设置各种定时器"""
-        # 数据更新定时器
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(lambda: self.request_fetch.emit())
-        self.timer.start(AppConfig.UPDATE_INTERVAL_MS)
+        super()._setup_timers()
+        
+        # IPC测量报告定时器
+        if self.ipc_meter is not None:
+            self.ipc_report_timer = QTimer(self)
+            self.ipc_report_timer.timeout.connect(
+                lambda: log.info("[IPC] %s", self.ipc_meter.report())
+            )
+            self.ipc_report_timer.start(AppConfig.MEASURE_REPORT_INTERVAL_MS)
+    
+    def run_js(self, script, callback=None):
+        """
+        在页面中执行JavaScript（所有Python到页面的调用统一经由此处，便于统计）
+        
+        Args:
+            script: JavaScript代码
+            callback: 可选的结果回调
+        """
+        if self.ipc_meter is not None:
+            self.ipc_meter.count("runJavaScript")
+        if callback is None:
+            self.browser.page().runJavaScript(script)
+        else:
+            self.browser.page().runJavaScript(script, callback)
     
     def on_load_finished(self, success):
         """
@@ -112,35 +106,48 @@ class GoldWindow(QMainWindow):
         """
         if success:
             self.is_loaded = True
+            self.differ.reset()  # 新页面尚未渲染任何数据
+            self.run_js(f"setWatchlist({json.dumps(AppConfig.CRYPTO_ORDER)});")
+            self._paint_cached_snapshot()
+            if self.latest_data is not None:
+                self.handle_data(self.latest_data)  # 页面加载期间已到达的实时数据
             self.update_data()
             
             # 同步初始置顶状态到UI
-            self.browser.page().runJavaScript(
-                f"if(typeof setPinState === 'function') setPinState({str(self.is_always_on_top).lower()});"
-            )
+            self.show_pin_state(self.is_always_on_top)
             
-            # 启动置顶状态轮询
+            if not self.in_background:
+                self._start_page_poll_timers()
+        # 加载失败时静默处理
+        self.view_ready.emit(success)
+    
+    def _start_page_poll_timers(self):
+        """启动页面状态轮询（仅在未启用QWebChannel时需要；定时器首次调用时创建）"""
+        if self.bridge is not None or not self.is_loaded:
+            return  # 事件由页面经QWebChannel推送，无需轮询
+        
+        if not hasattr(self, "pin_poll_timer"):
+            # 置顶状态轮询
             self.pin_poll_timer = QTimer(self)
             self.pin_poll_timer.timeout.connect(self.check_pin_state)
-            self.pin_poll_timer.start(AppConfig.PIN_POLL_INTERVAL_MS)
             
-            # 启动拖动状态轮询
+            # 拖动状态轮询
             self.drag_poll_timer = QTimer(self)
             self.drag_poll_timer.timeout.connect(self.check_drag_state)
-            self.drag_poll_timer.start(AppConfig.DRAG_POLL_INTERVAL_MS)
             
-            # 启动右键菜单轮询
+            # 右键菜单轮询
             self.menu_poll_timer = QTimer(self)
             self.menu_poll_timer.timeout.connect(self.check_context_menu)
-            self.menu_poll_timer.start(AppConfig.MENU_POLL_INTERVAL_MS)
-        else:
-            pass  # 加载失败，静默处理
+        
+        self.pin_poll_timer.start(AppConfig.PIN_POLL_INTERVAL_MS)
+        self.drag_poll_timer.start(AppConfig.DRAG_POLL_INTERVAL_MS)
+        self.menu_poll_timer.start(AppConfig.MENU_POLL_INTERVAL_MS)
     
     def check_pin_state(self):
         """轮询检查JavaScript中的置顶状态"""
         if not self.is_loaded:
             return
-        self.browser.page().runJavaScript("window.pinState;", self.handle_pin_state)
+        self.run_js("window.pinState;", self.handle_pin_state)
     
     def handle_pin_state(self, result):
         """
@@ -158,7 +165,7 @@ class GoldWindow(QMainWindow):
         """轮询检查JavaScript中的拖动状态"""
         if not self.is_loaded:
             return
-        self.browser.page().runJavaScript("window.dragState;", self.handle_drag_state)
+        self.run_js("window.dragState;", self.handle_drag_state)
     
     def handle_drag_state(self, result):
         """
@@ -172,19 +179,15 @@ class GoldWindow(QMainWindow):
             if action == 'move':
                 deltaX = result.get('deltaX', 0)
                 deltaY = result.get('deltaY', 0)
-                if deltaX != 0 or deltaY != 0:
-                    # 移动窗口
-                    new_x = self.x() + deltaX
-                    new_y = self.y() + deltaY
-                    self.move(new_x, new_y)
+                self.move_by(deltaX, deltaY)
             # 清除已处理的状态
-            self.browser.page().runJavaScript("window.dragState = null;")
+            self.run_js("window.dragState = null;")
     
     def check_context_menu(self):
         """轮询检查JavaScript中的右键菜单请求"""
         if not self.is_loaded:
             return
-        self.browser.page().runJavaScript("window.contextMenuRequest;", self.handle_context_menu)
+        self.run_js("window.contextMenuRequest;", self.handle_context_menu)
     
     def handle_context_menu(self, result):
         """
@@ -198,123 +201,27 @@ class GoldWindow(QMainWindow):
             y = result.get('y', 0)
             self.show_context_menu(QPoint(int(x), int(y)))
             # 清除已处理的请求
-            self.browser.page().runJavaScript("window.contextMenuRequest = null;")
-    
-    def handle_data(self, data):
-        """
-        主线程槽函数：将获取到的数据渲染至Web界面
-        
-        Args:
-            data: 抓取到的数据字典
-        """
-        if not self.is_loaded:
-            return
-        data_json = json.dumps(data)
-        self.browser.page().runJavaScript(
-            f"if(typeof updateUI === 'function') updateUI({data_json});"
-        )
-    
-    def update_data(self):
-        """手动触发数据更新"""
-        self.request_fetch.emit()
-    
-    def update_window_flags(self):
-        """更新窗口标志（置顶/不置顶）"""
-        if platform.system() == 'Darwin':
-            # macOS
-            flags = Qt.FramelessWindowHint
-            if self.is_always_on_top:
-                flags |= Qt.WindowStaysOnTopHint
-            self.setWindowFlags(flags)
-        else:
-            # Windows/Linux
-            flags = Qt.FramelessWindowHint | Qt.Tool
-            if self.is_always_on_top:
-                flags |= Qt.WindowStaysOnTopHint
-            self.setWindowFlags(flags)
-        
-        # setWindowFlags会隐藏窗口，需要重新显示并激活
-        self.show()
-        self.raise_()  # 确保窗口在最前面
-        self.activateWindow()  # 激活窗口获得焦点
+            self.run_js("window.contextMenuRequest = null;")
     
-    def toggle_always_on_top(self):
-        """
-        切换置顶状态
-        
-        Returns:
-            bool: 新的置顶状态
-        """
-        self.is_always_on_top = not self.is_always_on_top
-        self.update_window_flags()
-        # 同步状态到WebView UI
-        self.browser.page().runJavaScript(
-            f"if(typeof setPinState === 'function') setPinState({str(self.is_always_on_top).lower()});"
-        )
-        return self.is_always_on_top
+    def render_snapshot(self, data):
+        snapshot_json = json.dumps(data, separators=(",", ":"))
+        self.run_js(f"if(typeof updateUI === 'function') updateUI({snapshot_json});")
     
-    def show_context_menu(self, pos):
-        """
-        显示右键上下文菜单
-        
-        Args:
-            pos: 菜单显示位置（全局坐标）
-        """
-        self.menu_manager.create_context_menu(pos)
+    def render_patch(self, patch):
+        patch_json = json.dumps(patch, separators=(",", ":"))
+        self.run_js(f"if(typeof applyPatch === 'function') applyPatch({patch_json});")
     
-    def mousePressEvent(self, event: QMouseEvent):
-        """
-        处理鼠标按下事件
-        
-        Args:
-            event: 鼠标事件对象
-        """
-        if event.button() == Qt.LeftButton:
-            # 左键任意位置开始拖动
-            try:
-                self.old_pos = event.globalPosition().toPoint()
-            except AttributeError:
-                self.old_pos = event.globalPos()
-        elif event.button() == Qt.RightButton:
-            # 右键打开菜单
-            try:
-                global_pos = event.globalPosition().toPoint()
-            except AttributeError:
-                global_pos = event.globalPos()
-            self.show_context_menu(global_pos)
+    def render_sparklines(self, series):
+        series_json = json.dumps(series, separators=(",", ":"))
+        self.run_js(f"if(typeof updateSparklines === 'function') updateSparklines({series_json});")
     
-    def mouseMoveEvent(self, event: QMouseEvent):
-        """
-        处理鼠标移动事件 - 拖动窗口
-        
-        Args:
-            event: 鼠标事件对象
-        """
-        if self.old_pos:
-            try:
-                curr_pos = event.globalPosition().toPoint()
-            except AttributeError:
-                curr_pos = event.globalPos()
-            delta = curr_pos - self.old_pos
-            self.move(self.x() + delta.x(), self.y() + delta.y())
-            self.old_pos = curr_pos
+    def toggle_section(self, key):
+        self.run_js(f"toggleSection({json.dumps(key)})")
     
-    def mouseReleaseEvent(self, event: QMouseEvent):
-        """
-        处理鼠标释放事件
-        
-        Args:
-            event: 鼠标事件对象
-        """
-        self.old_pos = None
+    def show_pin_state(self, pinned):
+        self.run_js(f"if(typeof setPinState === 'function') setPinState({str(pinned).lower()});")
     
-    def closeEvent(self, event):
-        """
-        窗口关闭事件：安全终止后台线程
-        
-        Args:
-            event: 关闭事件对象
-        """
-        self.worker_thread.quit()
-        self.worker_thread.wait()
-        super().closeEvent(event)
+    def _page_poll_timers(self):
+        """已启动的页面轮询定时器（未启用QWebChannel时存在）"""
+        names = ("pin_poll_timer", "drag_poll_timer", "menu_poll_timer")
+        return [getattr(self, name) for name in names if hasattr(self, name)]
@@ -2,36 +2,117 @@
 异步数据抓取工作线程
 使用QThread实现非阻塞的数据抓取
 """
+import threading
+import time
+
 from PySide6.QtCore import QObject, Signal, Slot
 
+from ..core.metrics import REGISTRY
+
+FETCH_SECONDS = REGISTRY.histogram("mfw_fetch_seconds", "End-to-end fetch_all time per tick")
+SINK_SECONDS = REGISTRY.histogram("mfw_sink_seconds", "Time spent in snapshot sinks per tick")
+QUEUE_DEPTH = REGISTRY.gauge("mfw_worker_queue_depth", "Fetches in flight plus pending (0-2)")
+TICKS = REGISTRY.counter("mfw_worker_ticks_total", "Fetch requests by outcome", ("outcome",))
+
 
 class FetchWorker(QObject):
     """异步抓取执行者，独立于并运行在后台线程"""
-    
+
     # 信号：数据抓取完成后发出，携带抓取到的数据字典
     data_fetched = Signal(dict)
-    
-    def __init__(self, fetcher):
+
+    # 内部信号：由 request_fetch 发出，排队到工作线程执行 do_fetch
+    _fetch_requested = Signal()
+
+    def __init__(self, fetcher, sinks=()):
         """
         初始化工作线程
-        
+
         Args:
-            fetcher: GoldDataFetcher实例，用于执行实际的数据抓取
+            fetcher: 提供 fetch_all() 的对象（GoldDataFetcher 或 SourceScheduler），用于执行实际的数据抓取
+            sinks: 快照接收者列表（提供 record(data) 方法，如 TickHistory、TickStore），在工作线程中调用
         """
         super().__init__()
         self.fetcher = fetcher
-        
+        self.sinks = list(sinks)
+
+        # 在途抓取状态：最多一个执行中 + 一个待执行，其余请求直接丢弃
+        self._state_lock = threading.Lock()
+        self._in_flight = False
+        self._pending = False
+
+        # 统计计数
+        self.coalesced_ticks = 0  # 抓取进行中到达、被合并进待执行槽的请求数
+        self.dropped_ticks = 0  # 待执行槽已被占用而被丢弃的请求数
+
+        self._fetch_requested.connect(self.do_fetch)
+
+    def request_fetch(self):
+        """
+        请求一次数据抓取（可在任意线程调用，定时器与手动刷新共用）
+
+        Returns:
+            bool: True表示立即开始抓取，False表示被合并或丢弃
+        """
+        with self._state_lock:
+            if self._in_flight:
+                if self._pending:
+                    self.dropped_ticks += 1
+                    TICKS.inc(outcome="dropped")
+                else:
+                    self._pending = True
+                    self.coalesced_ticks += 1
+                    TICKS.inc(outcome="coalesced")
+                    QUEUE_DEPTH.set(2)
+                return False
+            self._in_flight = True
+            QUEUE_DEPTH.set(1)
+        TICKS.inc(outcome="started")
+        self._fetch_requested.emit()
+        return True
+
+    def stats(self):
+        """
+        获取调度统计
+
+        Returns:
+            dict: 合并/丢弃计数与当前在途状态
+        """
+        with self._state_lock:
+            return {
+                "coalesced_ticks": self.coalesced_ticks,
+                "dropped_ticks": self.dropped_ticks,
+                "in_flight": self._in_flight,
+                "pending": self._pending,
+            }
+
     @Slot()
     def do_fetch(self):
         """
         执行数据抓取任务（槽函数）
-        在后台线程中调用，抓取完成后发出data_fetched信号
-        """
-        try:
-            # 调用fetcher获取所有数据
-            data = self.fetcher.fetch_all()
-            # 发送数据到主线程
-            self.data_fetched.emit(data)
-        except Exception as e:
-            # 发生错误时，返回包含错误信息的字典
-            self.data_fetched.emit({"error": str(e)})
+        在后台线程中调用，抓取完成后发出data_fetched信号；
+        若期间有新的请求被合并，则紧接着再抓取一次
+        """
+        while True:
+            try:
+                # 调用fetcher获取所有数据
+                start = time.perf_counter()
+                data = self.fetcher.fetch_all()
+                fetched = time.perf_counter()
+                FETCH_SECONDS.observe(fetched - start)
+                for sink in self.sinks:
+                    sink.record(data)
+                SINK_SECONDS.observe(time.perf_counter() - fetched)
+                # 发送数据到主线程
+                self.data_fetched.emit(data)
+            except Exception as e:
+                # 发生错误时，返回包含错误信息的字典
+                self.data_fetched.emit({"error": str(e)})
+
+            with self._state_lock:
+                if not self._pending:
+                    self._in_flight = False
+                    QUEUE_DEPTH.set(0)
+                    return
+                self._pending = False
+                QUEUE_DEPTH.set(1)
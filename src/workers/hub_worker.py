@@ -0,0 +1,61 @@
+"""
+行情中枢订阅者
+窗口以客户端模式运行时代替 FetchWorker：不自行抓取，快照由本地行情中枢推送
+"""
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from ..core.hub import HubClient
+
+
+class HubWorker(QObject):
+    """与 FetchWorker 接口一致的中枢订阅者（data_fetched / request_fetch / stats）"""
+
+    # 信号：收到中枢快照后发出（由客户端线程发出，排队到主线程处理）
+    data_fetched = Signal(dict)
+
+    def __init__(self, url=None, sinks=()):
+        """
+        初始化订阅者
+
+        Args:
+            url: 中枢地址，默认取 MFW_HUB_URL
+            sinks: 快照接收者列表（提供 record(data) 方法，如 TickHistory），在客户端线程中调用
+        """
+        super().__init__()
+        self.sinks = list(sinks)
+        self.client = HubClient(self._on_snapshot, url)
+
+    def start(self):
+        self.client.start()
+
+    def stop(self):
+        self.client.stop()
+
+    def _on_snapshot(self, data):
+        for sink in self.sinks:
+            sink.record(data)
+        self.data_fetched.emit(data)
+
+    def set_background(self, background):
+        """中枢按自身节奏推送（可能同时服务其他窗口），后台时只由窗口停止渲染"""
+
+    def request_fetch(self):
+        """
+        请求中枢立即抓取一次（后台发送，不阻塞界面；结果照常经推送到达）
+
+        Returns:
+            bool: 总是False（抓取在中枢进程中进行）
+        """
+        threading.Thread(target=self.client.refresh, name="hub-refresh", daemon=True).start()
+        return False
+
+    def stats(self):
+        """
+        获取订阅统计
+
+        Returns:
+            dict: 中枢地址、连接状态、已接收快照数与重连次数
+        """
+        return self.client.stats()
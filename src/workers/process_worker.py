@@ -0,0 +1,109 @@
+"""
+独立抓取进程的读取端
+窗口以 MFW_FETCH_PROCESS=1 运行时代替 FetchWorker：抓取在子进程中进行，
+读取线程定时检查共享内存序号，有新快照时才读取并解析，解析后的字典排队到主线程
+"""
+import json
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, Slot
+
+from ..core.config import AppConfig
+from ..core.fetch_process import FetcherSupervisor
+
+
+class ProcessWorker(QObject):
+    """与 FetchWorker 接口一致的共享内存快照读取者（data_fetched / request_fetch / stats），运行在自己的 QThread 中"""
+
+    # 信号：读取并解析到新快照后发出（由读取线程发出，排队到主线程处理）
+    data_fetched = Signal(dict)
+
+    # 内部信号：由 start / set_background 发出，排队到读取线程设置检查间隔
+    _interval_requested = Signal(int)
+
+    def __init__(self, sinks=()):
+        """
+        初始化读取者
+
+        Args:
+            sinks: 快照接收者列表（提供 record(data) 方法，如 TickHistory），在读取线程中调用
+        """
+        super().__init__()
+        self.sinks = list(sinks)
+        self.supervisor = FetcherSupervisor()
+        self._seq = 0
+        self.received = 0
+        self.timer = None  # 在读取线程中创建
+        self.thread = QThread()
+        self.thread.setObjectName("shm-reader")
+        self.moveToThread(self.thread)
+        self._interval_requested.connect(self._set_interval)
+        self.thread.finished.connect(self._stop_timer)
+
+    def start(self):
+        self.supervisor.start()
+        self.thread.start()
+        self._interval_requested.emit(AppConfig.SHM_POLL_INTERVAL_MS)
+
+    def stop(self):
+        """停止读取线程后再停止子进程并释放共享内存（读取线程不会再访问已释放的快照区）"""
+        self.thread.quit()
+        self.thread.wait()
+        self.supervisor.stop()
+
+    @Slot(int)
+    def _set_interval(self, interval_ms):
+        if self.timer is None:
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self._poll)
+        self.timer.start(interval_ms)
+
+    @Slot()
+    def _stop_timer(self):
+        if self.timer is not None:
+            self.timer.stop()
+
+    @Slot()
+    def _poll(self):
+        self.supervisor.poll()
+        seq, body = self.supervisor.read(self._seq)
+        if body is None:
+            return
+        self._seq = seq
+        data = json.loads(body)
+        self.received += 1
+        for sink in self.sinks:
+            sink.record(data)
+        self.data_fetched.emit(data)
+
+    def set_background(self, background):
+        """
+        窗口进入/离开后台：子进程降低抓取频率，读取线程的检查间隔同步放宽
+
+        Args:
+            background: 是否处于后台
+        """
+        self.supervisor.set_background(background)
+        self._interval_requested.emit(
+            AppConfig.BACKGROUND_UPDATE_INTERVAL_MS // 4 if background else AppConfig.SHM_POLL_INTERVAL_MS
+        )
+
+    def request_fetch(self):
+        """
+        请求子进程立即抓取一次（结果照常经共享内存到达）
+
+        Returns:
+            bool: 总是False（抓取在子进程中进行）
+        """
+        self.supervisor.refresh()
+        return False
+
+    def stats(self):
+        """
+        获取子进程统计
+
+        Returns:
+            dict: 子进程 pid / 存活状态 / 重启次数 / 共享内存序号，以及已读取的快照数
+        """
+        stats = self.supervisor.stats()
+        stats["received"] = self.received
+        return stats
@@ -0,0 +1,87 @@
+"""价格提醒引擎：阈值穿越只在条件由不满足变为满足时触发一次"""
+import json
+
+import pytest
+
+from src.core.alerts import AlertEngine, AlertRule, alert_instruments, load_rules
+from src.core.config import AppConfig
+
+
+def _crypto(price):
+    return {"crypto": {"BTC": {"price": price, "change": 0.0}}}
+
+
+def _fired(engine, data, ts):
+    return sorted(rule.id for rule, _ in engine.evaluate(data, ts))
+
+
+def test_above_fires_once_per_crossing():
+    engine = AlertEngine([AlertRule("crypto.BTC", "above", 100, rule_id=1)])
+    assert _fired(engine, _crypto(90), 1) == []  # 首个值只作为参考
+    assert _fired(engine, _crypto(100), 2) == [1]  # 阈值含在内
+    assert _fired(engine, _crypto(110), 3) == []  # 仍在阈值之上不重复触发
+    assert _fired(engine, _crypto(95), 4) == []
+    assert _fired(engine, _crypto(105), 5) == [1]  # 回落后重新生效
+
+
+def test_below_and_ladder_crossing_several_thresholds():
+    rules = [AlertRule("crypto.BTC", "below", t, rule_id=t) for t in (90, 95, 99)]
+    engine = AlertEngine(rules)
+    _fired(engine, _crypto(100), 1)
+    assert _fired(engine, _crypto(94), 2) == [95, 99]
+    assert _fired(engine, _crypto(80), 3) == [90]
+    assert _fired(engine, _crypto(85), 4) == []
+
+
+def test_rise_over_window():
+    engine = AlertEngine([AlertRule("crypto.BTC", "rise", 5, window=60, rule_id=1)])
+    for ts, price in ((1000, 100), (1030, 101), (1060, 102)):
+        assert _fired(engine, _crypto(price), ts) == []
+    # 窗口参考价为 ts-60 时刻（含）之前最后一笔：1090 时为 1030 的 101
+    assert _fired(engine, _crypto(106.5), 1090) == [1]
+    assert _fired(engine, _crypto(107), 1100) == []
+
+
+def test_fall_threshold_is_positive():
+    rule = AlertRule.from_dict({"instrument": "crypto.BTC", "fall": -2, "window": 10}, rule_id=1)
+    assert rule.threshold == 2
+    engine = AlertEngine([rule])
+    for ts, price in ((1000, 100), (1010, 100), (1020, 100)):
+        _fired(engine, _crypto(price), ts)
+    assert _fired(engine, _crypto(97), 1030) == [1]
+
+
+def test_premium_instrument():
+    data = {"gold": {"intl": 2000.0, "dom": 500.0}, "exchange_rate": 7.0}
+    values = dict(alert_instruments(data))
+    assert values["premium.gold"] == pytest.approx(500.0 - 2000.0 * 7.0 / AppConfig.OZ_TO_GRAM)
+    assert "premium.silver" not in values
+
+
+def test_unknown_kind_rejected():
+    with pytest.raises(ValueError):
+        AlertRule("crypto.BTC", "between", 1)
+    with pytest.raises(ValueError):
+        AlertRule.from_dict({"above": 1})
+
+
+def test_load_rules_skips_invalid_entries(tmp_path):
+    path = tmp_path / "alerts.json"
+    path.write_text(json.dumps([
+        {"instrument": "gold.dom", "above": 620},
+        {"instrument": "gold.dom"},
+        "not a rule",
+        {"instrument": "crypto.ETH", "rise": 3, "window": 300},
+    ]), encoding="utf-8")
+    rules = load_rules(str(path))
+    assert [(r.id, r.kind) for r in rules] == [(0, "above"), (3, "rise")]
+    assert load_rules(str(tmp_path / "missing.json")) == []
+
+
+def test_stats_and_set_rules():
+    engine = AlertEngine([AlertRule("crypto.BTC", "above", 100, rule_id=1)])
+    engine.evaluate(_crypto(90), 1)
+    engine.evaluate(_crypto(110), 2)
+    assert engine.stats() == {"rules": 1, "instruments": 1, "evaluations": 2, "fired": 1}
+    engine.set_rules([])
+    assert engine.evaluate(_crypto(120), 3) == []
@@ -0,0 +1,78 @@
+"""数据源熔断器：closed -> open -> half_open（单次探测）-> closed/open"""
+from src.core.config import AppConfig
+from src.core.health import CLOSED, HALF_OPEN, OPEN, HealthTracker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _tripped():
+    clock = Clock()
+    tracker = HealthTracker(clock=clock)
+    for _ in range(AppConfig.BREAKER_FAILURE_THRESHOLD):
+        assert tracker.allow("sina")
+        tracker.record("sina", False)
+    return tracker, clock
+
+
+def test_opens_after_consecutive_failures():
+    tracker, _ = _tripped()
+    assert tracker.get("sina").state == OPEN
+    assert not tracker.allow("sina")
+    assert not tracker.is_healthy("sina")
+    assert tracker.get("sina").skipped_total == 1
+
+
+def test_success_resets_failure_count():
+    tracker = HealthTracker(clock=Clock())
+    for _ in range(AppConfig.BREAKER_FAILURE_THRESHOLD - 1):
+        tracker.record("okx", False)
+    tracker.record("okx", True, 0.05)
+    tracker.record("okx", False)
+    assert tracker.get("okx").state == CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    tracker, clock = _tripped()
+    clock.now += AppConfig.BREAKER_COOLDOWN_S
+    assert tracker.allow("sina")
+    assert tracker.get("sina").state == HALF_OPEN
+    assert not tracker.allow("sina")  # 探测在途，其余请求跳过
+    tracker.record("sina", True, 0.1)
+    assert tracker.get("sina").state == CLOSED
+    assert tracker.allow("sina") and tracker.allow("sina")
+
+
+def test_failed_probe_reopens_with_doubled_cooldown():
+    tracker, clock = _tripped()
+    clock.now += AppConfig.BREAKER_COOLDOWN_S
+    assert tracker.allow("sina")
+    tracker.record("sina", False)
+    health = tracker.get("sina")
+    assert health.state == OPEN
+    assert health.cooldown == AppConfig.BREAKER_COOLDOWN_S * 2
+    clock.now += AppConfig.BREAKER_COOLDOWN_S
+    assert not tracker.allow("sina")
+
+
+def test_unrecorded_probe_is_retried_after_cooldown():
+    tracker, clock = _tripped()
+    clock.now += AppConfig.BREAKER_COOLDOWN_S
+    assert tracker.allow("sina")
+    clock.now += AppConfig.BREAKER_COOLDOWN_S
+    assert tracker.allow("sina")
+
+
+def test_adaptive_timeout():
+    tracker = HealthTracker(clock=Clock())
+    assert tracker.timeout("okx") == AppConfig.ADAPTIVE_TIMEOUT_MAX_S  # 样本不足
+    for _ in range(AppConfig.LATENCY_MIN_SAMPLES):
+        tracker.record("okx", True, 0.001)
+    assert tracker.timeout("okx") == AppConfig.ADAPTIVE_TIMEOUT_MIN_S
+    stats = tracker.stats()["okx"]
+    assert stats["state"] == CLOSED and stats["successes"] == AppConfig.LATENCY_MIN_SAMPLES
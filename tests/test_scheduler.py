@@ -0,0 +1,161 @@
+"""数据源注册表：注入时钟，各数据源的抓取方法替换为读取 fixtures 的离线版本"""
+import os
+import threading
+
+import pytest
+
+from src.core.config import AppConfig
+from src.core.data_fetcher import GoldDataFetcher
+from src.core.health import CLOSED
+from src.core.scheduler import SourceScheduler
+from src.core.sina_parser import parse_quotes
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "bench", "fixtures")
+
+
+class FakeUpstream:
+    """替换 GoldDataFetcher 的网络方法，记录调用并可切换为失败"""
+
+    def __init__(self, fetcher):
+        with open(os.path.join(FIXTURES, "sina.txt"), "rb") as f:
+            self.sina = parse_quotes(f.read())
+        self.crypto = {"BTC": {"price": 98000.0, "change": 1.0}}
+        self.calls = []
+        self.failing = set()
+        fetcher.fetch_sina = self.fetch_sina
+        fetcher.fetch_crypto = self.fetch_crypto
+        fetcher.fetch_sge_fallback = self.fetch_sge_fallback
+
+    def fetch_sina(self, symbols):
+        self.calls.append(("sina", tuple(symbols)))
+        if "sina" in self.failing:
+            return {}
+        return {sym: self.sina[sym] for sym in symbols if sym in self.sina}
+
+    def fetch_crypto(self):
+        self.calls.append(("crypto",))
+        return {} if "crypto" in self.failing else {k: dict(v) for k, v in self.crypto.items()}
+
+    def fetch_sge_fallback(self):
+        self.calls.append(("eastmoney",))
+        return {}
+
+    def take(self):
+        calls, self.calls = self.calls, []
+        return calls
+
+
+@pytest.fixture
+def env(monkeypatch):
+    monkeypatch.setattr(AppConfig, "HTTP_PREWARM", False)
+    monkeypatch.setattr(AppConfig, "CRYPTO_STREAM_ENABLED", False)
+    monkeypatch.setattr(AppConfig, "FETCH_ENGINE", "thread")
+    fetcher = GoldDataFetcher()
+    upstream = FakeUpstream(fetcher)
+    clock = [1000.0]
+    scheduler = SourceScheduler(fetcher, clock=lambda: clock[0])
+    yield scheduler, upstream, clock
+    fetcher.close()
+
+
+def test_first_round_batches_sina_sources(env):
+    scheduler, upstream, _ = env
+    data = scheduler.fetch_all()
+    calls = upstream.take()
+    sina = [c for c in calls if c[0] == "sina"]
+    assert sina == [("sina", ("hf_XAU", "hf_SI", "SGE_AUTD", "SGE_AGTD", "fx_susdcny"))]
+    assert ("crypto",) in calls
+    assert data["gold"]["intl"] == 2650.11
+    assert data["crypto"]["BTC"]["price"] == 98000.0
+    assert not any(data["stale_rows"].values())
+
+
+def test_eastmoney_only_while_sge_missing(env):
+    scheduler, upstream, clock = env
+    scheduler.fetch_all()
+    assert ("eastmoney",) in upstream.take()  # 首轮尚无上金所缓存值
+    clock[0] += AppConfig.SOURCE_SCHEDULE["eastmoney"][0]
+    scheduler.fetch_all()
+    assert ("eastmoney",) not in upstream.take()  # 新浪已有上金所报价
+
+
+def test_only_due_sources_are_fetched(env):
+    scheduler, upstream, clock = env
+    scheduler.fetch_all()
+    upstream.take()
+    clock[0] += AppConfig.SOURCE_SCHEDULE["crypto"][0]
+    data = scheduler.fetch_all()
+    assert upstream.take() == [("crypto",)]
+    assert data["exchange_rate"] == 7.299  # 未到期的数据源使用缓存值
+
+
+def test_unchanged_values_back_off(env):
+    scheduler, upstream, clock = env
+    base, max_interval, _ = AppConfig.SOURCE_SCHEDULE["fx"]
+    for _ in range(8):
+        scheduler.fetch_all()
+        clock[0] = scheduler.states["fx"].next_due
+    assert scheduler.states["fx"].current_interval == max_interval
+    assert base < max_interval
+
+
+def test_changed_value_restores_base_interval(env):
+    scheduler, upstream, clock = env
+    base = AppConfig.SOURCE_SCHEDULE["crypto"][0]
+    for _ in range(3):
+        scheduler.fetch_all()
+        clock[0] = scheduler.states["crypto"].next_due
+    assert scheduler.states["crypto"].current_interval > base
+    upstream.crypto["BTC"]["price"] += 1
+    scheduler.fetch_all()
+    assert scheduler.states["crypto"].current_interval == base
+
+
+def test_failure_keeps_last_value_and_marks_rows_stale(env):
+    scheduler, upstream, clock = env
+    scheduler.fetch_all()
+    upstream.failing.add("crypto")
+    clock[0] += AppConfig.SOURCE_SCHEDULE["crypto"][0]
+    data = scheduler.fetch_all()
+    assert data["crypto"]["BTC"]["price"] == 98000.0
+    assert data["stale_rows"]["crypto"] is True
+    assert scheduler.stats()["crypto"]["failed"] is True
+
+
+def test_disabled_source_is_neither_fetched_nor_merged(env):
+    scheduler, upstream, _ = env
+    scheduler.set_enabled("crypto", False)
+    data = scheduler.fetch_all()
+    assert ("crypto",) not in upstream.take()
+    assert data["crypto"] == {}
+    assert scheduler.stats()["crypto"]["enabled"] is False
+
+
+def test_force_fetches_every_enabled_source(env):
+    scheduler, upstream, _ = env
+    scheduler.fetch_all()
+    upstream.take()
+    scheduler.fetch_all(force=True)
+    assert {c[0] for c in upstream.take()} == {"sina", "crypto"}
+
+
+def test_request_in_flight_across_ticks_does_not_trip_breaker(env):
+    scheduler, upstream, clock = env
+    gate = threading.Event()
+    fetch_crypto = upstream.fetch_crypto
+
+    def slow_crypto():
+        gate.wait(5)
+        return fetch_crypto()
+
+    scheduler.fetcher.fetch_crypto = slow_crypto
+    scheduler.fetcher.engine.deadline = 0.05
+    try:
+        for _ in range(AppConfig.BREAKER_FAILURE_THRESHOLD + 1):
+            scheduler.fetch_all()
+            clock[0] += AppConfig.SOURCE_SCHEDULE["crypto"][0]
+        health = scheduler.fetcher.health.get("crypto")
+        assert health.state == CLOSED
+        assert health.failures == 1  # 仅首轮超时计入，之后各轮为 busy
+    finally:
+        gate.set()
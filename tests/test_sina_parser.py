@@ -0,0 +1,48 @@
+"""新浪行情解析：使用 scripts/bench/fixtures 中录制的响应"""
+import os
+
+from src.core.sina_parser import SinaQuote, parse_quotes
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "bench", "fixtures")
+
+
+def _sina_fixture():
+    with open(os.path.join(FIXTURES, "sina.txt"), "rb") as f:
+        return f.read()
+
+
+def test_parses_all_symbols_in_fixture():
+    quotes = parse_quotes(_sina_fixture())
+    assert set(quotes) == {"hf_XAU", "hf_SI", "fx_susdcny", "SGE_AUTD", "SGE_AGTD"}
+
+
+def test_layouts_per_prefix():
+    quotes = parse_quotes(_sina_fixture())
+    assert (quotes["hf_XAU"].price, quotes["hf_XAU"].prev_close) == (2650.11, 2645.30)
+    assert (quotes["SGE_AUTD"].price, quotes["SGE_AUTD"].prev_close) == (615.50, 612.30)
+    assert quotes["fx_susdcny"].price == 7.2990
+    assert quotes["fx_susdcny"].prev_close == 0.0
+
+
+def test_symbol_filter_and_lazy_fields():
+    quotes = parse_quotes(_sina_fixture(), symbols=["SGE_AUTD"])
+    assert list(quotes) == ["SGE_AUTD"]
+    assert quotes["SGE_AUTD"].fields[1] == "黄金延期"
+
+
+def test_empty_payload_skipped_and_str_input():
+    content = 'var hq_str_hf_XAU="";\nvar hq_str_hf_SI="29.4,29.6,,,,,,29.5";\n'
+    quotes = parse_quotes(content)
+    assert list(quotes) == ["hf_SI"]
+    assert quotes["hf_SI"].price == 29.4
+
+
+def test_hf_prev_close_falls_back_to_settlement():
+    quote = SinaQuote.from_payload("hf_SI", b"29.4,-,,,,,,29.5")
+    assert quote.prev_close == 29.5
+
+
+def test_missing_price_field():
+    quote = SinaQuote.from_payload("SGE_AUTD", b"AUTD,name")
+    assert not quote.has_price
+    assert quote.price == 0.0
@@ -0,0 +1,57 @@
+"""共享内存快照区：顺序锁写入与读取"""
+import struct
+
+import pytest
+
+from src.core.fetch_process import SnapshotBlock
+
+
+@pytest.fixture
+def block():
+    block = SnapshotBlock.create(capacity=64)
+    yield block
+    block.close()
+
+
+def test_write_then_read(block):
+    assert block.read() == (0, None)
+    assert block.write(b'{"a":1}')
+    seq, body = block.read()
+    assert body == b'{"a":1}'
+    assert seq == block.sequence() and seq % 2 == 0
+    assert block.read(after=seq) == (seq, None)
+
+
+def test_reader_attached_by_name_sees_latest(block):
+    reader = SnapshotBlock.attach(block.name)
+    try:
+        block.write(b"first")
+        block.write(b"second!")
+        seq, body = reader.read()
+        assert body == b"second!"
+        assert seq == 4
+    finally:
+        reader.close()
+
+
+def test_oversized_snapshot_is_dropped(block):
+    block.write(b"ok")
+    assert not block.write(b"x" * 65)
+    assert block.dropped == 1
+    assert block.read()[1] == b"ok"
+
+
+def test_read_during_write_returns_nothing(block):
+    block.write(b"ok")
+    struct.pack_into("<Q", block.shm.buf, 0, block.sequence() + 1)  # 模拟写入中（奇数序号）
+    assert block.read(after=2) == (2, None)
+
+
+def test_new_writer_resumes_after_interrupted_write(block):
+    struct.pack_into("<Q", block.shm.buf, 0, 7)  # 上一个写者中途退出
+    writer = SnapshotBlock.attach(block.name)
+    try:
+        writer.write(b"resumed")
+        assert block.read() == (10, b"resumed")
+    finally:
+        writer.close()
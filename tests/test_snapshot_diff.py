@@ -0,0 +1,93 @@
+"""快照差分：补丁只含变化字段，依次合并补丁后与最新快照的显示值一致"""
+import copy
+
+from src.core.snapshot_diff import SnapshotDiffer, summary_text
+
+
+def _snapshot(**overrides):
+    data = {
+        "gold": {"intl": 2650.11, "intl_change": 0.18, "dom": 615.5, "dom_change": 0.52},
+        "silver": {"intl": 29.435, "intl_change": -0.59, "dom": 7.52, "dom_change": 0.43},
+        "crypto": {"BTC": {"price": 98000.0, "change": 1.2}, "ETH": {"price": 3500.0, "change": -0.4}},
+        "exchange_rate": 7.299,
+        "market_status": {"gold": "open", "silver": "open"},
+        "error": None,
+        "stale_rows": {"gold.intl": False},
+        "timestamp": 1.0,
+    }
+    for path, value in overrides.items():
+        node = data
+        keys = path.split(".")
+        for key in keys[:-1]:
+            node = node[key]
+        node[keys[-1]] = value
+    return data
+
+
+def _apply(state, patch):
+    """按页面 applyPatch 的语义合并补丁"""
+    for key, value in patch.items():
+        if isinstance(value, dict):
+            _apply(state.setdefault(key, {}), value)
+        else:
+            state[key] = value
+
+
+def _nest(flat):
+    nested = {}
+    for path, value in flat.items():
+        node = nested
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return nested
+
+
+def test_first_diff_is_full_snapshot_then_none():
+    differ = SnapshotDiffer()
+    data = _snapshot()
+    assert differ.diff(data) == _nest(SnapshotDiffer.flatten(data))
+    assert differ.diff(copy.deepcopy(data)) is None
+
+
+def test_sub_precision_jitter_produces_no_patch():
+    differ = SnapshotDiffer()
+    differ.diff(_snapshot())
+    assert differ.diff(_snapshot(**{"gold.intl": 2650.111, "exchange_rate": 7.29901, "timestamp": 2.0})) is None
+
+
+def test_patch_contains_only_changed_fields():
+    differ = SnapshotDiffer()
+    differ.diff(_snapshot())
+    patch = differ.diff(_snapshot(**{"gold.dom": 616.0, "crypto.BTC": {"price": 98001.0, "change": 1.2}}))
+    assert patch == {"gold": {"dom": 616.0}, "crypto": {"BTC": {"price": 98001.0}}}
+
+
+def test_round_trip_matches_latest_snapshot():
+    differ = SnapshotDiffer()
+    rendered = {}
+    sequence = [
+        _snapshot(),
+        _snapshot(**{"silver.dom": 7.6, "market_status.silver": "closed"}),
+        _snapshot(**{"crypto.SOL": {"price": 150.0, "change": 2.0}, "stale_rows": {"gold.intl": True}}),
+        _snapshot(**{"crypto.SOL": {"price": 151.0, "change": 2.0}, "exchange_rate": 7.31, "error": "sina: timeout"}),
+    ]
+    for data in sequence:
+        patch = differ.diff(data)
+        if patch is not None:
+            _apply(rendered, patch)
+        assert rendered == _nest(SnapshotDiffer.flatten(data))
+
+
+def test_reset_resends_full_snapshot():
+    differ = SnapshotDiffer()
+    data = _snapshot()
+    differ.diff(data)
+    differ.reset()
+    assert differ.diff(data) == _nest(SnapshotDiffer.flatten(data))
+
+
+def test_summary_text():
+    text = summary_text(_snapshot(), crypto_limit=1)
+    assert text == "黄金 615.50 (+0.52%) | 白银 7.52 (+0.43%) | BTC 98000.00"
+    assert summary_text({}) == ""
@@ -0,0 +1,69 @@
+"""本地行情存储：后台批量写入、按时间查询、启动加载与压缩"""
+import time
+
+import pytest
+
+from src.core.config import AppConfig
+from src.core.tick_store import TickStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "ticks.db")
+
+
+def test_record_close_and_reopen(db_path):
+    now = time.time()
+    store = TickStore(db_path)
+    store.record({"gold": {"intl": 2650.0, "dom": 615.0}, "exchange_rate": 7.3, "crypto": {}}, ts=now)
+    store.record_rows([("crypto.BTC", now + 1, 98000.0)], block=True)
+    store.close()  # 写入队列中剩余的数据
+    assert store.written == 4
+
+    store = TickStore(db_path)
+    try:
+        assert store.query("gold.dom", now - 1, now + 1) == [(now, 615.0)]
+        assert store.query("unknown", 0, now + 10) == []
+        recent = store.load_recent(hours=1, now=now + 2)
+        assert set(recent) == {"gold.intl", "gold.dom", "fx.usdcny", "crypto.BTC"}
+        assert recent["crypto.BTC"] == [(now + 1, 98000.0)]
+    finally:
+        store.close()
+
+
+def test_load_recent_window(db_path):
+    now = time.time()
+    store = TickStore(db_path)
+    try:
+        store.record_rows([("gold.dom", now - 7200, 1.0), ("gold.dom", now - 60, 2.0)], block=True)
+        store.close()
+        store = TickStore(db_path)
+        assert store.load_recent(hours=1, now=now) == {"gold.dom": [(now - 60, 2.0)]}
+    finally:
+        store.close()
+
+
+def test_compact_rolls_old_ticks_into_minute_bars(db_path):
+    # 最近的整分钟（写入线程启动时按当前时间压缩，不会处理这些逐笔）
+    start = time.time() // 60 * 60 - 600
+    rows = [("gold.dom", start + s, v) for s, v in ((0, 10.0), (10, 12.0), (20, 9.0), (50, 11.0), (70, 13.0))]
+    store = TickStore(db_path)
+    try:
+        store.record_rows(rows, block=True)
+        store.close()
+        store = TickStore(db_path)
+        # 截止时间按分钟对齐：start + 60 之前的逐笔聚合为一根K线，之后的保留
+        store.compact(now=start + 90 + AppConfig.TICK_RETENTION_S)
+        assert store.query_bars("gold.dom", start - 60, start + 120) == [(start, 10.0, 12.0, 9.0, 11.0)]
+        assert store.query("gold.dom", 0, start + 3600) == [(start + 70, 13.0)]
+    finally:
+        store.close()
+
+
+def test_queue_full_drops_instead_of_blocking(db_path, monkeypatch):
+    monkeypatch.setattr(AppConfig, "TICK_STORE_QUEUE_MAX", 1)
+    store = TickStore(db_path, autostart=False)
+    store.record_rows([("gold.dom", 1.0, 1.0)])
+    store.record_rows([("gold.dom", 2.0, 2.0)])
+    assert store.dropped == 1
+    store.close()